@@ -5,17 +5,21 @@ import random
 import Backend.config.device_config
 from Backend.config.config_loader import CONFIG
 from Backend.interface import Interface, CANInterface, I2CInterface, InterfaceProtocol
-from Backend.device import Device
+from Backend.device import Device, CANDevice, DeviceSubscription
 from Backend.data_logger import DataLogger
+from Backend.telemetry_format import TelemetryFormat
 from Backend.value_monitor import ParameterMonitor, ParameterWarning
-from Backend.PCCclient import PCCClient
+from Backend.PCCclient import PCCClient, AsyncPCCClient
+from Backend.io_engine import AsyncIOEngine
 from Backend.resources.analog_in import Analog_In, ValueMapper, ExponentialValueMapper
 from Backend.resources.ads_1015 import ADS_1015
 from Backend.resources.mpu6050 import MPU_6050_x3
 from Backend.resources.dtihv500 import DTI_HV_500
 from Backend.resources.orionbms2 import Orion_BMS_2
 from Backend.resources.elconuhf import Elcon_UHF
-from typing import Union, Dict, List
+from types import MappingProxyType
+from typing import Union, Dict, List, Iterable, Tuple, Any, Callable
+import time
 
 
 
@@ -26,6 +30,51 @@ EX. The UI calls functions from here which pulls data from sensor objects.
 """
 
 
+class DataSnapshot:
+    '''
+    A read-only view of many parameters, copied at the same moment (See DDS_IO.snapshot()).
+    Values are keyed by (device_key, param_key), and hold the same values get_device_data() would return.
+    '''
+
+    __slots__ = ('timestamp', 'values')
+
+    def __init__(self, timestamp: float, values: Dict[Tuple[str, str], Any]):
+        '''
+        Parameters:
+            timestamp (float): The time (time.time()) the values were copied.
+            values (Dict[Tuple[str, str], Any]): The value of each (device_key, param_key).
+        '''
+        self.timestamp = timestamp
+        self.values = MappingProxyType(values)
+
+
+    def get(self, device_key: str, param_key: str, default: Any = "NO_DATA") -> Union[str, float, int, None]:
+        '''Returns the value of a parameter, or default if it isn't in the snapshot.'''
+        return self.values.get((device_key, param_key), default)
+
+
+    def device(self, device_key: str) -> Dict[str, Any]:
+        '''Returns the value of every parameter of a device in the snapshot, by parameter name.'''
+        return {param_key: value for (key, param_key), value in self.values.items() if key == device_key}
+
+
+    def __getitem__(self, key: Tuple[str, str]):
+        return self.values[key]
+
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self.values
+
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+
 class DDS_IO:
 
     # ===== Debugging Variables =====
@@ -40,11 +89,27 @@ class DDS_IO:
 
     # ===== Devices that the DDS Talks to =====
     interfaces: Dict[str, Interface]
+    devices: Dict[str, Device]              # Every device on every interface, by name
+    device_params: Dict[str, List[str]]     # The parameter names of every CAN device (fixed by its database), by device name
+
+
+    # ===== Values returned instead of data when a device isn't active =====
+    STATUS_SENTINELS = {
+        Device.DeviceStatus.DISABLED: 'DISBLD',
+        Device.DeviceStatus.ERROR: 'ERROR',
+        Device.DeviceStatus.NOT_INITIALIZED: 'NO_INIT',
+    }
+
+
+    # ===== IO Engines (See Backend.io_engine) =====
+    POLLING_ENGINE = 'polling'      # The UI calls update() as often as possible
+    ASYNCIO_ENGINE = 'asyncio'      # An event loop in a background thread updates the interfaces when there is data
 
 
     # ===== Class Variables =====
     log : DataLogger
     parameter_monitor: ParameterMonitor
+    engine: Union[AsyncIOEngine, None]
     
 
     # ===== Methods =====
@@ -52,18 +117,48 @@ class DDS_IO:
         '''
         Starts the Backend of the DDS.
         '''
-        self.log = DataLogger('DDS_Log', baseDirectoryPath=CONFIG["log_settings"]["external_storage_path"])
+        log_settings = CONFIG["log_settings"]
+        self.log = DataLogger('DDS_Log', 
+                              baseDirectoryPath=log_settings["external_storage_path"],
+                              telemetryFlushInterval=log_settings["telemetry_flush_interval"],
+                              telemetryFlushRows=log_settings["telemetry_flush_rows"],
+                              telemetryQueueSize=log_settings["telemetry_queue_size"],
+                              telemetryOverflowPolicy=DataLogger.OverflowPolicy(log_settings["telemetry_overflow_policy"]),
+                              telemetryFormat=TelemetryFormat(log_settings["telemetry_format"]),
+                              telemetrySegmentMaxBytes=log_settings["telemetry_segment_max_bytes"],
+                              telemetrySegmentMaxSeconds=log_settings["telemetry_segment_max_seconds"],
+                              logDedupeCacheSize=log_settings["log_dedupe_cache_size"],
+                              logLevel=DataLogger.LogSeverity[log_settings["log_level"]])
         self.parameter_monitor = ParameterMonitor('Backend/config/valuelimits.json5', self.log)
-        self.pcc = PCCClient(get_data_callable=lambda device, param: self.get_device_data(device, param, caller="PCC Client"))
+        self.parameter_monitor.set_profile(CONFIG["monitor_settings"]["drive_mode"])
+        self.engine = None
+        engine_name = CONFIG["io_settings"]["engine"]
+        if engine_name not in (self.POLLING_ENGINE, self.ASYNCIO_ENGINE):
+            raise ValueError(f"Unknown IO engine '{engine_name}'. Expected '{self.POLLING_ENGINE}' or '{self.ASYNCIO_ENGINE}'.")
+
+        pcc_client = AsyncPCCClient if engine_name == self.ASYNCIO_ENGINE else PCCClient
+        self.pcc = pcc_client(get_data_callable=lambda device, param: self.get_device_data(device, param, caller="PCC Client"))
         self.pcc.start()
         self.interfaces = {}
+        self.devices = {}
+        self.device_params = {}
 
         self.__log('Starting Dash Display System Backend...')
         self.__initialize_io()
 
+        # Hand the interfaces over to the event loop
+        if engine_name == self.ASYNCIO_ENGINE:
+            self.__log('Starting the asyncio IO engine.')
+            self.engine = AsyncIOEngine(self)
+            self.engine.start()
+
 
     def update(self):
-        '''Updates all Interfaces. Should be called as often as possible.'''
+        '''Updates all Interfaces. Should be called as often as possible, unless the asyncio engine is running (See needs_polling()).'''
+
+        # The asyncio engine updates the interfaces by itself
+        if self.engine is not None:
+            return
 
         # Update all enabled devices
         for interface_name, interface_object in self.interfaces.items():
@@ -74,7 +169,7 @@ class DDS_IO:
                 try:
                     interface_object.update()
                 except Exception as e:
-                    self.__log(f'Failed to update {interface_name}. {e}')
+                    self.__log(f'Failed to update {interface_name}. {e}', DataLogger.LogSeverity.ERROR)
                     interface_object.status = Interface.InterfaceStatus.ERROR
             
             elif status is Interface.InterfaceStatus.ERROR:
@@ -89,6 +184,34 @@ class DDS_IO:
                 return
 
 
+    def needs_polling(self) -> bool:
+        '''Returns whether update() has to be called as often as possible (False when the asyncio engine runs the interfaces).'''
+        return self.engine is None
+
+
+    def close(self):
+        '''
+        Shuts the backend down: stops the asyncio engine (or the PCC client), closes every interface, then closes the logs.
+        Should be called once, when the DDS is closing (Ex. from the UI's on_stop()).
+        '''
+        self.__log('Shutting down Dash Display System Backend...')
+
+        # The engine stops its own PCC client, and the CAN Notifiers reading the interfaces' buses
+        if self.engine is not None:
+            self.engine.stop()
+            self.engine = None
+        else:
+            self.pcc.stop()
+
+        for interface_name, interface_object in self.interfaces.items():
+            try:
+                interface_object.close_connection()
+            except Exception as e:
+                self.__log('Failed to close %s. %s', DataLogger.LogSeverity.WARNING, interface_name, e)
+
+        self.log.close()
+
+
     def get_device_data(self, device_key: str, param_key: str, caller: str="DDS_IO") -> Union[str, float, int, None]:
         '''
         Gets a single parameter from a specified device.
@@ -99,32 +222,19 @@ class DDS_IO:
             caller `(str)`: The name of the entity calling this function. Used for logging purposes.
         '''
         
-        # 1) Get the device at the specified key by checking each interface for it.
-        device: Device = None
-        for name, interface in self.interfaces.items():
-            if interface.devices.get(device_key) is not None:
-                device = interface.devices.get(device_key)
-                break
-            # If the device is None, we can return early
+        # 1) Get the device at the specified key from the device index.
+        device = self.devices.get(device_key)
         if device is None:
             # Log the mistake and return.
-            self.__log(f'Device {device_key} not found. (Data Req: {param_key})', DataLogger.LogSeverity.DEBUG, caller)
+            self.__log('Device %s not found. (Data Req: %s)', DataLogger.LogSeverity.DEBUG, device_key, param_key, name=caller)
             return "UKNDEV"
         
 
-        # 2) If the device is not active, we can return early
-        if device.status is not Device.DeviceStatus.ACTIVE:
-
-            # Log the warning
-            self.__log(f'Device {device_key} is {device.status.name}. Could not get requested data: {param_key}', DataLogger.LogSeverity.DEBUG)
-
-            # Return a value that represents the current state of the device
-            if device.status is Device.DeviceStatus.DISABLED:
-                return 'DISBLD'
-            elif device.status is Device.DeviceStatus.ERROR:
-                return 'ERROR'
-            elif device.status is Device.DeviceStatus.NOT_INITIALIZED:
-                return 'NO_INIT'
+        # 2) If the device is not active, return a value that represents the current state of the device.
+        #    (Status changes are logged by the device, so there's nothing to log here.)
+        status = device.status
+        if status is not Device.DeviceStatus.ACTIVE:
+            return self.STATUS_SENTINELS[status]
               
         # 3) Fetch data from device
         data = device.get_data(param_key)
@@ -139,22 +249,145 @@ class DDS_IO:
         return data
     
 
+    def snapshot(self, keys: Iterable[Tuple[str, str]], caller: str="DDS_IO") -> DataSnapshot:
+        '''
+        Gets many parameters at once, reading each device's cache only once (without locking it, See Device.cached_values).
+        Every parameter of a device comes from the same version of its cache,
+        so related values (Ex. voltage & current) are consistent.
+
+        Parameters:
+            keys `(Iterable[Tuple[str, str]])`: The (device_key, param_key) of each requested parameter
+            caller `(str)`: The name of the entity calling this function. Used for logging purposes.
+
+        Returns:
+            DataSnapshot: The requested values, with the same sentinels as get_device_data() ("UKNDEV", "NO_DATA", ...)
+        '''
+        # Group the requested parameters by device, so each device's cache is only read once
+        requested: Dict[str, List[str]] = {}
+        for device_key, param_key in keys:
+            requested.setdefault(device_key, []).append(param_key)
+
+        timestamp = time.time()
+        values = {}
+        for device_key, param_keys in requested.items():
+            values.update(self.__snapshot_device(device_key, param_keys, caller))
+        return DataSnapshot(timestamp, values)
+
+
+    def snapshot_all(self) -> DataSnapshot:
+        '''
+        Gets every cached parameter of every device at once, reading each device's cache only once (without locking it).
+
+        Returns:
+            DataSnapshot: The value of every parameter, with the same sentinels as get_device_data().
+        '''
+        timestamp = time.time()
+        values = {}
+        for device_key in self.devices:
+            values.update(self.__snapshot_device(device_key, None, "DDS_IO"))
+        return DataSnapshot(timestamp, values)
+
+
+    def subscribe(self, keys: Iterable[Tuple[str, str]],
+                  callback: Callable[[Dict[Tuple[str, str], Any]], None],
+                  caller: str="DDS_IO") -> List[Tuple[Device, DeviceSubscription]]:
+        '''
+        Calls back with the parameters that changed, instead of them having to be polled.
+        The callback is called once with the current value of every parameter, then at most once per update
+        (from update(), or the engine's thread with the asyncio engine) with only the parameters that changed. Values use the same sentinels as get_device_data().
+        Unknown devices (and parameters missing from a CAN device's database) are logged as warnings, since they are never called back about.
+
+        Parameters:
+            keys `(Iterable[Tuple[str, str]])`: The (device_key, param_key) of each parameter to be notified about
+            callback `(Callable)`: Called with a dict of the changed values, keyed by (device_key, param_key)
+            caller `(str)`: The name of the entity subscribing. Used for logging purposes.
+
+        Returns:
+            List[Tuple[Device, DeviceSubscription]]: The subscriptions, which can be passed to unsubscribe().
+        '''
+        keys = list(keys)
+        requested: Dict[str, List[str]] = {}
+        for device_key, param_key in keys:
+            requested.setdefault(device_key, []).append(param_key)
+
+        subscriptions = []
+        for device_key, param_keys in requested.items():
+            device = self.devices.get(device_key)
+            if device is None:
+                self.__log("Can't subscribe to %s of unknown device '%s'. Devices: %s", DataLogger.LogSeverity.WARNING,
+                           param_keys, device_key, list(self.devices), name=caller)
+                continue
+            known_params = self.device_params.get(device_key)
+            if known_params is not None:
+                unknown_params = [param_key for param_key in param_keys if param_key not in known_params]
+                if unknown_params:
+                    self.__log("Can't subscribe to %s: not in the database of %s.", DataLogger.LogSeverity.WARNING,
+                               unknown_params, device_key, name=caller)
+            subscriptions.append((device, device.subscribe(self.__make_change_callback(device, callback), param_keys)))
+
+        # Start the subscriber off with the current values
+        callback(dict(self.snapshot(keys, caller).values))
+        return subscriptions
+
+
+    def unsubscribe(self, subscriptions: List[Tuple[Device, DeviceSubscription]]):
+        '''Stops the subscriptions returned by subscribe().'''
+        for device, subscription in subscriptions:
+            device.unsubscribe(subscription)
+
+
     def get_warnings(self) -> List[str]:
-        '''Returns a list of active warnings''' 
+        '''Returns a list of active warnings. Never waits on the asyncio engine (See ParameterMonitor.get_warnings_as_str()).''' 
         warnings = self.parameter_monitor.get_warnings_as_str()
         return warnings
 
 
+    def get_warnings_version(self) -> int:
+        '''Returns a number which changes whenever the active warnings change. Used to skip redrawing unchanged warnings.'''
+        return self.parameter_monitor.warnings_version
+
+
+    def set_drive_mode(self, drive_mode: str):
+        '''
+        Switches the value limits to the profile for a driving mode (Ex. 'endurance', 'accel', 'charging').
+        Every device re-checks its values against the new limits on the next update.
+
+        Parameters:
+            drive_mode (str): The name of the limit profile in valuelimits.json5.
+
+        Raises:
+            ValueError: If there is no profile for the driving mode.
+        '''
+        # The asyncio engine monitors values from its own thread, so the profile is changed there
+        if self.engine is not None:
+            self.engine.call(self.__set_drive_mode, drive_mode)
+        else:
+            self.__set_drive_mode(drive_mode)
+
+
+    def __set_drive_mode(self, drive_mode: str):
+        self.parameter_monitor.set_profile(drive_mode)
+        for interface_name, interface in self.interfaces.items():
+            for device_name, device in interface.devices.items():
+                device.mark_all_changed()
+
+
+    def get_drive_mode(self) -> str:
+        '''Returns the name of the current driving mode's limit profile.'''
+        return self.parameter_monitor.profile.name
+
+
+    def get_drive_modes(self) -> List[str]:
+        '''Returns the names of every driving mode with a limit profile.'''
+        return self.parameter_monitor.get_profile_names()
+
+
     def get_device_names(self) -> List[str]:
         '''
         Returns a list of devices.
         If there are no devices, returns a single string with an error message.
         '''
-        device_names = []
-        for interface_name, interface in self.interfaces.items():
-            for device_name, device in interface.devices.items():
-                device_names.append(device_name)
-        return device_names
+        return list(self.devices)
     
 
     def get_device_parameters(self, device_name: str) -> List[str]:
@@ -168,16 +401,64 @@ class DDS_IO:
             List[str]: A list of parameter names for the specified device. 
                     If the device is not found, an empty list is returned.
         """
-        for interface_name, interface in self.interfaces.items():
-            if device_name in interface.devices:
-                device = interface.devices[device_name]
-                return device.get_all_param_names()
+        device = self.devices.get(device_name)
+        if device is not None:
+            # Devices which aren't databased only know their parameters once they have data, so they're always asked
+            param_names = self.device_params.get(device_name)
+            if param_names is None:
+                param_names = device.get_all_param_names()
+            return list(param_names)
         
         # If no matching device is found, return an empty list
-        self.__log(f"Device '{device_name}' not found when fetching parameters.", DataLogger.LogSeverity.DEBUG)
+        self.__log("Device '%s' not found when fetching parameters.", DataLogger.LogSeverity.DEBUG, device_name)
         return []
     
 
+    def __snapshot_device(self, device_key: str, param_keys: Union[List[str], None], caller: str) -> Dict[Tuple[str, str], Any]:
+        '''
+        Copies parameters from a single device (See snapshot()).
+
+        Parameters:
+            device_key (str): The key of the device.
+            param_keys (List[str]): The parameters to copy. Copies every parameter if None.
+            caller (str): The name of the entity requesting the data. Used for logging purposes.
+
+        Returns:
+            Dict[Tuple[str, str], Any]: The value of each (device_key, param_key).
+        '''
+        device = self.devices.get(device_key)
+        if device is None:
+            self.__log('Device %s not found. (Data Req: %s)', DataLogger.LogSeverity.DEBUG, device_key, param_keys, name=caller)
+            return {(device_key, param_key): "UKNDEV" for param_key in param_keys or ()}
+
+        status = device.status
+        if status is not Device.DeviceStatus.ACTIVE:
+            if param_keys is None:
+                param_keys = self.device_params.get(device_key)
+                if param_keys is None:
+                    param_keys = device.get_all_param_names()
+            sentinel = self.STATUS_SENTINELS[status]
+            return {(device_key, param_key): sentinel for param_key in param_keys}
+
+        return {(device_key, param_key): "NO_DATA" if value is None else value
+                for param_key, value in device.snapshot(param_keys).items()}
+
+
+    def __make_change_callback(self, device: Device, callback: Callable) -> Callable[[str, dict], None]:
+        '''
+        Wraps a subscriber's callback, so it gets the same values as get_device_data() would return (See subscribe()).
+        '''
+        def on_change(device_key: str, changes: dict):
+            status = device.status
+            if status is not Device.DeviceStatus.ACTIVE:
+                sentinel = self.STATUS_SENTINELS[status]
+                callback({(device_key, param_key): sentinel for param_key in changes})
+            else:
+                callback({(device_key, param_key): "NO_DATA" if value is None else value
+                          for param_key, value in changes.items()})
+        return on_change
+
+
     def __initialize_io(self):
 
         '''Initializes all sensors & interfaces for the DDS'''
@@ -198,7 +479,10 @@ class DDS_IO:
                     Elcon_UHF('Backend/candatabase/evolve_elcon_uhf_charger.dbc', self.log)
                 ],
                 logger=self.log,
-                parameter_monitor=self.parameter_monitor
+                parameter_monitor=self.parameter_monitor,
+                max_frames_per_update=CONFIG["can_settings"]["max_frames_per_update"],
+                rx_buffer_size=CONFIG["can_settings"]["rx_buffer_size"],
+                sniff_unknowns=CONFIG["can_settings"]["sniff_unknowns"]
             )
             self.__safe_initialize_interface(canInterface)
             self.__log("Finished initializing all CAN devices!")
@@ -246,8 +530,9 @@ class DDS_IO:
             bool: The result of the device being successfully initialized
         """
 
-        # Add the interface to the interfaces dict:
+        # Add the interface to the interfaces dict, and its devices to the device index:
         self.interfaces[interface.name] = interface
+        self.__index_devices(interface)
 
         try:
             # Attempt to initalize the interface
@@ -262,6 +547,23 @@ class DDS_IO:
         return True      
 
 
+    def __index_devices(self, interface: Interface):
+        '''
+        Adds the devices of an interface to the device name -> device index (and CAN devices' parameters to the parameter index).
+
+        Parameters:
+            interface (Interface): The interface being added.
+        '''
+        for device_name, device in interface.devices.items():
+            if device_name in self.devices and self.devices[device_name] is not device:
+                self.__log(f'Device name {device_name} on {interface.name} is already used. Keeping the first device.',
+                           DataLogger.LogSeverity.WARNING)
+                continue
+            self.devices[device_name] = device
+            if isinstance(device, CANDevice):
+                self.device_params[device_name] = device.get_all_param_names()
+
+
     def __failed_to_init_interface(self, interface: Interface, e: Exception):
         '''
         This method takes care of handling the failed initialization
@@ -295,18 +597,13 @@ class DDS_IO:
         ))
 
     
-    def __log(self, msg: str, severity=DataLogger.LogSeverity.INFO, name="DDS_IO"):
-        self.log.writeLog(
-            loggerName=name,
-            msg=msg,
-            severity=severity)
+    def __log(self, msg: str, severity=DataLogger.LogSeverity.INFO, *args, name="DDS_IO"):
+        self.log.writeLog(name, msg, severity, *args)
 
 
 
 # Example / Testing Code
 
-import time
-
 if __name__ == '__main__':
 
     io = DDS_IO()
@@ -1,3 +1,4 @@
+import asyncio
 import time
 import threading
 import logging
@@ -7,6 +8,12 @@ from typing import Callable, Dict, Any, Optional, Tuple
 from Backend.config.config_loader import CONFIG
 
 
+# ===== Protocol (shared by PCCClient & AsyncPCCClient) =====
+HANDSHAKE_REQUEST = "START_COMMUNICATION_DDS"
+HANDSHAKE_RESPONSE = "GOOD_TO_START_COMMUNICATION_PCC"
+RECEIVE_SIZE = 1024     # Largest message read at once (bytes)
+
+
 class NotConnectedException(Exception):
     pass
 
@@ -55,15 +62,9 @@ class PCCClient:
                 self.connected_to_server = False
                 continue
 
-            request_parsed = self._parse_request(request_message)
-            if not request_parsed:
-                self.log.error(f"Failed to parse request: {request_message}")
-                self.connected_to_server = False
+            sensor_data = self._handle_request(request_message)
+            if sensor_data is None:
                 continue
-
-            device, parameter = request_parsed
-            sensor_data = self.get_data_callable(device, parameter)
-            self.log.debug(f"Sending response {sensor_data} for request {request_parsed}")
             self._send_message(sensor_data)
 
         self.log.critical("Client thread stopped running.")
@@ -78,16 +79,8 @@ class PCCClient:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(1)
             self.socket.connect((ip, port))
-            self.socket.sendall("START_COMMUNICATION_DDS".encode())
-
-            handshake = self.socket.recv(1024).decode()
-            if handshake == "GOOD_TO_START_COMMUNICATION_PCC":
-                self.log.info(f"Connected to PCC at {ip}:{port}")
-                return True
-            else:
-                self.log.warning(f"Handshake failed. Received: {handshake}")
-                self.close_connection()
-                return False
+            self.socket.sendall(HANDSHAKE_REQUEST.encode())
+            return self._check_handshake(self.socket.recv(RECEIVE_SIZE), ip, port)
         except (ConnectionRefusedError, ConnectionResetError, TimeoutError, OSError) as e:
             self.log.debug(f"Connection attempt failed: {e}")
             self.close_connection()
@@ -96,8 +89,7 @@ class PCCClient:
     def _send_message(self, message: Dict[str, Any]) -> None:
         """Encodes and sends a message to the server."""
         try:
-            encoded_message = json.dumps(message).encode()
-            self.socket.sendall(encoded_message)
+            self.socket.sendall(self._encode_message(message))
         except (BrokenPipeError, OSError) as e:
             self.log.warning(f"Error sending message: {e}")
             self.connected_to_server = False
@@ -109,15 +101,53 @@ class PCCClient:
         Returns the message string if successful, or None if there is an error.
         """
         try:
-            message = self.socket.recv(1024).decode()
-            self.log.debug(f"Received message: {message}")
-            return message
+            return self._decode_message(self.socket.recv(RECEIVE_SIZE))
         except (ConnectionResetError, TimeoutError, OSError) as e:
             self.log.error(f"Error receiving message: {e}")
             self.connected_to_server = False
             self.close_connection()
             return None
 
+    # ===== Protocol helpers (shared with AsyncPCCClient) =====
+    def _check_handshake(self, handshake: bytes, ip: str, port: int) -> bool:
+        """
+        Checks the server's reply to the handshake request, closing the connection if it's wrong.
+        Returns True if the handshake was successful.
+        """
+        handshake = handshake.decode()
+        if handshake == HANDSHAKE_RESPONSE:
+            self.log.info(f"Connected to PCC at {ip}:{port}")
+            return True
+        self.log.warning(f"Handshake failed. Received: {handshake}")
+        self.close_connection()
+        return False
+
+    def _encode_message(self, message: Dict[str, Any]) -> bytes:
+        """Encodes a message to be sent to the server."""
+        return json.dumps(message).encode()
+
+    def _decode_message(self, data: bytes) -> str:
+        """Decodes a message received from the server."""
+        message = data.decode()
+        self.log.debug(f"Received message: {message}")
+        return message
+
+    def _handle_request(self, request_message: str) -> Optional[Any]:
+        """
+        Parses a request from the server, and gets the requested sensor data.
+        Returns the response to send, or None if the request couldn't be parsed (which drops the connection).
+        """
+        request_parsed = self._parse_request(request_message)
+        if not request_parsed:
+            self.log.error(f"Failed to parse request: {request_message}")
+            self.connected_to_server = False
+            return None
+
+        device, parameter = request_parsed
+        sensor_data = self.get_data_callable(device, parameter)
+        self.log.debug(f"Sending response {sensor_data} for request {request_parsed}")
+        return sensor_data
+
     def _parse_request(self, data: str) -> Optional[Tuple[str, str]]:
         """
         Parses a JSON-formatted request.
@@ -155,6 +185,106 @@ class PCCClient:
                 self.connected_to_server = False
 
 
+class AsyncPCCClient(PCCClient):
+    """
+    The same client as PCCClient, run as a task on an asyncio event loop instead of in its own thread.
+    Used by the asyncio IO engine (See Backend.io_engine).
+    """
+
+    def __init__(self, get_data_callable: Callable[[str, str], Any]) -> None:
+        super().__init__(get_data_callable)
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    def start(self) -> None:
+        """Does nothing. The client is started by running run() on an event loop."""
+        pass
+
+    def stop(self) -> None:
+        """Stops the client loop and closes the connection. Must be called from the event loop's thread."""
+        self._stop_event.set()
+        self.close_connection()
+
+    async def run(self) -> None:
+        """
+        Continuously manages the connection, receives requests from the server, and sends sensor data responses.
+        Waiting for requests doesn't use a timeout, so an idle connection costs nothing.
+        """
+        while not self._stop_event.is_set():
+            if not self.connected_to_server:
+                await asyncio.sleep(1)
+                self.connected_to_server = await self._connect_to_server_async(self.server_ip, self.server_port)
+                continue
+
+            request_message = await self._receive_message_async()
+            if request_message is None:
+                self.log.warning("Lost connection to server")
+                self.connected_to_server = False
+                continue
+
+            sensor_data = self._handle_request(request_message)
+            if sensor_data is None:
+                continue
+            await self._send_message_async(sensor_data)
+
+        self.log.critical("Client task stopped running.")
+
+    async def _connect_to_server_async(self, ip: str, port: int) -> bool:
+        """
+        Attempts to establish a connection with the server and perform handshake.
+        Returns True if connection and handshake are successful, False otherwise.
+        """
+        self.log.debug(f"Attempting to connect to PCC at {ip}:{port}")
+        try:
+            self.reader, self.writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=1)
+            self.writer.write(HANDSHAKE_REQUEST.encode())
+            await self.writer.drain()
+            return self._check_handshake(await asyncio.wait_for(self.reader.read(RECEIVE_SIZE), timeout=1), ip, port)
+        except (ConnectionRefusedError, ConnectionResetError, asyncio.TimeoutError, OSError) as e:
+            self.log.debug(f"Connection attempt failed: {e}")
+            self.close_connection()
+            return False
+
+    async def _send_message_async(self, message: Dict[str, Any]) -> None:
+        """Encodes and sends a message to the server."""
+        try:
+            self.writer.write(self._encode_message(message))
+            await self.writer.drain()
+        except (BrokenPipeError, OSError) as e:
+            self.log.warning(f"Error sending message: {e}")
+            self.connected_to_server = False
+            self.close_connection()
+
+    async def _receive_message_async(self) -> Optional[str]:
+        """
+        Receives a message from the server.
+        Returns the message string if successful, or None if there is an error or the server closed the connection.
+        """
+        try:
+            data = await self.reader.read(RECEIVE_SIZE)
+        except (ConnectionResetError, OSError) as e:
+            self.log.error(f"Error receiving message: {e}")
+            data = b""
+        if not data:
+            self.connected_to_server = False
+            self.close_connection()
+            return None
+        return self._decode_message(data)
+
+    def close_connection(self) -> None:
+        """Closes the stream connection if it exists."""
+        super().close_connection()
+        if self.writer:
+            try:
+                self.writer.close()
+            except Exception as e:
+                self.log.error(f"Error closing stream: {e}")
+            finally:
+                self.reader = None
+                self.writer = None
+                self.connected_to_server = False
+
+
 if __name__ == "__main__":
     def fetch_device_data(device: str, parameter: str) -> Dict[str, Any]:
         # Replace with actual data retrieval logic.
@@ -0,0 +1,123 @@
+# Device Cache Contention Benchmark for Terrier Motorsport's DDS
+    # Compares the locked device cache against the copy-on-write cache.
+
+'''
+Runs writer threads updating a device's cache (like the ADS_1015 & MPU_6050_x3 workers) while reader threads
+poll it (like the UI labels), and prints the reads & writes per second, along with the slowest read.
+
+    - locked:        get_data() & _update_cache() both take the device lock, and the cache is updated in place.
+    - copy-on-write: Device.get_data() reads the current cache without the lock, writers publish a new cache.
+
+Run from the repo root:
+    python -m Backend.analysis.cache_benchmark
+'''
+
+import tempfile
+import threading
+import time
+from typing import Dict, List
+from Backend.data_logger import DataLogger
+from Backend.device import Device
+
+
+READER_THREADS = 4
+WRITER_THREADS = 2
+PARAMS_PER_WRITE = 6        # Ex. one MPU6050's acceleration & gyroscope
+PARAM_COUNT = 24
+DURATION = 2                # Seconds per run
+
+
+class BenchmarkDevice(Device):
+    '''A device which is only written by the benchmark's writer threads.'''
+
+    def initialize(self, bus):
+        self.status = self.DeviceStatus.ACTIVE
+
+    def update(self):
+        pass
+
+    def _data_collection_worker(self):
+        pass
+
+
+class LockedBenchmarkDevice(BenchmarkDevice):
+    '''The old Device cache: every read & write takes the lock, and the cache is updated in place.'''
+
+    def get_data(self, param_name: str):
+        with self.lock:
+            return self.cached_values.get(param_name, None)
+
+    def _update_cache(self, new_data: dict):
+        with self.lock:
+            cached_values = self.cached_values
+            for param_name, value in new_data.items():
+                if param_name not in cached_values or cached_values[param_name] != value:
+                    self.changed_params.add(param_name)
+            cached_values.update(new_data)
+            self.last_cache_update = time.time()
+
+
+def run(device: Device) -> Dict[str, float]:
+    '''Runs the readers & writers against a device. Returns the throughput & the slowest read.'''
+    param_names: List[str] = [f'param{i}' for i in range(PARAM_COUNT)]
+    device._update_cache({param_name: 0 for param_name in param_names})
+
+    stop = threading.Event()
+    reads = [0] * READER_THREADS
+    writes = [0] * WRITER_THREADS
+    slowest_reads = [0.0] * READER_THREADS
+
+    def reader(index: int):
+        count = 0
+        slowest = 0.0
+        get_data = device.get_data
+        while not stop.is_set():
+            for param_name in param_names:
+                start = time.perf_counter()
+                get_data(param_name)
+                slowest = max(slowest, time.perf_counter() - start)
+            count += PARAM_COUNT
+        reads[index] = count
+        slowest_reads[index] = slowest
+
+    def writer(index: int):
+        count = 0
+        value = 0
+        while not stop.is_set():
+            value += 1
+            first = (count * PARAMS_PER_WRITE) % PARAM_COUNT
+            device._update_cache({param_names[(first + i) % PARAM_COUNT]: value for i in range(PARAMS_PER_WRITE)})
+            count += 1
+        writes[index] = count
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(READER_THREADS)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(WRITER_THREADS)]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'reads': sum(reads) / DURATION,
+        'writes': sum(writes) / DURATION,
+        'slowest_read': max(slowest_reads),
+    }
+
+
+def run_benchmark():
+    logger = DataLogger('cache_benchmark', baseDirectoryPath=tempfile.mkdtemp(), logLevel=DataLogger.LogSeverity.INFO)
+    print(f'{READER_THREADS} readers, {WRITER_THREADS} writers, {PARAM_COUNT} params, {DURATION} s per run\n')
+
+    for label, device_class in (('locked', LockedBenchmarkDevice), ('copy-on-write', BenchmarkDevice)):
+        results = run(device_class(label, logger))
+        print(f'{label:>13}: {results["reads"]:12.0f} reads/s, '
+              f'{results["writes"]:10.0f} writes/s, '
+              f'slowest read {results["slowest_read"] * 1e3:7.2f} ms')
+
+    logger.close()
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,99 @@
+# CAN Decode Benchmark for Terrier Motorsport's DDS
+    # Compares CANDevice's compiled decode plans against decoding straight from the database.
+
+'''
+Replays the CAN logs in Backend/analysis/to_decode/ through both decoding paths,
+checks that they produce the same values & units, and prints the time per frame.
+
+Run from the repo root:
+    python -m Backend.analysis.decode_benchmark
+'''
+
+import glob
+import time
+from typing import Dict, List, Tuple
+from cantools.database import Database, load_file
+from Backend.device import CANDecodePlan
+
+
+DBC_FILE_PATHS = [
+    'Backend/candatabase/Orion_BMS2_CANBUSv7.dbc',
+    'Backend/candatabase/DTI_HV_500_CANBUSv3.dbc',
+    'Backend/candatabase/evolve_elcon_uhf_charger.dbc',
+]
+REPLAY_FILE_GLOB = 'Backend/analysis/to_decode/*.txt'
+REPEATS = 200
+
+
+def load_replay_frames(file_glob: str) -> List[Tuple[int, bytes]]:
+    '''
+    Reads every extended ID frame (Ex. 'x1806E5F4801CE0064000000000F04') from the replay files.
+
+    Returns:
+        List[Tuple[int, bytes]]: The frame ID & data of each frame.
+    '''
+    frames = []
+    for file_path in sorted(glob.glob(file_glob)):
+        with open(file_path, 'r') as file:
+            for line in file:
+                line = line.strip()
+                if not line.startswith('x'):
+                    continue
+                frames.append((int(line[1:9], 16), bytes.fromhex(line[10:-4])))
+    return frames
+
+
+def decode_with_database(db: Database, frame_id: int, data: bytes) -> Dict[str, tuple]:
+    '''The old CANDevice.update() path: decode, then look up each signal's unit.'''
+    decoded = db.decode_message(frame_id, data)
+    tagged = {}
+    for signal_name, value in decoded.items():
+        unit = db.get_message_by_frame_id(frame_id).get_signal_by_name(signal_name).unit
+        tagged[signal_name] = (value, unit)
+    return tagged
+
+
+def decode_with_plan(plans: Dict[int, CANDecodePlan], frame_id: int, data: bytes) -> Dict[str, tuple]:
+    '''The CANDevice.update_batch() path.'''
+    plan = plans[frame_id]
+    units = plan.units
+    return {signal_name: (value, units[signal_name]) for signal_name, value in plan.decode(data).items()}
+
+
+def run_benchmark():
+    frames = load_replay_frames(REPLAY_FILE_GLOB)
+
+    for dbc_path in DBC_FILE_PATHS:
+        db = load_file(dbc_path)
+        plans = {message.frame_id: CANDecodePlan(db.get_message_by_frame_id(message.frame_id))
+                 for message in db.messages}
+        device_frames = [(frame_id, data) for frame_id, data in frames if frame_id in plans]
+        if not device_frames:
+            print(f'{dbc_path}: no frames in the replay files.')
+            continue
+
+        # Make sure both paths agree before timing them
+        for frame_id, data in device_frames:
+            expected = decode_with_database(db, frame_id, data)
+            actual = decode_with_plan(plans, frame_id, data)
+            if expected != actual:
+                raise AssertionError(f'{dbc_path} {hex(frame_id)}: {actual} != {expected}')
+
+        results = {}
+        for label, decode in (('database', lambda f, d: decode_with_database(db, f, d)),
+                              ('plan', lambda f, d: decode_with_plan(plans, f, d))):
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                for frame_id, data in device_frames:
+                    decode(frame_id, data)
+            elapsed = time.perf_counter() - start
+            results[label] = elapsed / (REPEATS * len(device_frames)) * 1e6
+
+        print(f'{dbc_path}: {len(device_frames)} frames, '
+              f'database {results["database"]:.2f} us/frame, '
+              f'plan {results["plan"]:.2f} us/frame '
+              f'({results["database"] / results["plan"]:.1f}x)')
+
+
+if __name__ == '__main__':
+    run_benchmark()
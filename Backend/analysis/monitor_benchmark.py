@@ -0,0 +1,113 @@
+# Parameter Monitoring Benchmark for Terrier Motorsport's DDS
+    # Compares checking every parameter every update against only checking the parameters that changed.
+
+'''
+Replays the CAN logs in Backend/analysis/to_decode/ through the real CAN devices (with every
+signal in their DBC files cached), and times the parameter monitoring done after each update.
+
+    - before: Interface.update() checked every parameter of every device, once per device.
+    - after:  Only the parameters whose cached value changed since the last update are checked, once.
+
+Run from the repo root:
+    python -m Backend.analysis.monitor_benchmark
+'''
+
+import tempfile
+import time
+from typing import Dict, List, Tuple
+from Backend.analysis.decode_benchmark import load_replay_frames, REPLAY_FILE_GLOB
+from Backend.data_logger import DataLogger
+from Backend.device import CANDevice
+from Backend.value_monitor import ParameterMonitor
+from Backend.resources.orionbms2 import Orion_BMS_2
+from Backend.resources.dtihv500 import DTI_HV_500
+from Backend.resources.elconuhf import Elcon_UHF
+import can
+
+
+FRAMES_PER_UPDATE = 20      # Frames drained from the bus per Interface.update() (Ex. ~2000 frames/s at 100 updates/s)
+REPEATS = 5
+
+
+def monitor_all(devices: List[CANDevice], monitor: ParameterMonitor) -> int:
+    '''The old Interface.update() monitoring. Returns the number of checks.'''
+    checks = 0
+    for _ in devices:
+        for device in devices:
+            for param_name in device.get_all_param_names():
+                monitor.check_value(param_name, device.get_data(param_name))
+                checks += 1
+    return checks
+
+
+def monitor_changed(devices: List[CANDevice], monitor: ParameterMonitor) -> int:
+    '''The new Interface._monitor_device_parameters(). Returns the number of checks.'''
+    checks = 0
+    for device in devices:
+        changes = device.pop_changed_values()
+        monitor.check_values(changes)
+        checks += len(changes)
+    return checks
+
+
+def make_updates(devices: List[CANDevice]) -> List[Dict[str, List[can.Message]]]:
+    '''Splits the replay frames into the batches each device gets on each update.'''
+    owners: Dict[int, CANDevice] = {}
+    for device in devices:
+        for frame_id in device.decode_plans:
+            owners.setdefault(frame_id, device)
+
+    frames: List[Tuple[int, bytes]] = [(frame_id, data) for frame_id, data in load_replay_frames(REPLAY_FILE_GLOB)
+                                       if frame_id in owners]
+    updates = []
+    for start in range(0, len(frames), FRAMES_PER_UPDATE):
+        batches = {device.name: [] for device in devices}
+        for frame_id, data in frames[start:start + FRAMES_PER_UPDATE]:
+            batches[owners[frame_id].name].append(can.Message(arbitration_id=frame_id, data=data, is_extended_id=True))
+        updates.append(batches)
+    return updates
+
+
+def run_benchmark():
+    # Disabled debug logs, so log formatting doesn't hide the cost of the checks themselves
+    logger = DataLogger('monitor_benchmark', baseDirectoryPath=tempfile.mkdtemp(), logLevel=DataLogger.LogSeverity.INFO)
+    monitor = ParameterMonitor('Backend/config/valuelimits.json5', logger)
+    devices: List[CANDevice] = [
+        Orion_BMS_2('Backend/candatabase/Orion_BMS2_CANBUSv7.dbc', logger),
+        DTI_HV_500('Backend/candatabase/DTI_HV_500_CANBUSv3.dbc', logger),
+        Elcon_UHF('Backend/candatabase/evolve_elcon_uhf_charger.dbc', logger),
+    ]
+    for device in devices:
+        print(f'{device.name}: {len(device.get_all_param_names())} signals')
+
+    updates = make_updates(devices)
+    print(f'{len(updates)} updates of {FRAMES_PER_UPDATE} frames\n')
+
+    for label, monitor_devices in (('before', monitor_all), ('after', monitor_changed)):
+        checks = 0
+        elapsed = 0.0
+        for _ in range(REPEATS):
+            # Start from a cache holding every signal, like a car that has been running for a while
+            for device in devices:
+                device._update_cache({signal: 0 for signal in device.get_all_param_names()})
+                device.pop_changed_values()
+
+            for batches in updates:
+                for device in devices:
+                    device.update_batch(batches[device.name])
+
+                start = time.perf_counter()
+                checks += monitor_devices(devices, monitor)
+                elapsed += time.perf_counter() - start
+
+        update_count = REPEATS * len(updates)
+        print(f'{label:>6}: {checks / update_count:8.1f} checks/update, '
+              f'{elapsed / update_count * 1e6:8.1f} us/update, '
+              f'{checks / elapsed:10.0f} checks/s, '
+              f'max {update_count / elapsed:8.0f} updates/s')
+
+    logger.close()
+
+
+if __name__ == '__main__':
+    run_benchmark()
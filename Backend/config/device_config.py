@@ -6,6 +6,11 @@ from Backend.resources.ads_1015 import ADS_1015
 from Backend.resources.mpu6050 import MPU_6050_x3
 
 
+# ===== Target Sample Rates (reads per second) =====
+PRESSURE_SAMPLE_RATE = 100
+TEMPERATURE_SAMPLE_RATE = 10         # Coolant temperatures change slowly
+IMU_SAMPLE_RATE = 200
+
 # ===== M3200 Constants =====
 M3200_value_mapper = ValueMapper(
     voltage_range=[0.5, 4.5], 
@@ -39,10 +44,10 @@ def define_ADC1(logger) -> ADS_1015:
         deviceName = 'coolingLoopSensors1'
 
         device = ADS_1015(deviceName, logger=logger, inputs = [
-            Analog_In('hotPressure', 'bar', mapper=M3200_value_mapper),           #ADC1(A0)
-            Analog_In('hotTemperature', '°C', mapper=NTC_M12_value_mapper),       #ADC1(A1)
-            Analog_In('coldPressure', 'bar', mapper=M3200_value_mapper),          #ADC1(A2)
-            Analog_In('coldTemperature', '°C', mapper=NTC_M12_value_mapper)       #ADC1(A3)
+            Analog_In('hotPressure', 'bar', mapper=M3200_value_mapper, sample_rate=PRESSURE_SAMPLE_RATE),           #ADC1(A0)
+            Analog_In('hotTemperature', '°C', mapper=NTC_M12_value_mapper, sample_rate=TEMPERATURE_SAMPLE_RATE),    #ADC1(A1)
+            Analog_In('coldPressure', 'bar', mapper=M3200_value_mapper, sample_rate=PRESSURE_SAMPLE_RATE),          #ADC1(A2)
+            Analog_In('coldTemperature', '°C', mapper=NTC_M12_value_mapper, sample_rate=TEMPERATURE_SAMPLE_RATE)    #ADC1(A3)
         ])
 
         return device
@@ -56,8 +61,8 @@ def define_ADC2(logger) -> ADS_1015:
         deviceName = 'coolingLoopSensors2'
 
         device = ADS_1015(deviceName, logger=logger, inputs = [
-            Analog_In('TBDPressure', 'bar', mapper=M3200_value_mapper),           #ADC2(A0)
-            Analog_In('TBDTemperature', '°C', mapper=NTC_M12_value_mapper),       #ADC2(A1)
+            Analog_In('TBDPressure', 'bar', mapper=M3200_value_mapper, sample_rate=PRESSURE_SAMPLE_RATE),           #ADC2(A0)
+            Analog_In('TBDTemperature', '°C', mapper=NTC_M12_value_mapper, sample_rate=TEMPERATURE_SAMPLE_RATE),    #ADC2(A1)
         ],
         i2c_addr=0x49)
 
@@ -68,7 +73,7 @@ def define_MPU_6050(logger) -> MPU_6050_x3:
     
     deviceName = 'Accelerometers'
 
-    return MPU_6050_x3(deviceName, logger)
+    return MPU_6050_x3(deviceName, logger, sample_rate=IMU_SAMPLE_RATE)
 
 
 def define_GPS(logger) -> None:
@@ -4,16 +4,22 @@
 
 from time import strftime,localtime       # Used for creating file names
 from time import time as currentTime      # Used for creating timestamps
-from csv import writer as csvWriter
-from csv import reader as csvReader
+from time import perf_counter as perfCounter   # Used for measuring latency
+from collections import OrderedDict
 from enum import Enum
+import atexit
 import os
+import queue
+import threading
 import time
 from Backend.config.config_loader import CONFIG
+from Backend.telemetry_format import TelemetryFormat, SegmentedTelemetryWriter, to_csv_fields, CSV_HEADER
+from Backend.telemetry_format import iter_telemetry, read_telemetry_columns, session_segments
 
 # Config logging
 LOG_FORMAT = '%(asctime)s [%(name)s]: %(levelname)s - %(message)s'
 import logging
+import logging.handlers
 logging.basicConfig(
     level=logging.INFO,     # Logs anything with a level above INFO
     format=LOG_FORMAT
@@ -24,7 +30,9 @@ class DataLogger:
     - **Data Logger**
     - Logs all data from the DDS_IO (Telemetry), as well as keeps track of major changes in I/O status (Logs).
         - Telemetry
-            - Every time a device has new data, it is written to the `Telemetry.csv` file.
+            - Every time a device has new data, it is written to the current `Telemetry_XXXX.csv` segment.
+            - In binary mode, it is written to the more compact `Telemetry_XXXX.bin` segments instead (see Backend.telemetry_format).
+            - A new segment is started once the current one is too big or too old, and `manifest.json` lists the segments.
             - This page details how to decode & interpret the log files:
                 - [DDS Telemetry Interpretation](https://www.notion.so/DDS-Telemetry-Interpretation-bffed1cd9a70488e8eb383ce73dcf0a9?pvs=21)
         - Logs
@@ -33,10 +41,22 @@ class DataLogger:
     '''
 
     childDirectoryPath: str   # Path of the parent directory
-    telemetryPath: str        # Path of the telemetry data 
     systemLogPath: str        # Path of the system logs
     FALLBACK_DIR_PATH = './Backend/logs/'
-    TIMEOUT_THRESH = 1
+    TIMEOUT_THRESH = 1                # Time (seconds) a repeated log message is suppressed for
+    LOG_DEDUPE_CACHE_SIZE = 1024      # Max number of recent log messages remembered for suppressing repeats
+    LOG_LEVEL = 10                    # Lowest severity passed to the logging module (= LogSeverity.DEBUG)
+    TELEMETRY_FLUSH_INTERVAL = 0.25   # Max time (seconds) telemetry is held before it is fsync'd to the disk
+    TELEMETRY_FLUSH_ROWS = 500        # Max number of telemetry rows buffered in memory before they are written
+    TELEMETRY_QUEUE_SIZE = 10000      # Max number of telemetry rows waiting for the writer thread
+    TELEMETRY_SEGMENT_MAX_BYTES = None      # Size (bytes) a telemetry segment is rolled over at (None = no limit)
+    TELEMETRY_SEGMENT_MAX_SECONDS = None    # Age (seconds) a telemetry segment is rolled over at (None = no limit)
+
+
+    class OverflowPolicy(Enum):
+        '''What writeTelemetry() does when the telemetry queue is full'''
+        DROP = 'drop'       # The new row is dropped (and counted). Producers never wait on the disk. [DEFAULT]
+        BLOCK = 'block'     # The producer waits until the writer thread makes room.
 
     
     class LogSeverity(Enum):
@@ -48,13 +68,50 @@ class DataLogger:
         DEBUG = 10      # Debug Message
 
 
-    def __init__(self, directoryName: str, baseDirectoryPath = './Backend/logs/'):
+    def __init__(self, 
+                 directoryName: str, 
+                 baseDirectoryPath = './Backend/logs/', 
+                 telemetryFlushInterval: float = TELEMETRY_FLUSH_INTERVAL,
+                 telemetryFlushRows: int = TELEMETRY_FLUSH_ROWS,
+                 telemetryQueueSize: int = TELEMETRY_QUEUE_SIZE,
+                 telemetryOverflowPolicy: 'DataLogger.OverflowPolicy' = OverflowPolicy.DROP,
+                 telemetryFormat: TelemetryFormat = TelemetryFormat.CSV,
+                 telemetrySegmentMaxBytes: int = TELEMETRY_SEGMENT_MAX_BYTES,
+                 telemetrySegmentMaxSeconds: float = TELEMETRY_SEGMENT_MAX_SECONDS,
+                 logDedupeCacheSize: int = LOG_DEDUPE_CACHE_SIZE,
+                 logLevel: 'DataLogger.LogSeverity' = LOG_LEVEL):
         """
         Initialize the Data Logger with paths, handlers, and settings.
+
+        Parameters:
+            directoryName (str): The name of the directory the logs are written to.
+            baseDirectoryPath (str): The directory which the log directory is made in.
+            telemetryFlushInterval (float): The longest time (seconds) telemetry is buffered before it is fsync'd.
+                                            This bounds how much data is lost if the power is cut.
+            telemetryFlushRows (int): The most telemetry rows that are buffered in memory before they are written to the file.
+            telemetryQueueSize (int): The most telemetry rows that can be waiting for the writer thread.
+            telemetryOverflowPolicy (OverflowPolicy): What to do with new rows when the queue is full.
+            telemetryFormat (TelemetryFormat): The format telemetry is written in (CSV or binary).
+            telemetrySegmentMaxBytes (int): Start a new telemetry segment once the current one is this big. None for no limit.
+            telemetrySegmentMaxSeconds (float): Start a new telemetry segment once the current one is this old. None for no limit.
+            logDedupeCacheSize (int): The most recent log messages remembered for suppressing repeats.
+            logLevel (LogSeverity): Logs below this severity are dropped by writeLog() before they are formatted.
         """
 
         # Init logger
         self.log = logging.getLogger('DataLogger')
+        self.__loggers = {}
+        self.setLogLevel(logLevel)
+
+        # Recently written log messages, oldest first, so repeats can be suppressed (see writeLog()).
+        self.logDedupeCacheSize = logDedupeCacheSize
+        self.__lastLogTimes: OrderedDict = OrderedDict()
+        self.__logLock = threading.Lock()
+        self.__logStats = {
+            'emitted': 0,       # Log messages written
+            'suppressed': 0,    # Log messages dropped because they were repeated within TIMEOUT_THRESH
+            'evicted': 0,       # Remembered messages forgotten early because the cache was full
+        }
 
 
         # Initialize variables
@@ -79,19 +136,54 @@ class DataLogger:
             time.sleep(1)
 
 
-        # Paths for telemetry and system logs
-        self.telemetryPath = os.path.join(self.childDirectoryPath, "Telemetry.csv")
+        # Paths for system logs
+        self.telemetryFormat = TelemetryFormat(telemetryFormat)
         self.systemLogPath = os.path.join(self.childDirectoryPath, "System.log")
         self.debugLogPath = os.path.join(self.childDirectoryPath, "debug.log")
 
         # Create files
-        self.__createCSVFile("Telemetry.csv")
         self.__configureLogger(self.systemLogPath, self.debugLogPath)
 
+        # Keep the telemetry file open, and buffer rows so we aren't opening the file for every value.
+        self.telemetryFlushInterval = telemetryFlushInterval
+        self.telemetryFlushRows = telemetryFlushRows
+        self.telemetryOverflowPolicy = DataLogger.OverflowPolicy(telemetryOverflowPolicy)
+        self.__telemetryBuffer = []
+        self.__telemetryWriter = SegmentedTelemetryWriter(self.childDirectoryPath,
+                                                          self.telemetryFormat,
+                                                          max_segment_bytes=telemetrySegmentMaxBytes,
+                                                          max_segment_seconds=telemetrySegmentMaxSeconds)
+        self.telemetryManifestPath = self.__telemetryWriter.manifest_path
+        self.__lastTelemetrySync = currentTime()
+
+        # Producers only put rows in the queue. The writer thread does all of the disk I/O.
+        self.__telemetryQueue = queue.Queue(maxsize=telemetryQueueSize)
+        self.__telemetryStatsLock = threading.Lock()
+        self.__telemetryStats = {
+            'queued': 0,                    # Rows put in the queue
+            'dropped': 0,                   # Rows dropped because the queue was full
+            'written': 0,                   # Rows written to the file
+            'write_errors': 0,              # Failed writes to the file (the rows being written are lost)
+            'max_queue_depth': 0,           # Most rows that have been waiting in the queue at once
+            'total_enqueue_latency': 0.0,   # Total time (seconds) producers spent in writeTelemetry()
+            'max_enqueue_latency': 0.0,     # Longest time (seconds) a producer spent in writeTelemetry()
+        }
+        self.__telemetryThread = threading.Thread(target=self.__telemetryWriterWorker, name='TelemetryWriter', daemon=True)
+        self.__telemetryThread.start()
+
+        # Make sure buffered telemetry makes it to the disk when the program exits
+        atexit.register(self.close)
+
         # Log setup completion
         self.writeLog("DataLogger", "Log & Telemetry file setup complete!")
 
 
+    @property
+    def telemetryPath(self) -> str:
+        '''The path of the telemetry segment currently being written.'''
+        return self.__telemetryWriter.path
+
+
     def __getLogger(self, loggerName: str) -> logging.Logger:
         """
         Gets a logger from the logging packqage and configures the logger.
@@ -102,89 +194,259 @@ class DataLogger:
         Returns:
             Logger (logging.Logger): The logger which correlates to the name provided.
         """
+        # setLevel() clears the logging module's level cache, so only configure each logger once
+        logger = self.__loggers.get(loggerName)
+        if logger is not None:
+            return logger
+
         # Get the logger with the specified name
         logger = logging.getLogger(loggerName)
 
         # Tell it to listen to any logs above the DEBUG level.
         logger.setLevel(logging.DEBUG)
+        self.__loggers[loggerName] = logger
 
         # Return that baby
         return logger
 
 
-    def writeTelemetry(self, device_name: str, param_name: str, value, units: str):
+    def writeTelemetry(self, device_name: str, param_name: str, value, units: str, timestamp: float = None):
         '''
         This function is called by different DDS Devices when new data is read.
         It logs the telemetry data to a csv file using the following data parameters:
 
+        The row is only put in a queue here. The writer thread writes rows to the file every
+        `telemetryFlushRows` rows, and fsyncs the file to the disk every `telemetryFlushInterval` seconds.
+
         Params:
             device_name (str): The name of the device which is logging telemetry.
             param_name (str): The name of the parameter which is being logged.
             value (any): The value of the parameter.
             units (str): The unit of the value given.
+            timestamp (float): When the value was read (Ex. a CAN frame's kernel receive time). Defaults to now.
         '''
 
         # Generate a timestamp for the entry
-        time = currentTime()
+        time = currentTime() if timestamp is None else timestamp
+        start = perfCounter()
+
+        # Hand the row to the writer thread
+        dropped = False
+        try:
+            self.__telemetryQueue.put((time, device_name, param_name, value, units), 
+                                      block=self.telemetryOverflowPolicy is DataLogger.OverflowPolicy.BLOCK)
+        except queue.Full:
+            dropped = True
+
+        # Keep track of how long producers are held up
+        latency = perfCounter() - start
+        with self.__telemetryStatsLock:
+            stats = self.__telemetryStats
+            if dropped:
+                stats['dropped'] += 1
+            else:
+                stats['queued'] += 1
+            stats['total_enqueue_latency'] += latency
+            if latency > stats['max_enqueue_latency']:
+                stats['max_enqueue_latency'] = latency
+
+
+    def getTelemetryStats(self) -> dict:
+        '''
+        Returns statistics about the telemetry queue & writer thread.
 
-        # Open the file in append ('a') mode
-        with open(self.telemetryPath, "a", newline='') as file:
+        Returns:
+            dict: The row counters, the current & max queue depth, and the average & max
+                  time (seconds) producers spent handing rows to the queue.
+        '''
+        with self.__telemetryStatsLock:
+            stats = dict(self.__telemetryStats)
 
-            # Create the CSV writer
-            writer = csvWriter(file)
+        handed_off = stats['queued'] + stats['dropped']
+        stats['queue_depth'] = self.__telemetryQueue.qsize()
+        stats['segments'] = self.__telemetryWriter.segment_count
+        stats['avg_enqueue_latency'] = stats.pop('total_enqueue_latency') / handed_off if handed_off else 0.0
+        return stats
 
-            # Write the data
-            writer.writerow([time, device_name, param_name, value, units])
+
+    def getLogStats(self) -> dict:
+        '''
+        Returns statistics about the log messages passed to writeLog().
+
+        Returns:
+            dict: The number of messages emitted, suppressed as repeats, and evicted from the
+                  dedupe cache early, plus the current size of the dedupe cache.
+        '''
+        with self.__logLock:
+            stats = dict(self.__logStats)
+            stats['cache_size'] = len(self.__lastLogTimes)
+        return stats
+
+
+    def flushTelemetry(self, timeout: float = 5):
+        '''
+        Waits for the writer thread to write all queued telemetry to the file and fsync it to the disk.
+
+        Parameters:
+            timeout (float): The longest time (seconds) to wait for the writer thread.
+        '''
+        if not self.__telemetryThread.is_alive():
+            return
+
+        # The writer thread syncs the file and sets the event once it gets to this point in the queue
+        flushed = threading.Event()
+        self.__telemetryQueue.put(flushed)
+        flushed.wait(timeout)
+
+
+    def close(self):
+        '''Writes all queued telemetry, stops the writer & log threads and closes their files. Called automatically on exit.'''
+        if self.__telemetryThread.is_alive():
+            self.__telemetryQueue.put(None)   # Tells the writer thread to stop
+            self.__telemetryThread.join()
+
+        if self.__logListener is not None:
+            self.__logListener.stop()
+            for handler in self.__logListener.handlers:
+                handler.close()
+            self.__logListener = None
+
+
+    def iterTelemetry(self, devices=None, params=None, start: float = None, end: float = None):
+        '''
+        Streams this session's telemetry one row at a time, without loading the whole file.
+
+        Params:
+            devices (str | Iterable[str]): Only return rows from these devices. Defaults to all devices.
+            params (str | Iterable[str]): Only return rows for these parameters. Defaults to all parameters.
+            start (float): Only return rows at or after this time.
+            end (float): Only return rows at or before this time.
+
+        Returns:
+            Iterator[tuple]: `(time, device, parameter, value, units)` for each matching row.
+        '''
+        # Make sure buffered rows are in the file
+        self.flushTelemetry()
+        return iter_telemetry(self.childDirectoryPath, devices, params, start, end)
+
+
+    def getTelemetryColumns(self, devices=None, params=None, start: float = None, end: float = None) -> dict:
+        '''
+        Returns this session's telemetry as NumPy `time` & `value` arrays for each (device, parameter).
+        Takes the same filters as `iterTelemetry()`.
+        '''
+        # Make sure buffered rows are in the file
+        self.flushTelemetry()
+        return read_telemetry_columns(self.childDirectoryPath, devices, params, start, end)
+
+
+    def getTelemetrySegments(self, start: float = None, end: float = None, last: int = None) -> list[str]:
+        '''
+        Returns the paths of this session's telemetry segments which can have rows in a time window (oldest first).
+        Useful for uploading or reading only the recent part of a session.
+
+        Params:
+            start (float): Leave out segments which end before this time.
+            end (float): Leave out segments which start after this time.
+            last (int): Only return (up to) this many of the most recent segments.
+        '''
+        # Make sure buffered rows are in the file
+        self.flushTelemetry()
+        return session_segments(self.childDirectoryPath, start, end, last)
 
 
     def getTelemetry(self) -> list[list]:
         '''Returns a list of lines, which contain data in the following format:
-        "Time", "Device", "Parameter", "Value", "Units"'''
+        "Time", "Device", "Parameter", "Value", "Units"
 
-        # Open the file
-        with open(self.telemetryPath, "r") as file:
+        NOTE: This loads the whole session into memory. Use `iterTelemetry()` or `getTelemetryColumns()` for long sessions.'''
 
-            # Create the CSV reader
-            reader = csvReader(file)
-
-            # Read the data
-            data = list(reader)
+        # Make sure buffered rows are in the file
+        self.flushTelemetry()
 
+        # Every segment is read back into the format the CSV reader gives
+        data = [CSV_HEADER]
+        for row in iter_telemetry(self.childDirectoryPath):
+            data.append(to_csv_fields(row))
         return data
     
 
-    def writeLog(self, loggerName: str, msg: str, severity: LogSeverity = LogSeverity.INFO):
+    def setLogLevel(self, severity: 'DataLogger.LogSeverity'):
+        '''
+        Sets the lowest severity writeLog() passes on. Anything below it costs one comparison.
+
+        Parameters:
+            severity (LogSeverity | int): The lowest severity to log.
+        '''
+        self.logLevel = severity.value if isinstance(severity, DataLogger.LogSeverity) else int(severity)
+
+
+    def isLogEnabled(self, severity: 'DataLogger.LogSeverity') -> bool:
+        '''Returns True if writeLog() would pass on a message of this severity. Use it to skip building expensive log arguments.'''
+        return severity.value >= self.logLevel
+
+
+    def writeLog(self, loggerName: str, msg: str, severity: LogSeverity = LogSeverity.INFO, *args):
         """
         Writes a log message, avoiding duplicate messages within the timeout threshold.
 
+        The message can be a %-style format string, with its arguments passed after the severity
+        (Ex. `writeLog('CANInterface', 'No device found for message ID %s.', LogSeverity.DEBUG, frame_id)`).
+        The message is only formatted once it is actually written, and messages below `logLevel`
+        return before anything else is done, so disabled debug logs are nearly free.
+
+        Recently written messages are kept in a bounded cache, in the order they were written.
+        Messages older than `TIMEOUT_THRESH` are evicted from the front of the cache as new ones come in,
+        and the oldest message is evicted early if the cache is full, so the cache never grows past
+        `logDedupeCacheSize` (messages with embedded values would otherwise add a new entry every call).
+
         Parameters:
             loggerName (str): Name of the system creating the log message
             msg (str): The content to be logged
             severity (LogSeverity): The level of the log
+            args: Arguments merged into the message (msg % args) when it is written
         """
-        # Dictionary to track the last time each message was logged
-        if not hasattr(self, "_last_log_times"):
-            self._last_log_times = {}
-
-        # Create a unique key for the logger and message
-        log_key = f"{loggerName}:{msg}"
+        if severity.value < self.logLevel:
+            return
 
-        # Get the current time
+        log_key = (loggerName, msg, args)
+        try:
+            hash(log_key)
+        except TypeError:
+            # Unhashable arguments can't be used in the key. Format the message now instead.
+            msg = msg % args
+            args = ()
+            log_key = (loggerName, msg, args)
         current_time = time.time()
+        expired_time = current_time - self.TIMEOUT_THRESH
 
-        # Check if the message was recently logged
-        if log_key in self._last_log_times:
-            last_log_time = self._last_log_times[log_key]
-            # Skip logging if less than 1 second has passed
-            if current_time - last_log_time < self.TIMEOUT_THRESH:
+        with self.__logLock:
+            lastLogTimes = self.__lastLogTimes
+
+            # Skip logging if the message was written less than TIMEOUT_THRESH ago
+            last_log_time = lastLogTimes.get(log_key)
+            if last_log_time is not None and last_log_time > expired_time:
+                self.__logStats['suppressed'] += 1
                 return
 
-        # Update the last logged time for the message
-        self._last_log_times[log_key] = current_time
+            # Forget messages which can't suppress anything anymore. They are in the order they were written.
+            while lastLogTimes:
+                oldest_key, oldest_time = next(iter(lastLogTimes.items()))
+                if oldest_time > expired_time:
+                    break
+                del lastLogTimes[oldest_key]
+
+            # Remember the message (at the back of the cache), making room if the cache is full
+            lastLogTimes.pop(log_key, None)
+            lastLogTimes[log_key] = current_time
+            if len(lastLogTimes) > self.logDedupeCacheSize:
+                lastLogTimes.popitem(last=False)
+                self.__logStats['evicted'] += 1
+            self.__logStats['emitted'] += 1
 
         # Get the logger and log the message
         logger = self.__getLogger(loggerName)
-        logger.log(level=severity.value, msg=f"{msg}")
+        logger.log(severity.value, msg, *args)
 
 
     def __configureLogger(self, systemLogPath: str, debugLogPath: str):
@@ -212,50 +474,143 @@ class DataLogger:
         streamHandler = logging.StreamHandler()            
         streamHandler.setLevel(logging.INFO)              # Log anything to the console >= DEBUG
 
+        # The file & console handlers run on a listener thread, so callers never wait on the disk.
+        # Records are formatted by the queue handler before being queued.
+        logQueue = queue.Queue()
+        self.__logListener = logging.handlers.QueueListener(
+            logQueue,
+            systemLogFileHandler,
+            debugLogFileHandler,
+            streamHandler,
+            respect_handler_level=True
+        )
+        self.__logListener.start()
+
         # Write to the logging config
         logging.basicConfig(
             level=logging.INFO,     # Logs anything with a level above INFO
             format=LOG_FORMAT, 
             handlers=[
-                systemLogFileHandler,
-                debugLogFileHandler,
-                streamHandler
+                logging.handlers.QueueHandler(logQueue)
             ],
             force=True
             )
         
 
-    def __getFormattedTime(self, timestamp: float = None) -> str:
-        """
-        Returns a formatted time string. If a timestamp is provided, it formats that time.
-        Otherwise, it formats the current local time.
-        """
-        if timestamp is None:
-            timestamp = time.time()  # Use the current time if no timestamp is given
-        return strftime("%Y-%m-%d--%H-%M-%S", localtime(timestamp))
+    def __telemetryWriterWorker(self):
+        '''
+        Runs on the writer thread. Takes rows from the telemetry queue and writes them to the telemetry file.
+        The file is fsync'd whenever `telemetryFlushInterval` seconds have passed, even if no rows are coming in.
+        '''
+        telemetryQueue = self.__telemetryQueue
+
+        while True:
+            # Wait for a row, but not past the next sync
+            timeout = max(0, self.__lastTelemetrySync + self.telemetryFlushInterval - currentTime())
+            try:
+                item = telemetryQueue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+
+            # None means close() was called
+            if item is None:
+                self.__closeTelemetryWriter()
+                return
+
+            # An event means flushTelemetry() is waiting for everything before it to be written
+            if isinstance(item, threading.Event):
+                self.__syncTelemetry()
+                item.set()
+                continue
+
+            if item:
+                self.__bufferTelemetryRow(item)
 
+            # Push everything to the disk if it's been too long
+            if currentTime() - self.__lastTelemetrySync >= self.telemetryFlushInterval:
+                self.__syncTelemetry()
 
-    def __createCSVFile(self, fileName: str):
+
+    def __bufferTelemetryRow(self, row: tuple):
+        '''
+        Adds a row to the telemetry buffer, and writes the buffer to the file once enough rows have built up.
+        Must only be called by the writer thread.
         '''
-        Create a csv file with a specified fileName & write the header row to it.
-        Header row: `["Time", "Device", "Parameter", "Value", "Units"]`
+        self.__telemetryBuffer.append(row)
 
-        Parameters:
-            fileName (str): The name of the file to be created.
+        # Keep track of how far behind the writer is
+        depth = self.__telemetryQueue.qsize() + 1
+        if depth > self.__telemetryStats['max_queue_depth']:
+            with self.__telemetryStatsLock:
+                self.__telemetryStats['max_queue_depth'] = depth
+
+        if len(self.__telemetryBuffer) >= self.telemetryFlushRows:
+            self.__writeTelemetryBuffer()
+
+
+    def __closeTelemetryWriter(self):
+        '''
+        Writes the buffered telemetry rows, then closes the telemetry file.
+        Must only be called by the writer thread.
         '''
+        self.__writeTelemetryBuffer()
+        try:
+            self.__telemetryWriter.close()
+        except (OSError, ValueError) as e:
+            self.log.error(f'Failed to close {self.telemetryPath}: {e}')
 
-        filePath = os.path.join(self.childDirectoryPath, fileName)
 
-        with open(filePath, "w") as file:
-            # Create the CSV writer
-            writer = csvWriter(file)
+    def __writeTelemetryBuffer(self):
+        '''
+        Writes the buffered telemetry rows to the telemetry file.
+        Must only be called by the writer thread.
+        '''
+        if not self.__telemetryBuffer:
+            return
 
-            # Write the header row
-            writer.writerow(["Time", "Device", "Parameter", "Value", "Units"])
+        rowCount = len(self.__telemetryBuffer)
+        segmentCount = self.__telemetryWriter.segment_count
+        try:
+            self.__telemetryWriter.writerows(self.__telemetryBuffer)
+        except (OSError, ValueError, OverflowError) as e:
+            # The storage probably went away. Don't let the rows pile up in memory.
+            self.log.error(f'Failed to write {rowCount} telemetry rows to {self.telemetryPath}: {e}')
+            with self.__telemetryStatsLock:
+                self.__telemetryStats['write_errors'] += 1
+        else:
+            with self.__telemetryStatsLock:
+                self.__telemetryStats['written'] += rowCount
+        self.__telemetryBuffer.clear()
+
+        if self.__telemetryWriter.segment_count != segmentCount:
+            self.log.info(f'Started telemetry segment {self.telemetryPath}')
+
+
+    def __syncTelemetry(self):
+        '''
+        Writes the buffered telemetry rows and fsyncs the telemetry file to the disk.
+        Must only be called by the writer thread.
+        '''
+        self.__writeTelemetryBuffer()
+        try:
+            self.__telemetryWriter.sync()
+        except (OSError, ValueError) as e:
+            self.log.error(f'Failed to sync {self.telemetryPath}: {e}')
+            with self.__telemetryStatsLock:
+                self.__telemetryStats['write_errors'] += 1
+        self.__lastTelemetrySync = currentTime()
+
+
+    def __getFormattedTime(self, timestamp: float = None) -> str:
+        """
+        Returns a formatted time string. If a timestamp is provided, it formats that time.
+        Otherwise, it formats the current local time.
+        """
+        if timestamp is None:
+            timestamp = time.time()  # Use the current time if no timestamp is given
+        return strftime("%Y-%m-%d--%H-%M-%S", localtime(timestamp))
 
-            # The 'with as' block automatically closes the file when it is done
 
-    
     def __validateFileName(self, fileName):
         '''Validates the file name passed in. If the file name is not valid, a ValueError is raised'''
 
@@ -338,7 +693,7 @@ if __name__ == '__main__':
 
     # Simulate retrieving telemetry data
     print("\nTelemetry Data Logged:")
-    for row in data_logger.getTelemetry():
+    for row in data_logger.iterTelemetry():
         print(row)
 
     # Log an error message after a delay (to avoid duplicate filtering)
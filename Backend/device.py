@@ -1,7 +1,7 @@
 # Device Abstract Base Class for Terrier Motorsport's DDS
     # Code by Jackson Justus (jackjust@bu.edu)
 
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Union
 from Backend.data_logger import DataLogger
 from Backend.value_monitor import ParameterMonitor, ParameterWarning
 from abc import ABC, abstractmethod
@@ -11,6 +11,22 @@ from enum import Enum
 import threading
 import queue
 
+class DeviceSubscription:
+    '''
+    A consumer's interest in changes to some of a device's parameters (See Device.subscribe()).
+
+    Attributes:
+        callback (Callable[[str, dict], None]): Called with the device name & the changed values of the subscribed parameters.
+        param_names (frozenset): The subscribed parameters, or None for every parameter.
+    '''
+
+    __slots__ = ('callback', 'param_names')
+
+    def __init__(self, callback: Callable[[str, dict], None], param_names: List[str] = None):
+        self.callback = callback
+        self.param_names = None if param_names is None else frozenset(param_names)
+
+
 class Device(ABC):
     '''
     This class provides standard methods which each Device
@@ -38,8 +54,11 @@ class Device(ABC):
         '''
         self.name = name
         self.log = logger
-        self.cached_values = {}
-        self.lock = threading.Lock()
+        self.cached_values = {}         # Copy-on-write: replaced (never modified) by writers, so it can be read without the lock
+        self.changed_params = set()     # Parameters whose cached value changed since pop_changed_values() was last called
+        self.subscriptions: List[DeviceSubscription] = []
+        self.__pending_notifications = {}   # Latest value of each parameter that changed since publish_changes() was last called
+        self.lock = threading.Lock()    # Serializes writers. Readers of cached_values don't need it (see _update_cache())
         self.__status = self.DeviceStatus.NOT_INITIALIZED
         self.last_cache_update = time.time()
         self.thread = None  # Worker thread for data collection
@@ -144,20 +163,132 @@ class Device(ABC):
 
     def get_data(self, param_name: str):
         '''
-        Thread-safe access to cached data.
+        Thread-safe access to cached data. Never blocks (see _update_cache()).
+        '''
+        return self.cached_values.get(param_name, None)
+
+
+    def snapshot(self, param_names: List[str] = None) -> dict:
+        '''
+        Thread-safe copy of many cached values at once, all from the same cache update. Never blocks (see _update_cache()).
+
+        Parameters:
+            param_names (List[str]): The parameters to copy. Copies every cached parameter if None.
+
+        Returns:
+            dict: The value of each parameter (None if the parameter has no data).
+        '''
+        cached_values = self.cached_values
+        if param_names is None:
+            return dict(cached_values)
+        return {param_name: cached_values.get(param_name) for param_name in param_names}
+
+
+    def pop_changed_values(self) -> dict:
+        '''
+        Thread-safe access to the parameters whose value changed since the last call.
+
+        Returns:
+            dict: The current value of each parameter that changed.
         '''
         with self.lock:
-            return self.cached_values.get(param_name, None)
+            if not self.changed_params:
+                return {}
+            cached_values = self.cached_values
+            changes = {param_name: cached_values[param_name] for param_name in self.changed_params}
+            self.changed_params.clear()
+            return changes
+
+
+    def subscribe(self, callback: Callable[[str, dict], None], param_names: List[str] = None) -> DeviceSubscription:
+        '''
+        Registers a callback which is given the parameters that changed, instead of having to poll them.
+        Changes are coalesced until publish_changes() is called (once per interface update), so the callback
+        is called at most once per update, with only the latest value of each changed parameter.
+
+        Parameters:
+            callback (Callable[[str, dict], None]): Called with the device name & a dict of the changed values.
+            param_names (List[str]): The parameters to be notified about. Every parameter if None.
+
+        Returns:
+            DeviceSubscription: The subscription, which can be passed to unsubscribe().
+        '''
+        subscription = DeviceSubscription(callback, param_names)
+        with self.lock:
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+
+    def unsubscribe(self, subscription: DeviceSubscription):
+        '''Stops a subscription made by subscribe(). Does nothing if it was already stopped.'''
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+            if not self.subscriptions:
+                self.__pending_notifications = {}
+
+
+    def publish_changes(self):
+        '''
+        Calls every subscription with the parameters that changed since the last call.
+        Should be called from the thread that consumes the data (Ex. the interface's update()), not the worker thread.
+        '''
+        with self.lock:
+            if not self.__pending_notifications:
+                return
+            changes = self.__pending_notifications
+            self.__pending_notifications = {}
+            subscriptions = self.subscriptions
+
+        for subscription in subscriptions:
+            param_names = subscription.param_names
+            if param_names is None:
+                delta = changes
+            else:
+                delta = {param_name: value for param_name, value in changes.items() if param_name in param_names}
+                if not delta:
+                    continue
+            try:
+                subscription.callback(self.name, delta)
+            except Exception as e:
+                self._log("Subscriber %s failed: %s", self.log.LogSeverity.ERROR, subscription.callback, e)
+
+
+    def mark_all_changed(self):
+        '''
+        Marks every cached parameter as changed, so they are all monitored again on the next update
+        (Ex. after the limits they were checked against changed).
+        '''
+        with self.lock:
+            self.changed_params.update(self.cached_values)
 
 
     def _update_cache(self, new_data: dict):
         '''
         Thread-safe update of the cache.
-        Writes telemetry based on new data
+        Keeps track of which parameters changed, so they can be monitored (see pop_changed_values()).
+
+        The cache is copy-on-write: the changes are made to a copy, which then replaces cached_values in a single
+        (atomic) assignment. Readers always see a complete cache, so they never have to take the lock.
+        Only writers take the lock, to keep from losing each other's changes.
         '''
         # self._log_telemetry(new_data)
         with self.lock:
-            self.cached_values.update(new_data)
+            cached_values = self.cached_values
+            changed_params = self.changed_params
+            notifications = self.__pending_notifications if self.subscriptions else None
+            changed = False
+            for param_name, value in new_data.items():
+                if param_name not in cached_values or cached_values[param_name] != value:
+                    changed = True
+                    changed_params.add(param_name)
+                    if notifications is not None:
+                        notifications[param_name] = value
+
+            # Publish a new cache, unless nothing changed
+            if changed:
+                new_cache = dict(cached_values)
+                new_cache.update(new_data)
+                self.cached_values = new_cache
             self.last_cache_update = time.time()
 
 
@@ -171,12 +302,16 @@ class Device(ABC):
         '''
         with self.lock:
             if self.cached_values and time.time() - self.last_cache_update > self.CACHE_TIMEOUT_THRESHOLD:
+                cleared = [key for key, value in self.cached_values.items() if value is not None]
+                self.changed_params.update(cleared)
+                if self.subscriptions:
+                    self.__pending_notifications.update(dict.fromkeys(cleared))
                 self.cached_values = {key: None for key in self.cached_values}
                 self._log("Cache cleared due to timeout.", self.log.LogSeverity.WARNING)
 
 
     # ===== HELPER METHODS =====
-    def _log_telemetry(self, param_name: str, value, units: str):
+    def _log_telemetry(self, param_name: str, value, units: str, timestamp: float = None):
         """
         Logs telemetry data to the telemetry file.
 
@@ -184,17 +319,19 @@ class Device(ABC):
             param_name (str): The name of the parameter being logged.
             value (Any): The value of the parameter.
             units (str): The units of the parameter's value.
+            timestamp (float): When the value was read. Defaults to now.
         """
         self.log.writeTelemetry(
             device_name=self.name, 
             param_name=param_name,
             value=value,
-            units=units)
+            units=units,
+            timestamp=timestamp)
 
 
-    def _log(self, msg: str, severity=DataLogger.LogSeverity.INFO):
-        """Shorthand logging method."""
-        self.log.writeLog(loggerName=self.name, msg=msg, severity=severity)
+    def _log(self, msg: str, severity=DataLogger.LogSeverity.INFO, *args):
+        """Shorthand logging method. Any args are formatted into msg lazily (see DataLogger.writeLog)."""
+        self.log.writeLog(self.name, msg, severity, *args)
     
 
     # ===== GETTER/SETTER METHODS ====
@@ -215,19 +352,130 @@ class Device(ABC):
         # Change the status
         self.__status = value
 
+        # Let subscribers know, as the value of every parameter depends on the status (See DDS_IO.STATUS_SENTINELS)
+        if self.subscriptions:
+            with self.lock:
+                notifications = self.__pending_notifications
+                for subscription in self.subscriptions:
+                    if subscription.param_names is not None:
+                        notifications.update(dict.fromkeys(subscription.param_names))
+                notifications.update(self.cached_values)
+
+
+class AcquisitionChannel:
+    '''
+    One read that an I2C device needs to make regularly, and how often it should be made (See I2CScheduler).
+
+    Attributes:
+        name (str): The name of the channel (Ex. the parameter it reads).
+        rate (float): The target number of reads per second.
+        read (Callable[[], dict]): Makes the read on the bus. Returns the new values, by parameter name.
+        device (Device): The device the values belong to.
+    '''
+
+    __slots__ = ('name', 'rate', 'read', 'device')
+
+    def __init__(self, name: str, rate: float, read: Callable[[], dict], device: Device):
+        if rate <= 0:
+            raise ValueError(f"The rate of {name} must be positive, got {rate}")
+        self.name = name
+        self.rate = rate
+        self.read = read
+        self.device = device
+
 
 class I2CDevice(Device):
-    # TODO: IMPLEMENT
-    pass
+    '''
+    A device on an I2C bus.
+
+    Instead of running its own worker thread, an I2C device describes the reads it needs as acquisition channels
+    (See get_acquisition_channels()), and the I2CInterface's scheduler makes them on the shared bus at each channel's rate.
+    '''
+
+    def get_acquisition_channels(self) -> List[AcquisitionChannel]:
+        '''
+        Returns the reads the scheduler should make for this device. Called once, when the interface initializes,
+        even if the device failed to initialize, so the channels mustn't depend on the device being initialized.
+        The scheduler skips them until the device is active.
+        '''
+        return []
+
+
+    def update(self):
+        '''
+        The scheduler updates the cache, so this only checks if the cache has timed out.
+        '''
+        self._check_cache_timeout()
+
+
+    def _data_collection_worker(self):
+        '''
+        Not used. Data is collected by the I2CInterface's scheduler (See get_acquisition_channels()).
+        '''
+        pass
 
 import can
 import cantools.database
+
+
+class CANDecodePlan:
+    '''
+    A precompiled decoding recipe for one CAN message (frame ID).
+
+    Everything needed to decode a frame and tag its signals with units is looked up
+    from the database once, when the plan is made, so decoding a frame doesn't need
+    any database or signal lookups.
+
+    Attributes:
+        message (cantools.database.Message): The message definition from the DBC.
+        signals (tuple): One `(name, unit, scale, offset, choices)` tuple per signal, in the order they are decoded.
+        units (Dict[str, str]): The unit of each signal, by signal name.
+    '''
+
+    def __init__(self, message: cantools.database.Message):
+        self.message = message
+        self.signals = tuple(
+            (signal.name, signal.unit, signal.scale, signal.offset, signal.choices)
+            for signal in message.signals
+        )
+        self.units = {signal.name: signal.unit for signal in message.signals}
+
+        # Multiplexed & container messages change their layout based on their contents,
+        # so they are left to cantools to decode.
+        self.__is_simple = not (message.is_multiplexed() or message.is_container)
+
+
+    def decode(self, data: bytes) -> Dict[str, Union[int, float, str]]:
+        '''
+        Decodes the data of a frame into a dictionary of signal values (scaled, with choices applied).
+
+        Raises:
+            cantools.database.DecodeError: If the data can't be decoded (Ex. too short for the message).
+        '''
+        if not self.__is_simple:
+            return self.message.decode(data)
+
+        # Unpack the raw values, then do the scaling ourselves with the precomputed constants.
+        raw_values = self.message.decode_simple(data, decode_choices=False, scaling=False)
+
+        decoded = {}
+        for name, unit, scale, offset, choices in self.signals:
+            raw_value = raw_values[name]
+            if choices is not None and raw_value in choices:
+                decoded[name] = choices[raw_value]
+            else:
+                decoded[name] = raw_value * scale + offset
+        return decoded
+
+
 class CANDevice(Device):
 
     db: cantools.database.Database
+    decode_plans: Dict[int, CANDecodePlan]
 
     def __init__(self, name, dbc_filepath: str, logger: DataLogger):
         self.db = cantools.database.load_file(dbc_filepath)
+        self.decode_plans = self._compile_decode_plans()
         super().__init__(name, logger)
     
 
@@ -248,29 +496,51 @@ class CANDevice(Device):
             self._check_cache_timeout()
             return
 
-        # Decoding the message
-        decoded_msg: Dict[str, float]
-        try:
-            # Decode the CAN message using the database
-            decoded_msg = self.db.decode_message(msg.arbitration_id, msg.data)
-        except KeyError:
-            # Log a warning if no database entry matches the arbitration ID
-            self._log(f"No database entry found for CAN msg: {msg}", self.log.LogSeverity.ERROR)
-            return None
-        
-        # Logging the message
-        for signal_name, value in decoded_msg.items():
+        self.update_batch([msg])
 
-            # Get the units for the signal
-            cantools_message = self.db.get_message_by_frame_id(msg.arbitration_id)
-            cantools_signal = cantools_message.get_signal_by_name(signal_name)
-            unit = cantools_signal.unit
 
-            # Write the data to the log file 
-            self._log_telemetry(signal_name, value, units=unit)
+    def update_batch(self, msgs: List[can.Message]):
+        '''
+        Decodes a batch of CAN messages and updates the cache once with all of their signals.
+
+        Signals which appear in multiple messages of the batch keep the value from the latest message.
+        If the batch is empty, the cache timeout is checked instead.
+        '''
+
+        # Return early if no new data.
+        if not msgs:
+            self._check_cache_timeout()
+            return
+
+        new_data: Dict[str, float] = {}
+        decode_plans = self.decode_plans
+        for msg in msgs:
+
+            # Get the decode plan for the message
+            plan = decode_plans.get(msg.arbitration_id)
+            if plan is None:
+                # Log a warning if no database entry matches the arbitration ID
+                self._log("No database entry found for CAN msg: %s", self.log.LogSeverity.ERROR, msg)
+                continue
+
+            # Decoding the message
+            try:
+                decoded_msg = plan.decode(msg.data)
+            except cantools.database.DecodeError as e:
+                self._log("Could not decode CAN msg: %s (%s)", self.log.LogSeverity.ERROR, msg, e)
+                continue
+            
+            # Logging the message, with the time the kernel received it (frames can wait in the interface's buffer)
+            units = plan.units
+            timestamp = msg.timestamp or None
+            for signal_name, value in decoded_msg.items():
+                self._log_telemetry(signal_name, value, units=units[signal_name], timestamp=timestamp)
+
+            new_data.update(decoded_msg)
 
         # Update or add all decoded values to the cached values dictionary.
-        self._update_cache(decoded_msg)
+        if new_data:
+            self._update_cache(new_data)
 
     
     def _data_collection_worker(self):
@@ -279,6 +549,22 @@ class CANDevice(Device):
         '''
         return
 
+    def _compile_decode_plans(self) -> Dict[int, CANDecodePlan]:
+        '''
+        Compiles a decode plan for every frame ID in the device's CAN Database.
+
+        Returns:
+            Dict[int, CANDecodePlan]: The decode plan for each frame ID.
+        '''
+        decode_plans: Dict[int, CANDecodePlan] = {}
+        for message in self.db.messages:
+            # Use the same definition that cantools would decode the frame ID with
+            # (if a DBC reuses a frame ID, the last definition wins)
+            frame_id = message.frame_id
+            decode_plans[frame_id] = CANDecodePlan(self.db.get_message_by_frame_id(frame_id))
+        return decode_plans
+
+
     def get_all_param_names(self) -> List[str]:
         '''
         Gets all of the signals listed in the device's CAN Database.
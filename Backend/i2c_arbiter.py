@@ -0,0 +1,310 @@
+# I2C Bus Arbiter for Terrier Motorsport's DDS
+    # Makes every transaction on a shared I2C bus from one thread, in priority order.
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+from smbus2 import SMBus
+
+
+"""
+Every device on an I2C interface shares one SMBus. Without coordination, transactions from different threads
+(Ex. the scheduler reading, and the main thread re-initializing a device) interleave unpredictably.
+
+The arbiter looks like an SMBus to the devices (and to helper packages such as ads1015), but every call is queued
+as a transaction and made by the arbiter's bus thread:
+
+    - Transactions are made in priority order (then in the order they were queued).
+    - Each call is made exactly as requested. Only read_blocks() merges reads: a driver that knows its registers
+      auto-increment (and are safe to read, Ex. not clear-on-read) can ask for several blocks, and adjacent
+      (or nearly adjacent) blocks are made as one transaction.
+    - The time each transaction waits in the queue & spends on the bus is tracked per address (See get_stats()).
+"""
+
+
+class I2CTransaction:
+    '''
+    One queued call to the SMBus, along with its result once it is made.
+    '''
+
+    __slots__ = ('method', 'args', 'parts', 'queued_time', 'done', 'result', 'error', 'cancelled')
+
+    def __init__(self, method: str, args: tuple, parts: int = 1):
+        self.method = method
+        self.args = args
+        self.parts = parts      # Number of requested reads made by this transaction (> 1 if read_blocks() merged them)
+        self.queued_time = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False  # The caller gave up waiting, so it is never made (See I2CBusArbiter.__wait())
+
+
+    @property
+    def address(self) -> int:
+        return self.args[0]
+
+
+    def finish(self, result: Any = None, error: Exception = None):
+        self.result = result
+        self.error = error
+        self.done.set()
+
+
+class AddressStats:
+    '''
+    The latency of the transactions made to one I2C address.
+    '''
+
+    __slots__ = ('transactions', 'merged', 'errors', 'wait_total', 'wait_max', 'bus_total', 'bus_max')
+
+    def __init__(self):
+        self.transactions = 0   # Transactions requested by callers
+        self.merged = 0         # Requested block reads that were merged into another one (See read_blocks())
+        self.errors = 0         # Transactions that raised an exception
+        self.wait_total = 0.0   # Time spent waiting in the queue (seconds)
+        self.wait_max = 0.0
+        self.bus_total = 0.0    # Time spent on the bus (seconds)
+        self.bus_max = 0.0
+
+
+class I2CBusArbiter:
+    '''
+    Serializes every transaction on an SMBus through a priority queue (See the module description).
+    '''
+
+    # Transaction priorities. Lower numbers are made first.
+    HIGH_PRIORITY = 0       # Ex. the scheduler's paced reads
+    NORMAL_PRIORITY = 1     # Ex. device initialization & configuration
+    LOW_PRIORITY = 2
+
+    # Largest number of unrequested registers between two blocks that read_blocks() merges
+    MAX_MERGE_GAP = 2
+
+    # Largest number of bytes in a single SMBus block read
+    MAX_BLOCK_LENGTH = 32
+
+    # Longest time (seconds) a caller waits for its transaction before giving up
+    TRANSACTION_TIMEOUT = 1
+
+
+    def __init__(self, bus: SMBus, name: str):
+        '''
+        Parameters:
+            bus (SMBus): The bus every transaction is made on.
+            name (str): The name of the arbiter (Ex. the interface's name). Used in error messages.
+        '''
+        self.bus = bus
+        self.name = name
+        self.queue_peak = 0
+        self.__queue: List[Tuple[int, int, I2CTransaction]] = []
+        self.__sequence = itertools.count()
+        self.__condition = threading.Condition()
+        self.__thread_priority = threading.local()
+        self.__stats: Dict[int, AddressStats] = {}
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__run, name=f'{name}BusArbiter', daemon=True)
+        self.__thread.start()
+
+
+    # ===== SMBUS METHODS =====
+    def read_i2c_block_data(self, i2c_addr: int, register: int, length: int, force=None) -> List[int]:
+        return self.__transact('read_i2c_block_data', (i2c_addr, register, length, force))
+
+    def write_i2c_block_data(self, i2c_addr: int, register: int, data: List[int], force=None):
+        return self.__transact('write_i2c_block_data', (i2c_addr, register, data, force))
+
+    def read_byte_data(self, i2c_addr: int, register: int, force=None) -> int:
+        return self.__transact('read_byte_data', (i2c_addr, register, force))
+
+    def write_byte_data(self, i2c_addr: int, register: int, value: int, force=None):
+        return self.__transact('write_byte_data', (i2c_addr, register, value, force))
+
+    def read_word_data(self, i2c_addr: int, register: int, force=None) -> int:
+        return self.__transact('read_word_data', (i2c_addr, register, force))
+
+    def write_word_data(self, i2c_addr: int, register: int, value: int, force=None):
+        return self.__transact('write_word_data', (i2c_addr, register, value, force))
+
+    def read_byte(self, i2c_addr: int, force=None) -> int:
+        return self.__transact('read_byte', (i2c_addr, force))
+
+    def write_byte(self, i2c_addr: int, value: int, force=None):
+        return self.__transact('write_byte', (i2c_addr, value, force))
+
+
+    # ===== PUBLIC METHODS =====
+    def read_blocks(self, i2c_addr: int, blocks: List[Tuple[int, int]]) -> List[List[int]]:
+        '''
+        Reads several register blocks from one address. Blocks that are adjacent (or at most `MAX_MERGE_GAP`
+        registers apart) are made as one block read, of up to `MAX_BLOCK_LENGTH` bytes.
+
+        Only use this on devices with byte-sized registers that auto-increment, and where any registers
+        in the gaps are safe to read (Ex. not clear-on-read, or a FIFO). Otherwise, read each block on its own.
+
+        Parameters:
+            i2c_addr (int): The address of the device.
+            blocks (List[Tuple[int, int]]): The (first register, length) of each block.
+
+        Returns:
+            List[List[int]]: The bytes of each block, in the same order as `blocks`.
+        '''
+        # Group the blocks into spans, each read with one transaction: [first register, end register, block indexes]
+        spans: List[list] = []
+        for index in sorted(range(len(blocks)), key=lambda index: blocks[index][0]):
+            register, length = blocks[index]
+            span = spans[-1] if spans else None
+            if (span is not None and register <= span[1] + self.MAX_MERGE_GAP
+                    and max(span[1], register + length) - span[0] <= self.MAX_BLOCK_LENGTH):
+                span[1] = max(span[1], register + length)
+                span[2].append(index)
+            else:
+                spans.append([register, register + length, [index]])
+
+        transactions = [I2CTransaction('read_i2c_block_data', (i2c_addr, start, end - start, None), parts=len(indexes))
+                        for start, end, indexes in spans]
+        self.__queue_transactions(transactions)
+
+        # Give each block its part of its span
+        results: List[List[int]] = [None] * len(blocks)
+        for (start, end, indexes), transaction in zip(spans, transactions):
+            try:
+                data = self.__wait(transaction)
+            except TimeoutError:
+                self.__cancel(transactions)
+                raise
+            for index in indexes:
+                register, length = blocks[index]
+                results[index] = list(data[register - start:register - start + length])
+        return results
+
+
+    def set_thread_priority(self, priority: int):
+        '''Sets the priority of every transaction the calling thread makes from now on (NORMAL_PRIORITY by default).'''
+        self.__thread_priority.value = priority
+
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        '''
+        Returns the latency of the transactions made to each address.
+
+        Returns:
+            Dict[str, Dict[str, float]]: By address (Ex. '0x48'): the number of transactions, merged & failed transactions,
+                                         and the mean & max queue wait and bus time (seconds).
+        '''
+        with self.__condition:
+            return {
+                hex(address): {
+                    'transactions': stats.transactions,
+                    'merged': stats.merged,
+                    'errors': stats.errors,
+                    'mean_wait': stats.wait_total / stats.transactions if stats.transactions else 0.0,
+                    'max_wait': stats.wait_max,
+                    'mean_bus_time': stats.bus_total / stats.transactions if stats.transactions else 0.0,
+                    'max_bus_time': stats.bus_max,
+                }
+                for address, stats in self.__stats.items()
+            }
+
+
+    def close(self):
+        '''Stops the bus thread (failing any queued transactions), then closes the bus.'''
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        if self.__thread is not threading.current_thread():
+            self.__thread.join(timeout=self.TRANSACTION_TIMEOUT)
+        self.bus.close()
+
+
+    # ===== CALLER SIDE =====
+    def __transact(self, method: str, args: tuple) -> Any:
+        transaction = I2CTransaction(method, args)
+        self.__queue_transactions([transaction])
+        return self.__wait(transaction)
+
+
+    def __queue_transactions(self, transactions: List[I2CTransaction]):
+        priority = getattr(self.__thread_priority, 'value', self.NORMAL_PRIORITY)
+        with self.__condition:
+            if self.__closed:
+                raise OSError(f'{self.name} bus arbiter is closed.')
+            for transaction in transactions:
+                heapq.heappush(self.__queue, (priority, next(self.__sequence), transaction))
+            if len(self.__queue) > self.queue_peak:
+                self.queue_peak = len(self.__queue)
+            self.__condition.notify()
+
+
+    def __wait(self, transaction: I2CTransaction) -> Any:
+        if not transaction.done.wait(self.TRANSACTION_TIMEOUT):
+            # The caller has moved on, so the transaction can't be made later (Ex. a config write landing after newer ones)
+            self.__cancel([transaction])
+            raise TimeoutError(f'I2C {transaction.method} to {hex(transaction.address)} timed out on {self.name}.')
+        if transaction.error is not None:
+            raise transaction.error
+        return transaction.result
+
+
+    def __cancel(self, transactions: List[I2CTransaction]):
+        '''Stops queued transactions from being made. Transactions already taken by the bus thread still finish.'''
+        with self.__condition:
+            for transaction in transactions:
+                transaction.cancelled = True
+
+
+    # ===== BUS THREAD =====
+    def __run(self):
+        '''Makes the queued transactions, highest priority first, until the arbiter is closed.'''
+        while True:
+            with self.__condition:
+                while not self.__queue and not self.__closed:
+                    self.__condition.wait()
+                if self.__closed:
+                    pending = [transaction for priority, sequence, transaction in self.__queue]
+                    self.__queue = []
+                    break
+                priority, sequence, transaction = heapq.heappop(self.__queue)
+                if transaction.cancelled:
+                    continue
+
+            self.__execute(transaction)
+
+        for transaction in pending:
+            transaction.finish(error=OSError(f'{self.name} bus arbiter was closed.'))
+
+
+    def __execute(self, transaction: I2CTransaction):
+        '''Makes a single transaction on the bus.'''
+        start = time.perf_counter()
+        try:
+            result = getattr(self.bus, transaction.method)(*transaction.args)
+        except Exception as e:
+            self.__record(transaction, start, time.perf_counter(), error=True)
+            transaction.finish(error=e)
+            return
+        self.__record(transaction, start, time.perf_counter())
+        transaction.finish(result)
+
+
+    def __record(self, transaction: I2CTransaction, start: float, end: float, error: bool = False):
+        '''Records the latency of a transaction, once for each requested read it made.'''
+        bus_time = end - start
+        wait = start - transaction.queued_time
+        parts = transaction.parts
+        with self.__condition:
+            stats = self.__stats.get(transaction.address)
+            if stats is None:
+                stats = self.__stats[transaction.address] = AddressStats()
+            stats.transactions += parts
+            stats.merged += parts - 1
+            stats.wait_total += wait * parts
+            stats.bus_total += bus_time * parts
+            if wait > stats.wait_max:
+                stats.wait_max = wait
+            if bus_time > stats.bus_max:
+                stats.bus_max = bus_time
+            if error:
+                stats.errors += parts
@@ -0,0 +1,267 @@
+# I2C Acquisition Scheduler for Terrier Motorsport's DDS
+    # Plans every read on a shared I2C bus, so each channel is sampled at its target rate.
+
+import heapq
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple, Union
+from Backend.data_logger import DataLogger
+from Backend.device import Device, I2CDevice, AcquisitionChannel
+from Backend.i2c_arbiter import I2CBusArbiter
+
+
+"""
+Every I2C device used to run its own worker thread, which either read as fast as the bus allowed (ADS_1015)
+or slept for a fixed time (MPU_6050_x3). The scheduler replaces them with one thread per bus, which makes each
+device's reads (acquisition channels) when they are due, earliest deadline first, and sleeps in between.
+
+Each channel keeps track of its achieved rate & jitter, so we can see if the bus keeps up (See get_stats()).
+The stats are kept since the scheduler started, and separately for each window between the periodic debug logs.
+"""
+
+
+class ChannelStats:
+    '''
+    How well a channel is keeping to its target rate, since the stats were created (or last reset).
+
+    The jitter is how far the time between two reads is from the channel's period.
+    '''
+
+    __slots__ = ('samples', 'first_time', 'last_time', 'jitter_sum_sq', 'max_jitter', 'missed', 'errors')
+
+    def __init__(self):
+        self.reset()
+
+
+    def reset(self):
+        self.samples = 0
+        self.first_time = None      # Time of the first read (time.monotonic())
+        self.last_time = None       # Time of the most recent read
+        self.jitter_sum_sq = 0.0    # Sum of the squared jitter of every read, for the RMS jitter
+        self.max_jitter = 0.0       # Largest jitter of a single read
+        self.missed = 0             # Reads skipped because the channel fell more than a period behind
+        self.errors = 0             # Reads which raised an exception
+
+
+    def record(self, read_time: float, period: float):
+        '''Records a successful read, made at `read_time`.'''
+        if self.last_time is None:
+            self.first_time = read_time
+        else:
+            jitter = abs(read_time - self.last_time - period)
+            self.jitter_sum_sq += jitter * jitter
+            if jitter > self.max_jitter:
+                self.max_jitter = jitter
+        self.last_time = read_time
+        self.samples += 1
+
+
+    def achieved_rate(self) -> float:
+        '''Returns the number of reads per second.'''
+        if self.samples < 2:
+            return 0.0
+        return (self.samples - 1) / (self.last_time - self.first_time)
+
+
+    def rms_jitter(self) -> float:
+        '''Returns the root mean square of the jitter, in seconds.'''
+        if self.samples < 2:
+            return 0.0
+        return math.sqrt(self.jitter_sum_sq / (self.samples - 1))
+
+
+class I2CScheduler:
+    '''
+    Makes the reads of every device on an I2C bus, from a single thread, at each channel's target rate.
+    '''
+
+    # Interval (seconds) between acquisition statistics log entries
+    STATS_LOG_INTERVAL = 10
+
+    # Longest time the thread sleeps at once, so it notices stop() & devices coming back
+    MAX_SLEEP = 0.1
+
+
+    def __init__(self, name: str, logger: DataLogger, arbiter: Union[I2CBusArbiter, None] = None):
+        '''
+        Parameters:
+            name (str): The name of the scheduler (Ex. the interface's name). Used for logging purposes.
+            logger (DataLogger): A logger instance for logging scheduler-related messages.
+            arbiter (I2CBusArbiter): The arbiter of the bus, if any. The scheduler's reads are given high priority on it.
+        '''
+        self.name = name
+        self.log = logger
+        self.arbiter = arbiter
+        self.channels: List[AcquisitionChannel] = []
+        self.stats: Dict[Tuple[str, str], ChannelStats] = {}            # Since the scheduler started
+        self.__window_stats: Dict[Tuple[str, str], ChannelStats] = {}   # Since the stats were last logged
+        self.thread = None
+        self.__stop = threading.Event()
+        self.__stats_lock = threading.Lock()
+        self.__last_stats_log_time = time.monotonic()
+
+
+    # ===== PUBLIC METHODS =====
+    def start(self, devices: Iterable[I2CDevice]):
+        '''
+        Collects the acquisition channels of every device, and starts the scheduler thread (restarting it if running).
+
+        Parameters:
+            devices (Iterable[I2CDevice]): The devices on the bus. Their channels are collected even if they aren't active,
+                                           and are read once the device becomes active.
+        '''
+        self.stop()
+
+        channels = []
+        for device in devices:
+            try:
+                channels.extend(device.get_acquisition_channels())
+            except Exception as e:
+                self._log("Couldn't get the acquisition channels of %s: %s", DataLogger.LogSeverity.ERROR, device.name, e)
+        self.channels = channels
+        with self.__stats_lock:
+            self.stats = {(channel.device.name, channel.name): ChannelStats() for channel in channels}
+            self.__window_stats = {key: ChannelStats() for key in self.stats}
+        self.__last_stats_log_time = time.monotonic()
+
+        self._log("Scheduling %s channels (%.0f reads/s).", DataLogger.LogSeverity.INFO,
+                  len(channels), sum(channel.rate for channel in channels))
+
+        self.__stop.clear()
+        self.thread = threading.Thread(target=self.__run, name=f'{self.name}Scheduler', daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        '''Stops the scheduler thread, waiting for the current read to finish.'''
+        thread = self.thread
+        if thread is None:
+            return
+        self.__stop.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self.thread = None
+
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        '''
+        Returns how well each channel has kept to its target rate, since the scheduler started.
+
+        Returns:
+            Dict[str, Dict[str, float]]: By '<device>.<channel>': the target & achieved rates (Hz),
+                                         the RMS & max jitter (seconds), and the missed & failed reads.
+        '''
+        return self.__summarize(self.stats)
+
+
+    def __summarize(self, all_stats: Dict[Tuple[str, str], ChannelStats]) -> Dict[str, Dict[str, float]]:
+        '''Summarizes the stats of every channel (See get_stats()).'''
+        stats = {}
+        with self.__stats_lock:
+            for channel in self.channels:
+                channel_stats = all_stats[(channel.device.name, channel.name)]
+                stats[f'{channel.device.name}.{channel.name}'] = {
+                    'target_rate': channel.rate,
+                    'achieved_rate': channel_stats.achieved_rate(),
+                    'rms_jitter': channel_stats.rms_jitter(),
+                    'max_jitter': channel_stats.max_jitter,
+                    'missed': channel_stats.missed,
+                    'errors': channel_stats.errors,
+                }
+        return stats
+
+
+    # ===== SCHEDULER THREAD =====
+    def __run(self):
+        '''
+        Makes each channel's read when it is due (earliest first), and sleeps until the next one is due.
+        '''
+        # Paced reads go ahead of other traffic on the bus (Ex. re-initializing a device)
+        if self.arbiter is not None:
+            self.arbiter.set_thread_priority(I2CBusArbiter.HIGH_PRIORITY)
+
+        now = time.monotonic()
+
+        # (due time, index, channel). The index keeps channels with the same due time in a stable order.
+        queue = [(now, index, channel) for index, channel in enumerate(self.channels)]
+        heapq.heapify(queue)
+        stop = self.__stop
+
+        while queue and not stop.is_set():
+            due, index, channel = queue[0]
+            now = time.monotonic()
+            if due > now:
+                stop.wait(min(due - now, self.MAX_SLEEP))
+                continue
+
+            heapq.heappop(queue)
+            period = 1 / channel.rate
+            self.__read_channel(channel, period)
+
+            # Schedule the next read a period after this one was due, so the rate doesn't drift.
+            # If the channel fell more than a period behind, skip the reads it missed instead of bursting them.
+            next_due = due + period
+            now = time.monotonic()
+            if next_due < now:
+                missed = int((now - next_due) / period) + 1
+                next_due += missed * period
+                with self.__stats_lock:
+                    for channel_stats in self.__channel_stats(channel):
+                        channel_stats.missed += missed
+            heapq.heappush(queue, (next_due, index, channel))
+
+            self.__log_stats()
+
+
+    def __read_channel(self, channel: AcquisitionChannel, period: float):
+        '''Makes a channel's read, and updates its device's cache. Devices that fail are set to ERROR.'''
+        device = channel.device
+        if device.status is not Device.DeviceStatus.ACTIVE:
+            return
+
+        read_time = time.monotonic()
+        try:
+            values = channel.read()
+        except Exception as e:
+            with self.__stats_lock:
+                for channel_stats in self.__channel_stats(channel):
+                    channel_stats.errors += 1
+            device.status = Device.DeviceStatus.ERROR
+            self._log("Error reading %s from %s: %s", DataLogger.LogSeverity.ERROR, channel.name, device.name, e)
+            return
+
+        device._update_cache(values)
+        with self.__stats_lock:
+            for channel_stats in self.__channel_stats(channel):
+                channel_stats.record(read_time, period)
+
+
+    def __channel_stats(self, channel: AcquisitionChannel) -> Tuple[ChannelStats, ChannelStats]:
+        '''Returns a channel's stats since the scheduler started, and since they were last logged (the lock must be held).'''
+        key = (channel.device.name, channel.name)
+        return self.stats[key], self.__window_stats[key]
+
+
+    def __log_stats(self):
+        '''Periodically logs the achieved rate & jitter of every channel since the last log, then starts a new window.'''
+        current_time = time.monotonic()
+        if current_time - self.__last_stats_log_time < self.STATS_LOG_INTERVAL:
+            return
+        self.__last_stats_log_time = current_time
+
+        if self.log.isLogEnabled(DataLogger.LogSeverity.DEBUG):
+            for channel_name, stats in self.__summarize(self.__window_stats).items():
+                self._log("%s: %.1f/%.1f Hz, jitter %.2f ms RMS, %.2f ms max, %s missed, %s errors.",
+                          DataLogger.LogSeverity.DEBUG,
+                          channel_name, stats['achieved_rate'], stats['target_rate'],
+                          stats['rms_jitter'] * 1e3, stats['max_jitter'] * 1e3, stats['missed'], stats['errors'])
+
+        with self.__stats_lock:
+            for channel_stats in self.__window_stats.values():
+                channel_stats.reset()
+
+
+    def _log(self, msg: str, severity=DataLogger.LogSeverity.INFO, *args):
+        """Shorthand logging method. Any args are formatted into msg lazily (see DataLogger.writeLog)."""
+        self.log.writeLog(self.name, msg, severity, *args)
@@ -5,7 +5,9 @@ from enum import Enum
 from Backend.data_logger import DataLogger
 from Backend.device import Device, CANDevice, I2CDevice
 from Backend.value_monitor import ParameterMonitor, ParameterWarning
-from typing import Any, Dict, Union, List
+from Backend.i2c_scheduler import I2CScheduler
+from Backend.i2c_arbiter import I2CBusArbiter
+from typing import Any, Dict, Union, List, Tuple
 from abc import ABC, abstractmethod
 
 import can
@@ -13,6 +15,7 @@ import cantools
 import cantools.database
 from smbus2 import SMBus
 import subprocess
+import threading
 import time
 
 
@@ -175,7 +178,7 @@ class Interface(ABC):
 
     def update(self):
         """
-        Updates each device on the interface and monitors the parameters of the device.
+        Updates each device on the interface, then monitors the parameters which changed.
         """
 
         # Check if the interface is active
@@ -187,7 +190,6 @@ class Interface(ABC):
             # Check if the device is active
             if device.status == Device.DeviceStatus.ACTIVE:
                 device.update()
-                self.__monitor_device_parameters()
 
                 # Clear any active warnings:
                 self.parameter_monitor.clear_warning(device.name)
@@ -197,7 +199,7 @@ class Interface(ABC):
                 try:
                     device.initialize(self.bus)
                 except Exception as e:
-                    self._log(f"Couldn't initialize {device.name}, {e}", DataLogger.LogSeverity.DEBUG)
+                    self._log("Couldn't initialize %s, %s", DataLogger.LogSeverity.DEBUG, device.name, e)
 
             # Blanket case if device is not active
             if device.status not in [Device.DeviceStatus.ACTIVE]:
@@ -209,6 +211,10 @@ class Interface(ABC):
                         status=f"{device.status.name}"
                     )
                 )
+
+        # Check the parameters that changed (once per update, after every device has new data)
+        self._monitor_device_parameters()
+        self._publish_device_changes()
              
 
     def get_data_from_device(self, device_key: str, data_key: str) -> Union[str, float, int, None]:
@@ -226,7 +232,7 @@ class Interface(ABC):
 
         # Verify device exists
         if device_key not in self.devices:
-            self._log(f"No device found for key: {device_key}", self.log.LogSeverity.WARNING)
+            self._log("No device found for key: %s", self.log.LogSeverity.WARNING, device_key)
             return None
         
         # Get the data
@@ -281,19 +287,28 @@ class Interface(ABC):
         self._log(f'Finished initializing {device.name}!')
 
 
-    def __monitor_device_parameters(self):
+    def _monitor_device_parameters(self):
         """
         Monitors the parameters of all devices on this interface, according to the valuelimits config file.
 
-        This function retrieves all parameter names from the device's cached values and checks each parameter's value
-        against the defined limits using the ParameterMonitor. If a parameter value is out of range, a warning is raised.
+        Only parameters whose cached value changed since the last call are checked against the defined limits
+        using the ParameterMonitor. An unchanged value can't change the result of its last check.
+        Each device's changes are checked as one batch. If a parameter value is out of range, a warning is raised.
         """
+        check_values = self.parameter_monitor.check_values
+        for device in self.devices.values():
+            check_values(device.pop_changed_values())
 
-        # Checks every parameter for every device on the interface
-        for name, device in self.devices.items():
-            param_names = device.get_all_param_names()
-            for param_name in param_names:
-                self.parameter_monitor.check_value(param_name, device.get_data(param_name))
+        # Finish the debounce of values which haven't changed
+        self.parameter_monitor.check_pending()
+
+
+    def _publish_device_changes(self):
+        """
+        Notifies the subscribers of each device about the parameters that changed during this update (see Device.subscribe()).
+        """
+        for device in self.devices.values():
+            device.publish_changes()
 
 
     # ===== ABSTRACT METHODS =====
@@ -321,9 +336,9 @@ class Interface(ABC):
             units=units)
 
 
-    def _log(self, msg: str, severity=DataLogger.LogSeverity.INFO):
-        """Shorthand logging method."""
-        self.log.writeLog(loggerName=self.name, msg=msg, severity=severity)
+    def _log(self, msg: str, severity=DataLogger.LogSeverity.INFO, *args):
+        """Shorthand logging method. Any args are formatted into msg lazily (see DataLogger.writeLog)."""
+        self.log.writeLog(self.name, msg, severity, *args)
 
     @property
     def status(self):                             # Status Getter
@@ -353,6 +368,10 @@ class I2CInterface(Interface):
     responds to specific commands. It is likely that each I2C device will have a 
     dedicated device class that implements device-specific behavior, including custom 
     decoding functions.
+
+    The reads of every device on the bus are made by one scheduler thread, at each channel's target rate (See I2CScheduler).
+    Devices are given an I2CBusArbiter instead of the SMBus itself, so every transaction on the bus is made by one thread,
+    in priority order, without colliding.
     """
     
 
@@ -364,6 +383,7 @@ class I2CInterface(Interface):
                  parameter_monitor: ParameterMonitor):
         super().__init__(name, devices, InterfaceProtocol.I2C, logger, parameter_monitor)
         self.channel = i2c_channel
+        self.scheduler = I2CScheduler(f'{name}Scheduler', logger)
 
 
     def initialize(self):
@@ -371,19 +391,116 @@ class I2CInterface(Interface):
         Starts the I2C bus on the channel given during __init__(),
         and initializes all devices on the interface.
         '''
-        # Start the bus
-        self.bus = SMBus(self.channel)
+        # Release the bus from a previous initialization
+        if isinstance(getattr(self, 'bus', None), I2CBusArbiter):
+            self.scheduler.stop()
+            self.bus.close()
+
+        # Start the bus, and route every transaction through the arbiter
+        self.bus = I2CBusArbiter(SMBus(self.channel), self.name)
+        self.scheduler.arbiter = self.bus
 
         # Initialize all devices on interface.
         super().initialize(self.bus)
 
+        # Start reading the devices
+        self.scheduler.start(self.devices.values())
+
+
+    def get_acquisition_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the target & achieved rate, and the jitter of every channel read on the bus (See I2CScheduler.get_stats()).
+        """
+        return self.scheduler.get_stats()
+
+
+    def get_bus_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the queue wait & bus time of the transactions made to each address (See I2CBusArbiter.get_stats()).
+        """
+        return self.bus.get_stats()
+
 
     def close_connection(self):
         """
         Closes the I2C connection.
         """
-        # Close the I2C bus connection
-        self.bus.close()
+        # Stop reading, then close the I2C bus connection (the arbiter closes the SMBus)
+        self.scheduler.stop()
+        if getattr(self, 'bus', None) is not None:
+            self.bus.close()
+
+
+
+# ===== Buffer between the CAN reader thread and CANInterface.update() =====
+class CANFrameRingBuffer:
+    """
+    A fixed-size queue of CAN frames, with one producer (the reader thread) and one consumer (update()).
+
+    Every slot is allocated up front, so the buffer never grows or reallocates while frames stream in.
+    The producer only ever moves the write count and the consumer only ever moves the read count,
+    so neither needs a lock. If the buffer is full, new frames are dropped and counted in `overflows`.
+
+    Attributes:
+        capacity (int): The most frames the buffer can hold.
+        overflows (int): The number of frames dropped because the buffer was full.
+        peak (int): The most frames the buffer has held at once.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.overflows = 0
+        self.peak = 0
+        self.__slots: List[Union[can.Message, None]] = [None] * capacity
+        self.__write_count = 0      # Frames pushed since the buffer was made. Only changed by push().
+        self.__read_count = 0       # Frames drained since the buffer was made. Only changed by drain().
+
+
+    def push(self, frame: can.Message) -> bool:
+        """
+        Adds a frame to the buffer. Must only be called by the producer.
+
+        Returns:
+            bool: False if the buffer was full and the frame was dropped.
+        """
+        write_count = self.__write_count
+        used = write_count - self.__read_count
+        if used >= self.capacity:
+            self.overflows += 1
+            return False
+
+        # Fill the slot before publishing it by moving the write count
+        self.__slots[write_count % self.capacity] = frame
+        self.__write_count = write_count + 1
+        if used >= self.peak:
+            self.peak = used + 1
+        return True
+
+
+    def drain(self, max_frames: int) -> List[can.Message]:
+        """
+        Removes up to `max_frames` frames from the buffer, oldest first. Must only be called by the consumer.
+        """
+        read_count = self.__read_count
+        count = min(self.__write_count - read_count, max_frames)
+        if count <= 0:
+            return []
+
+        slots = self.__slots
+        capacity = self.capacity
+        frames = []
+        for i in range(read_count, read_count + count):
+            index = i % capacity
+            frames.append(slots[index])
+            slots[index] = None     # Don't keep drained frames alive
+        self.__read_count = read_count + count
+        return frames
+
+
+    def __len__(self) -> int:
+        return self.__write_count - self.__read_count
 
 
 
@@ -401,6 +518,26 @@ class CANInterface(Interface):
     # 0.1 ms timeout for reading CAN Bus
     TIMEOUT = 0.0001  
 
+    # How long the reader thread blocks on the socket before checking if it should stop
+    READER_TIMEOUT = 0.1
+
+    # Number of frames the reader thread can buffer between update() calls (Ex. ~2 s of a busy 250 kbit/s bus)
+    RX_BUFFER_SIZE = 4096
+
+    # Most acceptance filters given to the kernel (SocketCAN's CAN_RAW_FILTER_MAX is 512)
+    MAX_KERNEL_FILTERS = 512
+
+    # Masks which match every bit of a frame ID
+    STANDARD_ID_MASK = 0x7FF
+    EXTENDED_ID_MASK = 0x1FFFFFFF
+
+    # Maximum number of frames drained from the socket during a single update() call.
+    # Bounds the time spent in update() so the UI thread can't be starved by a flooded bus.
+    MAX_FRAMES_PER_UPDATE = 256
+
+    # Interval (seconds) between CAN receive statistics log entries
+    STATS_LOG_INTERVAL = 10
+
     devices: Dict[str, CANDevice]
     
     def __init__(self, 
@@ -408,7 +545,10 @@ class CANInterface(Interface):
                  can_channel: str, 
                  devices: List[CANDevice], 
                  logger: DataLogger, 
-                 parameter_monitor: ParameterMonitor):
+                 parameter_monitor: ParameterMonitor,
+                 max_frames_per_update: int = MAX_FRAMES_PER_UPDATE,
+                 rx_buffer_size: int = RX_BUFFER_SIZE,
+                 sniff_unknowns: bool = False):
         """
         Initializes a CANInterface instance.
 
@@ -417,6 +557,10 @@ class CANInterface(Interface):
             can_bus (can.BusABC): The CAN bus interface object.
             database_path (str): Path to the DBC file for CAN database.
             logger (DataLogger): Logger for logging messages.
+            max_frames_per_update (int): The most frames that will be drained from the receive buffer per update() call.
+            rx_buffer_size (int): The most frames the reader thread can buffer between update() calls.
+            sniff_unknowns (bool): Receive every frame on the bus, instead of only the frames the devices' DBCs define.
+                                   Frames no device recognizes are logged (see set_sniff_unknowns()).
         """
         
         # Initialize the parent class (Interface)
@@ -427,6 +571,38 @@ class CANInterface(Interface):
 
         self.channel = can_channel
 
+        if max_frames_per_update < 1:
+            raise ValueError(f"max_frames_per_update must be at least 1, got {max_frames_per_update}")
+        self.max_frames_per_update = max_frames_per_update
+
+        # Receive statistics (see get_rx_stats())
+        self.rx_stats = {
+            'frames_last_update': 0,    # Frames drained during the most recent update() call
+            'frames_peak_update': 0,    # Most frames drained during a single update() call
+            'frames_total': 0,          # Frames drained since the interface was created
+            'updates_total': 0,         # Number of update() calls
+            'budget_exhausted': 0,      # update() calls which hit max_frames_per_update (the receive buffer still held frames)
+            'unknown_frames': 0,        # Frames with an ID that no device recognizes
+        }
+
+        # Frames are read from the socket by a reader thread, so a slow update() (Ex. a UI hitch) doesn't delay reading.
+        self.rx_buffer = CANFrameRingBuffer(rx_buffer_size)
+        self.__reader_thread: Union[threading.Thread, None] = None
+        self.__stop_reader = threading.Event()
+        self.__reader_error: Union[Exception, None] = None
+        self.__last_stats_log_time = time.time()
+        self.__frames_at_last_stats_log = 0
+
+        # Frame ID -> (device, message definition). Built in initialize() (see __build_routing_table())
+        self.routing_table: Dict[int, Tuple[CANDevice, cantools.database.Message]] = {}
+
+        # Negative cache of frame IDs that no device recognizes, along with how many times each was received.
+        self.unknown_frame_ids: Dict[int, int] = {}
+
+        # Acceptance filters installed on the socket, so the kernel drops frames no device uses (see __build_can_filters())
+        self.sniff_unknowns = sniff_unknowns
+        self.can_filters: List[Dict[str, Any]] = []
+
         
     def initialize(self):
         """
@@ -447,6 +623,16 @@ class CANInterface(Interface):
             # Try to restart the bus. If this fails, then that is an interface-level error
             # and will be handled by DDS_IO.
             self.bus = can.interface.Bus(self.channel, interface='socketcan')
+
+        # Precompute which device owns each frame ID
+        self.__build_routing_table()
+
+        # Only let the frames that the devices use through the socket
+        self.can_filters = self.__build_can_filters()
+        self.__install_can_filters()
+
+        # Start reading frames into the receive buffer
+        self.__start_reader_thread()
         
         # Finish the initialization process
         super().initialize(self.bus)
@@ -454,46 +640,82 @@ class CANInterface(Interface):
     
     def update(self):
         """
-        Reads data from the CAN bus, logs telemetry, decodes messages, and updates the cached values.
+        Drains the frames the reader thread received, routes them to their devices in batches,
+        and updates the cached values.
         """
         # The CAN Interface differs from other interfaces, because the interface itself reads the message,
         # not the devices. As a result, we kinda have to some strange things, and we dont use the parent update() method.
 
-        # Get data from the CAN Bus
-        # This can raise a CanOperationError, but because this is a interface-level failure,
-        # we can let it propogate through to the DDS_IO which will handle it.
-        message = self.__fetch_can_message()
-
-        # Check if the message is valid; if not, update cache timeout and return early.
-        # This means no messages were received, and we don't need to continue the update process.
-        if not message:
-            # Update the cache timeout of devices.
-            for name, device in self.devices.items():
-                device.update(message)
-            return
+        # If the reader thread failed (Ex. a CanOperationError), that is an interface-level failure,
+        # so we raise it for the DDS_IO to handle.
+        if self.__reader_error is not None:
+            error, self.__reader_error = self.__reader_error, None
+            raise error
+
+        # Get every frame received since the last update (up to the budget).
+        messages = self.rx_buffer.drain(self.max_frames_per_update)
+        if len(self.rx_buffer):
+            # Leave the rest for the next update() so we don't hog the caller.
+            self.rx_stats['budget_exhausted'] += 1
+        self.__record_rx_stats(len(messages))
+
+        # Sort the received messages into a batch for each device
+        batches: Dict[str, List[can.Message]] = {name: [] for name in self.devices}
+        routing_table = self.routing_table
+        for message in messages:
+            route = routing_table.get(message.arbitration_id)
+
+            if route is None:
+                self.__handle_unknown_message(message)
+                continue
 
-        # Decode the received CAN message to extract relevant data.
-        updated_device = None  # Flag to track if device.update() was called
+            batches[route[0].name].append(message)
+
+        # Hand each device its batch. Devices without new frames get an empty
+        # batch, which lets them clear their cache if it has expired.
         for name, device in self.devices.items():
-            try: 
-                # Check if the message corresponds to the device's database
-                device.db.get_message_by_frame_id(message.arbitration_id)
-            except KeyError as e:
-                # This is raised if the message doens't exist in the database.
-                # If it this does happen, then the device that is being iterated 
-                # doesn't have an database for the message.
-                continue
+            device.update_batch(batches[name])
+
+        # Check the signals that changed
+        self._monitor_device_parameters()
+        self._publish_device_changes()
+
+
+    def get_rx_stats(self) -> Dict[str, int]:
+        """
+        Returns a copy of the CAN receive statistics, along with the receive buffer's & the kernel's drop counters for the channel.
+
+        Returns:
+            Dict[str, int]: Frame counters. The kernel counters (`kernel_rx_dropped`, `kernel_rx_over_errors`)
+                            are None if they could not be read.
+        """
+        stats = dict(self.rx_stats)
+        stats['rx_buffer_frames'] = len(self.rx_buffer)
+        stats['rx_buffer_peak'] = self.rx_buffer.peak
+        stats['rx_buffer_overflows'] = self.rx_buffer.overflows
+        stats['kernel_rx_dropped'] = self.__read_kernel_stat('rx_dropped')
+        stats['kernel_rx_over_errors'] = self.__read_kernel_stat('rx_over_errors')
+        return stats
+
+
+    def use_external_reader(self):
+        """
+        Stops the reader thread, for when something else reads the CAN Bus and pushes frames into `rx_buffer`
+        (Ex. the asyncio IO engine's Notifier). update() keeps draining the buffer as usual.
+        """
+        self.__stop_reader_thread()
+
 
-            # If we get to this point, the device has a database for the received message.
-            # Call update on the device and mark it as updated
-            device.update(message)
-            updated_device = device.name  # Save the name of the updated device
-            break  # Exit the loop since the device has been updated
+    def set_sniff_unknowns(self, sniff_unknowns: bool):
+        """
+        Turns the kernel's acceptance filters off (to receive & log every frame on the bus, for diagnostics) or back on.
 
-        # Check the final condition
-        if not updated_device:
-            self._log(f"No device found for message ID {message.arbitration_id}.", DataLogger.LogSeverity.WARNING)
-            self._log_telemetry('UnknownCanMessage',f'{message.arbitration_id} {message.bitrate_switch} {message.channel} {message.data} {message.dlc}')
+        Parameters:
+            sniff_unknowns (bool): True to receive every frame, False to only receive the frames the devices use.
+        """
+        self.sniff_unknowns = sniff_unknowns
+        if getattr(self, 'bus', None) is not None:
+            self.__install_can_filters()
 
 
     def get_avail_signals(self, messageName : str) -> can.Message:
@@ -502,15 +724,20 @@ class CANInterface(Interface):
     
 
     def close_connection(self):
-        '''Closes the connection to the CAN Bus'''
-        self.bus.shutdown()
+        '''Stops the reader thread & closes the connection to the CAN Bus'''
+        self.__stop_reader_thread()
+        if getattr(self, 'bus', None) is not None:
+            self.bus.shutdown()
         
 
     # ===== CAN Specific Stuff =====
-    def __fetch_can_message(self) -> can.Message:
+    def __fetch_can_message(self, timeout: float = TIMEOUT) -> can.Message:
         """
         Fetches a single CAN message from the CAN Bus.
 
+        Parameters:
+            timeout (float): The maximum time to wait for a message. Defaults to `TIMEOUT`.
+
         Returns:
             can.Message: A CAN message object containing the received message data, or `None` 
                         if no message was received within the specified timeout.
@@ -518,23 +745,199 @@ class CANInterface(Interface):
         Raises:
             can.exceptions.CanOperationError: If the CAN Bus interface encounters an error 
                                             during the operation (e.g., network not open).
-        
-        Notes:
-            - The `CAN_TIMEOUT` is the maximum time allowed to wait for a message before returning `None`.
         """
 
         # Read a single frame of CAN data
         # If a CanOperationError is raised, that is an interface-level error.
         # Therefore, it will be handled by the DDS_IO
-        msg = self.bus.recv(self.TIMEOUT)
+        return self.bus.recv(timeout)
+
+
+    def __start_reader_thread(self):
+        """
+        Starts the thread which reads frames from the CAN Bus into the receive buffer (stopping the old one, if any).
+        """
+        self.__stop_reader_thread()
+        self.__stop_reader.clear()
+        self.__reader_error = None
+        self.__reader_thread = threading.Thread(target=self.__reader_worker, name=f'{self.name}Reader', daemon=True)
+        self.__reader_thread.start()
+
+
+    def __stop_reader_thread(self):
+        """
+        Stops the reader thread, waiting for its current read to finish.
+        """
+        thread = self.__reader_thread
+        if thread is None:
+            return
+        self.__stop_reader.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout=self.READER_TIMEOUT * 10)
+        self.__reader_thread = None
+
+
+    def __reader_worker(self):
+        """
+        Blocks on the CAN Bus and pushes every frame into the receive buffer.
+
+        Frames keep the timestamp the kernel gave them when they were received (SO_TIMESTAMPNS),
+        so time spent waiting in the buffer doesn't skew them. If the bus fails, the error is
+        kept for update() to raise, and the thread stops.
+        """
+        bus = self.bus
+        push = self.rx_buffer.push
+        stop = self.__stop_reader
+        while not stop.is_set():
+            try:
+                msg = bus.recv(self.READER_TIMEOUT)
+            except Exception as e:
+                if not stop.is_set():
+                    self.__reader_error = e
+                    self._log("CAN reader thread stopped: %s", DataLogger.LogSeverity.ERROR, e)
+                return
+
+            if msg is not None:
+                push(msg)
+
+
+    def __build_routing_table(self):
+        """
+        Builds the table which maps each frame ID to the device (and message definition) that decodes it,
+        so that received frames can be routed without searching every device's database.
+
+        If more than one device's database defines the same frame ID, the frame is routed to
+        the first device on the interface that defines it, and a warning is logged.
+        """
+        routing_table: Dict[int, Tuple[CANDevice, cantools.database.Message]] = {}
+
+        for name, device in self.devices.items():
+            for frame_id in {message.frame_id for message in device.db.messages}:
+
+                # Use the same definition that cantools would decode the frame ID with
+                message = device.db.get_message_by_frame_id(frame_id)
+
+                if frame_id in routing_table:
+                    owner = routing_table[frame_id][0]
+                    self._log(f"Frame ID {hex(frame_id)} ({message.name}) is defined by both {owner.name} and {device.name}. "
+                              f"It will be routed to {owner.name}.", DataLogger.LogSeverity.WARNING)
+                    continue
+
+                routing_table[frame_id] = (device, message)
+
+        self.routing_table = routing_table
+        self.unknown_frame_ids = {}
+        self._log(f"Built CAN routing table with {len(routing_table)} frame IDs.")
+
 
-        if msg is None:
-            # If there is no message recieved, we need to let the devices know that,
-            # so they need to know to clear the cache if it's expired.
-            for name, device in self.devices.items():
-                super()
+    def __build_can_filters(self) -> List[Dict[str, Any]]:
+        """
+        Builds the SocketCAN acceptance filters for every frame ID in the routing table.
+
+        Each frame ID gets an exact filter. If there are more IDs than the kernel accepts filters (`MAX_KERNEL_FILTERS`),
+        the low bits of the masks are ignored until the IDs fit in few enough filters. The wider filters let some
+        extra frames through, which are then ignored by update() as unknown frames.
+
+        Returns:
+            List[Dict[str, Any]]: The filters, in python-can's format (`can_id`, `can_mask`, `extended`).
+        """
+        frame_ids = {True: set(), False: set()}
+        for frame_id, (device, message) in self.routing_table.items():
+            frame_ids[bool(message.is_extended_frame)].add(frame_id)
+
+        # Split the filters between standard & extended IDs, by how many IDs each has
+        total_ids = len(frame_ids[True]) + len(frame_ids[False])
+        filters = []
+        for extended, ids in frame_ids.items():
+            if not ids:
+                continue
+            full_mask = self.EXTENDED_ID_MASK if extended else self.STANDARD_ID_MASK
+            max_filters = max(1, self.MAX_KERNEL_FILTERS * len(ids) // total_ids)
+
+            # Ignore one more low bit of the ID at a time, until the IDs share few enough filters
+            mask = full_mask
+            groups = {frame_id & mask for frame_id in ids}
+            while len(groups) > max_filters:
+                mask = (mask << 1) & full_mask
+                groups = {frame_id & mask for frame_id in ids}
+            if mask != full_mask:
+                self._log("%s %s frame IDs need more than %s filters. Using mask %s, which lets some unused frames through.",
+                          DataLogger.LogSeverity.WARNING, len(ids), 'extended' if extended else 'standard', max_filters, hex(mask))
+
+            filters.extend({'can_id': can_id, 'can_mask': mask, 'extended': extended} for can_id in sorted(groups))
+
+        return filters
+
+
+    def __install_can_filters(self):
+        """
+        Gives the acceptance filters to the kernel, or removes them if sniffing unknown frames.
+        """
+        if self.sniff_unknowns:
+            self.bus.set_filters(None)
+            self._log("Sniffing unknown frames: receiving every frame on %s.", DataLogger.LogSeverity.WARNING, self.channel)
+        else:
+            self.bus.set_filters(self.can_filters)
+            self._log("Installed %s CAN acceptance filters on %s.", DataLogger.LogSeverity.INFO, len(self.can_filters), self.channel)
+
+
+    def __handle_unknown_message(self, message: can.Message):
+        """
+        Records a frame that no device recognizes. A warning is only logged the first time an ID is seen.
+        """
+        self.rx_stats['unknown_frames'] += 1
+
+        frame_id = message.arbitration_id
+        if frame_id in self.unknown_frame_ids:
+            self.unknown_frame_ids[frame_id] += 1
+        else:
+            self.unknown_frame_ids[frame_id] = 1
+            self._log("No device found for message ID %s.", DataLogger.LogSeverity.WARNING, frame_id)
+
+        self._log_telemetry('UnknownCanMessage',f'{message.arbitration_id} {message.bitrate_switch} {message.channel} {message.data} {message.dlc}', units='')
+
+
+    def __record_rx_stats(self, frame_count: int):
+        """
+        Updates the receive statistics after a drain, and periodically logs a summary of them.
+        """
+        stats = self.rx_stats
+        stats['frames_last_update'] = frame_count
+        stats['frames_total'] += frame_count
+        stats['updates_total'] += 1
+        if frame_count > stats['frames_peak_update']:
+            stats['frames_peak_update'] = frame_count
+
+        # Periodically log the receive rate so we can verify we keep up with the bus
+        current_time = time.time()
+        elapsed = current_time - self.__last_stats_log_time
+        if elapsed < self.STATS_LOG_INTERVAL:
+            return
 
-        return msg
+        if self.log.isLogEnabled(DataLogger.LogSeverity.DEBUG):
+            frame_rate = (stats['frames_total'] - self.__frames_at_last_stats_log) / elapsed
+            self._log("RX %.0f frames/s, peak %s frames/update, budget exhausted %s times, "
+                      "buffer peak %s/%s frames, buffer dropped %s frames, kernel dropped %s frames.",
+                      DataLogger.LogSeverity.DEBUG,
+                      frame_rate, stats['frames_peak_update'], stats['budget_exhausted'],
+                      self.rx_buffer.peak, self.rx_buffer.capacity, self.rx_buffer.overflows,
+                      self.__read_kernel_stat('rx_dropped'))
+        self.__last_stats_log_time = current_time
+        self.__frames_at_last_stats_log = stats['frames_total']
+
+
+    def __read_kernel_stat(self, stat_name: str) -> Union[int, None]:
+        """
+        Reads one of the kernel's network statistics for this CAN channel (Ex. `rx_dropped`).
+
+        Returns:
+            Union[int, None]: The value of the counter, or None if it could not be read.
+        """
+        try:
+            with open(f'/sys/class/net/{self.channel}/statistics/{stat_name}', 'r') as file:
+                return int(file.read().strip())
+        except (OSError, ValueError):
+            return None
 
 
     def __start_can_network(self, can_channel: str):
@@ -0,0 +1,213 @@
+# Asyncio IO Engine for Terrier Motorsport's DDS
+    # An alternative to calling DDS_IO.update() from a polling loop.
+
+import asyncio
+import threading
+from typing import Any, Callable, List, Union, TYPE_CHECKING
+import can
+from Backend.data_logger import DataLogger
+from Backend.interface import Interface, CANInterface
+
+if TYPE_CHECKING:
+    from Backend.DDS_IO import DDS_IO
+
+
+"""
+The polling engine has the UI call DDS_IO.update() as often as it can, so the CPU spins even when the bus is idle.
+The asyncio engine instead runs every interface of a DDS_IO on one event loop, in a background thread:
+
+    - CAN: python-can's Notifier reads the socket on the event loop, and pushes frames into the CANInterface's
+           receive buffer. A consumer task wakes up when frames arrive, and runs CANInterface.update()
+           (decoding, monitoring & change notifications), batching the frames that arrive close together.
+    - I2C: I2CInterface.update() runs as a periodic task. The interface's scheduler thread still does the blocking bus I/O.
+    - PCC: The AsyncPCCClient runs as a task.
+
+When nothing happens, the loop sleeps in select(), so an idle DDS uses close to no CPU.
+DDS_IO.get_device_data() & friends work the same, as the device caches are safe to read from any thread.
+"""
+
+
+class CANFrameListener(can.Listener):
+    '''
+    Receives frames from the Notifier (on the event loop), and hands them to a CANInterface.
+    '''
+
+    def __init__(self, interface: CANInterface, frames_received: asyncio.Event, logger: DataLogger):
+        self.interface = interface
+        self.frames_received = frames_received
+        self.log = logger
+        self.__push = interface.rx_buffer.push
+
+
+    def on_message_received(self, msg: can.Message):
+        self.__push(msg)
+        self.frames_received.set()
+
+
+    def on_error(self, exc: Exception):
+        # The Notifier stops after an error, so the interface can't receive anything until it is re-initialized.
+        self.log.writeLog('AsyncIOEngine', 'CAN Notifier for %s stopped: %s', DataLogger.LogSeverity.CRITICAL,
+                          self.interface.name, exc)
+        self.interface.status = Interface.InterfaceStatus.ERROR
+
+
+class AsyncIOEngine:
+    '''
+    Runs the interfaces of a DDS_IO on an asyncio event loop in a background thread (See the module description).
+    '''
+
+    # Longest time between updates of an I2C (or inactive) interface
+    INTERFACE_UPDATE_INTERVAL = 0.01
+
+    # After the first frame wakes the CAN task, it waits this long for more frames, so they are handled as one batch
+    CAN_BATCH_INTERVAL = 0.005
+
+    # Longest time between CAN updates when no frames arrive (Ex. so cache timeouts are noticed)
+    CAN_IDLE_INTERVAL = 0.1
+
+    # Longest time call() waits for the event loop
+    CALL_TIMEOUT = 1
+
+
+    def __init__(self, io: 'DDS_IO'):
+        '''
+        Parameters:
+            io (DDS_IO): The DDS_IO whose interfaces (& PCC client) are run by the engine.
+        '''
+        self.io = io
+        self.log = io.log
+        self.loop: Union[asyncio.AbstractEventLoop, None] = None
+        self.thread: Union[threading.Thread, None] = None
+        self.notifiers: List[can.Notifier] = []
+        self.__stop: Union[asyncio.Event, None] = None
+        self.__started = threading.Event()
+
+
+    # ===== PUBLIC METHODS =====
+    def start(self):
+        '''Starts the event loop thread, and waits for it to be running.'''
+        if self.is_running():
+            return
+        self.loop = asyncio.new_event_loop()
+        self.__started.clear()
+        self.thread = threading.Thread(target=self.__run_loop, name='AsyncIOEngine', daemon=True)
+        self.thread.start()
+        self.__started.wait(self.CALL_TIMEOUT)
+
+
+    def stop(self):
+        '''Stops every task, and waits for the event loop thread to finish.'''
+        if not self.is_running():
+            return
+        self.loop.call_soon_threadsafe(self.__stop.set)
+        if self.thread is not threading.current_thread():
+            self.thread.join(self.CALL_TIMEOUT * 5)
+
+
+    def is_running(self) -> bool:
+        '''Returns whether the event loop thread is running.'''
+        return self.thread is not None and self.thread.is_alive()
+
+
+    def call(self, func: Callable[..., Any], *args) -> Any:
+        '''
+        Calls a function on the event loop's thread, and returns its result.
+        Used to safely touch state that the engine's tasks change (Ex. the active warnings).
+
+        Raises:
+            TimeoutError: If the event loop doesn't get to the call within `CALL_TIMEOUT` seconds.
+        '''
+        if not self.is_running() or threading.current_thread() is self.thread:
+            return func(*args)
+
+        async def run():
+            return func(*args)
+        return asyncio.run_coroutine_threadsafe(run(), self.loop).result(self.CALL_TIMEOUT)
+
+
+    # ===== EVENT LOOP =====
+    def __run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self.__main())
+        finally:
+            self.loop.close()
+            self.__log('Event loop stopped.', DataLogger.LogSeverity.WARNING)
+
+
+    async def __main(self):
+        self.__stop = asyncio.Event()
+
+        tasks = []
+        for interface in self.io.interfaces.values():
+            if isinstance(interface, CANInterface) and interface.status is Interface.InterfaceStatus.ACTIVE:
+                tasks.append(asyncio.create_task(self.__run_can_interface(interface)))
+            else:
+                tasks.append(asyncio.create_task(self.__run_periodic_interface(interface)))
+
+        pcc_run = getattr(self.io.pcc, 'run', None)
+        if pcc_run is not None:
+            tasks.append(asyncio.create_task(pcc_run()))
+
+        self.__log('Started with %s tasks.', DataLogger.LogSeverity.INFO, len(tasks))
+        self.__started.set()
+
+        await self.__stop.wait()
+
+        # Shut everything down
+        for notifier in self.notifiers:
+            notifier.stop()
+        self.notifiers = []
+        if pcc_run is not None:
+            self.io.pcc.stop()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+    async def __run_can_interface(self, interface: CANInterface):
+        '''Reads the CAN Bus with a Notifier, and updates the interface whenever frames arrive.'''
+        frames_received = asyncio.Event()
+
+        # The Notifier replaces the interface's reader thread
+        interface.use_external_reader()
+        listener = CANFrameListener(interface, frames_received, self.log)
+        self.notifiers.append(can.Notifier(interface.bus, [listener], loop=asyncio.get_running_loop()))
+
+        while True:
+            try:
+                await asyncio.wait_for(frames_received.wait(), self.CAN_IDLE_INTERVAL)
+
+                # Let the rest of the burst arrive, so it is decoded & monitored as one batch
+                await asyncio.sleep(self.CAN_BATCH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            frames_received.clear()
+
+            self.__update_interface(interface)
+            if interface.status is not Interface.InterfaceStatus.ACTIVE:
+                # The Notifier stopped, so fall back to the periodic updates of an inactive interface
+                await self.__run_periodic_interface(interface)
+                return
+
+
+    async def __run_periodic_interface(self, interface: Interface):
+        '''Updates an interface every `INTERFACE_UPDATE_INTERVAL` seconds.'''
+        while True:
+            self.__update_interface(interface)
+            await asyncio.sleep(self.INTERFACE_UPDATE_INTERVAL)
+
+
+    def __update_interface(self, interface: Interface):
+        '''Updates an active interface, the same way DDS_IO.update() does.'''
+        if interface.status is not Interface.InterfaceStatus.ACTIVE:
+            return
+        try:
+            interface.update()
+        except Exception as e:
+            self.__log('Failed to update %s. %s', DataLogger.LogSeverity.ERROR, interface.name, e)
+            interface.status = Interface.InterfaceStatus.ERROR
+
+
+    def __log(self, msg: str, severity=DataLogger.LogSeverity.INFO, *args):
+        self.log.writeLog('AsyncIOEngine', msg, severity, *args)
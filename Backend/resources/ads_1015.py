@@ -3,7 +3,7 @@
 
 from Backend.data_logger import DataLogger
 from Backend.resources.analog_in import Analog_In
-from Backend.device import I2CDevice
+from Backend.device import I2CDevice, AcquisitionChannel
 from typing import Dict, List
 from ads1015 import ADS1015 # This is a helper package. This class cusomizes it functionality.
 from smbus2 import SMBus
@@ -16,8 +16,8 @@ class ADS_1015(I2CDevice):
     """
     # DDS ADS 1015 CLASS
     Analog -> Digital Converter on an I2C interface with caching functionality.
-    This class takes advantage of multithreading to collect data asynchronously, 
-    and transfers it to the main thread using a thread-safe cache.
+    Each input is read by the I2CInterface's scheduler at the input's own sample rate,
+    and transferred to the main thread using a thread-safe cache.
     """
 
 	# This list represents the four channels that correspond to the four physical ADC pins
@@ -26,6 +26,10 @@ class ADS_1015(I2CDevice):
 	# ===== CONSTANTS FOR DATA DECODING =====
     CHANNELS = ["in0/gnd", "in1/gnd", "in2/gnd", "in3/gnd"]
 
+    # Conversions per second. Every read switches the multiplexer & waits for a conversion,
+    # so this has to be well above the sum of the inputs' sample rates.
+    SAMPLE_RATE = 1600
+
 
     def __init__(self, name: str, logger: DataLogger, inputs : List[Analog_In], i2c_addr: int=0x48):
         """
@@ -54,7 +58,7 @@ class ADS_1015(I2CDevice):
         # Configure ADS
         self.ads.set_mode("continuous")
         self.ads.set_programmable_gain(6.144)  # ±6.144V range
-        self.ads.set_sample_rate(250)
+        self.ads.set_sample_rate(self.SAMPLE_RATE)
 
         # Allow time for hardware to configure
         time.sleep(0.5)
@@ -65,56 +69,43 @@ class ADS_1015(I2CDevice):
 
         # Complete the initialization
         self.status = self.DeviceStatus.ACTIVE
-        self.start_worker()
 
 
-    def update(self):
+    def get_acquisition_channels(self) -> List[AcquisitionChannel]:
         """
-        Retrieves data from the cache and ensures it is up-to-date.
+        Each input is its own channel, so it can be read at its own sample rate (Ex. pressures faster than temperatures).
         """
-        # Check if the cache has timed out
-        self._check_cache_timeout()
+        return [
+            AcquisitionChannel(input_obj.name, input_obj.sample_rate,
+                               lambda input_obj=input_obj, channel=channel: self._read_input(input_obj, channel),
+                               self)
+            for input_obj, channel in zip(self.inputs, self.CHANNELS)
+        ]
 
 
-    def _data_collection_worker(self):
-        """
-        Continuously collects data from the ADS1015 sensor in a separate thread.
-        Handles slower I/O-dependent communication with the device.
+    def _read_input(self, input_obj: Analog_In, channel: str) -> Dict[str, float]:
         """
-        while self.status == self.DeviceStatus.ACTIVE:
-
-            try:    
-                # Process the voltages
-                outputs: Dict[str, float] = {}
-                for input_obj, channel in zip(self.inputs, self.CHANNELS):
-                    
-                    # Get the voltage from the ADC
-                    voltage = self.ads.get_voltage(channel=channel)
+        Reads a single input from the ADS1015 (called by the scheduler).
 
-                    # Get the output value
-                    output = input_obj.voltage_to_output(voltage)
-
-                    # Log it
-                    self._log_telemetry(param_name=input_obj.name, value=output, units=input_obj.units)
+        Returns:
+            Dict[str, float]: The input's output value, by the input's name.
+        """
+        # Get the voltage from the ADC
+        voltage = self.ads.get_voltage(channel=channel)
 
-                    # Add it to list of outputs
-                    outputs[input_obj.name] = output
+        # Get the output value
+        output = input_obj.voltage_to_output(voltage)
 
-                # Update the cache
-                self._update_cache(outputs)
-            except Exception as e:
-                self.status = self.DeviceStatus.ERROR
-                self._log(f'Error on {self.name}: {e}')
-                
+        # Log it
+        self._log_telemetry(param_name=input_obj.name, value=output, units=input_obj.units)
 
-        # Log error if the data collection worker stops unexpectedly
-        self._log('Data collection worker stopped.', self.log.LogSeverity.ERROR)
-        self.status = self.DeviceStatus.ERROR
+        return {input_obj.name: output}
 
 
 
 # Example usage
 from Backend.resources.analog_in import ValueMapper
+from Backend.i2c_scheduler import I2CScheduler
 if __name__ == '__main__':
     testValueMapper = ValueMapper(
         voltage_range=[0.5, 4.5], 
@@ -128,8 +119,10 @@ if __name__ == '__main__':
         Analog_In('Testinput4', 'Units', testValueMapper)
     ])
     
-    # Initialize the ADS_1015 with the I2C bus
+    # Initialize the ADS_1015 with the I2C bus, and start reading it
     ads.initialize(SMBus(2))
+    scheduler = I2CScheduler('ADSTestScheduler', ads.log)
+    scheduler.start([ads])
 
     print("Starting ADS1015 data collection... Press Ctrl+C to exit.")
 
@@ -145,17 +145,24 @@ class Analog_In:
     name : str
     voltage : float
     units : str
+    sample_rate : float     # Target number of reads per second (See I2CScheduler)
 
     # Decoding properties
     min_voltage : float
     max_voltage : float
 
 
-    def __init__(self, name: str, units: str, mapper: Union[ValueMapper, ExponentialValueMapper]):
+    # Default target number of reads per second
+    DEFAULT_SAMPLE_RATE = 10
+
+
+    def __init__(self, name: str, units: str, mapper: Union[ValueMapper, ExponentialValueMapper],
+                 sample_rate: float = DEFAULT_SAMPLE_RATE):
         '''Initalizer for the Analog_in object'''
         self.name = name
         self.units = units
         self.converter = mapper
+        self.sample_rate = sample_rate
 
         self.min_voltage = mapper.min_voltage
         self.max_voltage = mapper.max_voltage
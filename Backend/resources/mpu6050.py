@@ -11,8 +11,8 @@
 import logging
 log = logging.getLogger('MPU6050')
 
-from typing import List
-from Backend.device import I2CDevice
+from typing import Dict, List
+from Backend.device import I2CDevice, AcquisitionChannel
 from Backend.resources.internal_device import InternalDevice
 from smbus2 import SMBus
 try:
@@ -121,6 +121,28 @@ class Internal_MPU_6050(InternalDevice):
             "z": raw_data[2] / self.gyro_scale_factor,
         }
 
+    def read_motion(self):
+        """
+        Reads the accelerometer & gyroscope data together. On an I2CBusArbiter, both blocks are read in one transaction
+        (the MPU6050's registers auto-increment, and the temperature registers between the blocks are safe to read).
+
+        Returns:
+            tuple: The acceleration (g) & gyroscope (dps) dictionaries, like read_acceleration() & read_gyroscope().
+        """
+        blocks = [(self.REG_ACCEL_XOUT_H, 6), (self.REG_GYRO_XOUT_H, 6)]
+        read_blocks = getattr(self.bus, 'read_blocks', None)
+        if read_blocks is None:
+            raw_blocks = [self.bus.read_i2c_block_data(self.MPU6050_I2C_ADDRESS, register, length) for register, length in blocks]
+        else:
+            raw_blocks = read_blocks(self.MPU6050_I2C_ADDRESS, blocks)
+
+        accel, gyro = ([self._unsigned_byte_to_signed_byte((raw[i] << 8) | raw[i + 1], 16) for i in range(0, 6, 2)]
+                       for raw in raw_blocks)
+        return (
+            {"x": accel[0] / self.accel_scale_factor, "y": accel[1] / self.accel_scale_factor, "z": accel[2] / self.accel_scale_factor},
+            {"x": gyro[0] / self.gyro_scale_factor, "y": gyro[1] / self.gyro_scale_factor, "z": gyro[2] / self.gyro_scale_factor},
+        )
+
     def _read_raw_data(self, start_register: int, length: int):
         """
         Reads raw data from the MPU6050 starting at the specified register.
@@ -159,10 +181,18 @@ class MPU_6050_x3(I2CDevice):
 
     '''
     This handles the communication for all three MPU 6050 accel/gyro sensors.
+    All three share one address, and the one being read is selected with a GPIO pin.
     '''
 
-    def __init__(self, name, logger):
+    # Default target number of reads per second, of each sensor
+    SAMPLE_RATE = 200
+
+    # Time (seconds) for a sensor's address select line to settle after switching sensors
+    SELECT_SETTLE_TIME = 0.0002
+
+    def __init__(self, name, logger, sample_rate: float = SAMPLE_RATE):
         super().__init__(name, logger)
+        self.sample_rate = sample_rate
         self.dev_pins = [17, 27, 22]  # GPIO pins for device selection
         self.bus = None
         self.internal_devices: List[Internal_MPU_6050] = []  # Holds Internal_MPU_6050 instances
@@ -175,6 +205,10 @@ class MPU_6050_x3(I2CDevice):
         '''
         self.bus = bus
 
+        # Release the GPIO & sensors from a previous initialization (Ex. after an error)
+        self._close_gpio()
+        self.internal_devices = []
+
         # Setup GPIO for device selection
         Device.pin_factory = LGPIOFactory()
         self.device_selectors = [LED(pin) for pin in self.dev_pins]
@@ -192,7 +226,6 @@ class MPU_6050_x3(I2CDevice):
                 self.internal_devices.append(internal_device)
 
             self.status = self.DeviceStatus.ACTIVE
-            self.start_worker()  # Start the data collection thread
             self._log(f"{self.name} Finished Initializing.")
         except Exception as e:
             # Make sure GPIO is properly released if this fails
@@ -211,61 +244,52 @@ class MPU_6050_x3(I2CDevice):
                 selector.off()
 
 
-    def update(self):
+    def get_acquisition_channels(self) -> List[AcquisitionChannel]:
         '''
-        Updates cached values from the data collection thread.
+        Each sensor is its own channel, read at `sample_rate`.
+        Every sensor gets a channel, even before it initializes, so it is read once the device becomes active.
         '''
-            
-        # No additional logic needed if data collection worker is running
-        self._check_cache_timeout()
+        return [
+            AcquisitionChannel(f"MPU{dev_id + 1}", self.sample_rate,
+                               lambda dev_id=dev_id: self._read_sensor(dev_id),
+                               self)
+            for dev_id in range(len(self.dev_pins))
+        ]
 
 
-    def _data_collection_worker(self):
-        """
-        This function contains the code that will be running on the separate thread.
-        It should handle communication with the sensors and update the cache.
+    def _read_sensor(self, dev_id: int) -> Dict[str, float]:
         """
-        while self.status == self.DeviceStatus.ACTIVE:
-            for dev_id in range(3):
-                self._select_device(dev_id)
-                time.sleep(0.05)
-
-                # Get data from the internal MPU6050 device
-                internal_device = self.internal_devices[dev_id]
-
-                # Read acceleration and gyroscope data
-                try:
-                    acceleration = internal_device.read_acceleration()
-                    gyroscope = internal_device.read_gyroscope()
-                except Exception as e:
-                    self.status = self.DeviceStatus.ERROR
-                    break
+        Selects one of the sensors, and reads its acceleration & rotation (called by the scheduler).
 
+        Returns:
+            Dict[str, float]: The parameterized data entries of the sensor.
+        """
+        self._select_device(dev_id)
+        time.sleep(self.SELECT_SETTLE_TIME)
 
-                # Create parameterized data entries
-                data = {
-                    f"MPU{dev_id + 1}_xAccl": acceleration["x"],
-                    f"MPU{dev_id + 1}_yAccl": acceleration["y"],
-                    f"MPU{dev_id + 1}_zAccl": acceleration["z"],
-                    f"MPU{dev_id + 1}_xGyro": gyroscope["x"],
-                    f"MPU{dev_id + 1}_yGyro": gyroscope["y"],
-                    f"MPU{dev_id + 1}_zGyro": gyroscope["z"],
-                }
+        # Get data from the internal MPU6050 device
+        internal_device = self.internal_devices[dev_id]
 
-                # Update the shared cache
-                self._update_cache(data)
+        # Read acceleration and gyroscope data
+        acceleration, gyroscope = internal_device.read_motion()
 
-        # Log error if the data collection worker stops unexpectedly
-        self._log("Data collection worker stopped.", self.log.LogSeverity.ERROR)
-        self.status = self.DeviceStatus.ERROR
+        # Create parameterized data entries
+        return {
+            f"MPU{dev_id + 1}_xAccl": acceleration["x"],
+            f"MPU{dev_id + 1}_yAccl": acceleration["y"],
+            f"MPU{dev_id + 1}_zAccl": acceleration["z"],
+            f"MPU{dev_id + 1}_xGyro": gyroscope["x"],
+            f"MPU{dev_id + 1}_yGyro": gyroscope["y"],
+            f"MPU{dev_id + 1}_zGyro": gyroscope["z"],
+        }
 
-        self._close_gpio()
 
     def _close_gpio(self):
-        # Release the GPIO pins that the thread was using
+        # Release the GPIO pins that were used to select the sensors
         try:
             for led in self.device_selectors:
                 led.close()
+            self.device_selectors = []
         except Exception as e:
             self._log(f'Resources for {self.name} were unable to be released during the failure.', DataLogger.LogSeverity.ERROR)
             self._log('This device is unavailable until program restart.', DataLogger.LogSeverity.ERROR)
@@ -283,6 +307,7 @@ class MPU_6050_x3(I2CDevice):
 
 
 from Backend.data_logger import DataLogger
+from Backend.i2c_scheduler import I2CScheduler
 import time  # Import the time module for delta time calculation
 
 if __name__ == '__main__':
@@ -292,6 +317,8 @@ if __name__ == '__main__':
     mpu = MPU_6050_x3('MPU', DataLogger('MPUTest'))
 
     mpu.initialize(bus)
+    scheduler = I2CScheduler('MPUTestScheduler', mpu.log)
+    scheduler.start([mpu])
 
     # Initialize prev_time to calculate delta time
     prev_time = time.time()
@@ -0,0 +1,777 @@
+# Telemetry File Formats for Terrier Motorsport's DDS
+
+"""
+Module Overview
+---------------
+
+This module contains the writers (and readers) for the telemetry files made by the DataLogger.
+The DataLogger's writer thread hands batches of rows to one of these writers, and the writer
+takes care of getting them into the file.
+
+Every row has the format `(time, device, parameter, value, units)`.
+
+
+Formats
+-------
+
+1. **CSV** (`Telemetry.csv`)
+    - One text row per value: `Time,Device,Parameter,Value,Units`.
+    - Easy to read, but the device/parameter/unit names are repeated on every row.
+
+2. **Binary** (`Telemetry.bin` + `Telemetry.dict`)
+    - `Telemetry.bin` starts with an 8 byte header (`FILE_MAGIC`), followed by fixed-width records:
+
+        | Field      | Type    | Notes                                                   |
+        |------------|---------|---------------------------------------------------------|
+        | time       | float64 | Unix timestamp                                          |
+        | channel    | uint16  | ID of the (device, parameter, units) the value is from  |
+        | value_type | uint8   | One of `ValueType`                                      |
+        | value      | 8 bytes | float64, int64, bool, or the ID of an interned string   |
+
+    - `Telemetry.dict` is the header dictionary. It holds one JSON object per line, and is only ever appended to:
+        - `{"c": 0, "d": "OrionBMS2", "p": "Pack_SOC", "u": "%"}` defines channel 0.
+        - `{"s": 0, "v": "Charging"}` defines string 0 (used for non-numeric values).
+    - Channels & strings are written to the dictionary (and synced) before any record that uses them,
+      so a file cut short by a power loss can always be decoded.
+
+Use `convert_binary_to_csv()` (or run this module) to turn a binary log back into the CSV format.
+    EX: python -m Backend.telemetry_format <path to Telemetry.bin> [output .csv path]
+
+
+Reading
+-------
+
+`iter_telemetry()` streams the rows of either format one at a time, and can filter them by
+device, parameter and time window, so a whole session never has to be held in memory.
+Binary files are memory-mapped and filtered with NumPy, so rows that don't match the filters
+are never turned into Python objects.
+
+`read_telemetry_columns()` returns a NumPy `time` & `value` array for each (device, parameter),
+which can be handed straight to matplotlib.
+
+Both readers take either a single telemetry file or a whole session directory.
+
+
+Segments
+--------
+
+The DataLogger doesn't write one file per session. `SegmentedTelemetryWriter` rolls over to a new
+segment (`Telemetry_0000.csv`, `Telemetry_0001.csv`, ...) once the current one gets too big or too old.
+Every segment is a complete telemetry file on its own: CSV segments start with their own header row,
+and binary segments have their own `FILE_MAGIC` header & dictionary. A corrupt tail only costs the last segment.
+
+Each session directory also has a `manifest.json`, which lists the segments in order:
+
+    {"format": "csv", "segments": [
+        {"index": 0, "file": "Telemetry_0000.csv", "start": 1714000000.0, "end": 1714000600.0,
+         "rows": 120000, "bytes": 5242880, "complete": true},
+        {"index": 1, "file": "Telemetry_0001.csv", "start": null, "end": null,
+         "rows": 0, "bytes": 0, "complete": false}]}
+
+The manifest is rewritten (atomically) whenever a segment is opened or closed, so only the segment
+being written is ever `"complete": false`. Use `session_segments()` to find the segments which cover
+a time window (Ex. the last 5 minutes) without opening the rest.
+"""
+
+from csv import writer as csvWriter
+from enum import Enum
+from csv import reader as csvReader
+from itertools import chain
+from time import time as currentTime
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+import glob
+import json
+import mmap
+import os
+import struct
+import sys
+import numpy as np
+
+
+CSV_HEADER = ["Time", "Device", "Parameter", "Value", "Units"]
+
+FILE_MAGIC = b'DDSTLM\x00\x01'          # File type & format version
+RECORD_STRUCT = struct.Struct('<dHB8s')  # time, channel, value_type, value
+VALUE_STRUCTS = {
+    'float': struct.Struct('<d'),
+    'int': struct.Struct('<q'),
+}
+RECORD_DTYPE = np.dtype([          # RECORD_STRUCT as a NumPy type (used to memory-map the records)
+    ('time', '<f8'),
+    ('channel', '<u2'),
+    ('value_type', 'u1'),
+    ('value', 'V8'),
+])
+READ_CHUNK_SIZE = 65536             # Records converted to Python objects at a time while streaming
+SEGMENT_BASE_NAME = 'Telemetry'
+MANIFEST_FILE_NAME = 'manifest.json'
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+MAX_CHANNELS = 2**16
+
+
+class TelemetryFormat(Enum):
+    '''The formats the DataLogger can write telemetry in.'''
+    CSV = 'csv'
+    BINARY = 'binary'
+
+
+class ValueType(Enum):
+    '''How the value of a binary record is stored.'''
+    NONE = 0
+    FLOAT = 1
+    INT = 2
+    BOOL = 3
+    STRING = 4      # The value is the ID of a string in the dictionary
+
+
+class CSVTelemetryWriter:
+    '''
+    Writes telemetry rows to a CSV file. The header row is written if the file is new.
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__file = open(path, "a", newline='')
+        self.__writer = csvWriter(self.__file)
+        if self.__file.tell() == 0:
+            self.__writer.writerow(CSV_HEADER)
+
+
+    def size(self) -> int:
+        '''Returns the size of the file (bytes), including anything that hasn't been flushed yet.'''
+        return self.__file.tell()
+
+
+    def writerows(self, rows: List[tuple]):
+        '''Writes telemetry rows to the file.'''
+        self.__writer.writerows(rows)
+
+
+    def sync(self):
+        '''Flushes the file and fsyncs it to the disk.'''
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+
+    def close(self):
+        '''Syncs & closes the file.'''
+        if self.__file.closed:
+            return
+        self.sync()
+        self.__file.close()
+
+
+class BinaryTelemetryWriter:
+    '''
+    Writes telemetry rows to a binary telemetry file & its dictionary (see the module docstring).
+    '''
+
+    def __init__(self, path: str):
+        '''
+        Creates the binary telemetry file (and its dictionary) at the given path.
+
+        Parameters:
+            path (str): The path of the binary file. The dictionary is written next to it (see `dictionary_path()`).
+        '''
+        self.path = path
+        self.dictionary_path = dictionary_path(path)
+        self.__channels: Dict[Tuple[str, str, str], int] = {}
+        self.__strings: Dict[str, int] = {}
+
+        self.__file = open(path, "wb")
+        self.__file.write(FILE_MAGIC)
+        self.__dictionary_file = open(self.dictionary_path, "w")
+        self.__size = len(FILE_MAGIC)
+
+
+    def writerows(self, rows: List[tuple]):
+        '''Writes telemetry rows to the file.'''
+        records = []
+        new_entries = []
+
+        for time, device_name, param_name, value, units in rows:
+            channel = self.__get_channel_id(device_name, param_name, units, new_entries)
+            value_type, packed_value = self.__pack_value(value, new_entries)
+            records.append(RECORD_STRUCT.pack(time, channel, value_type.value, packed_value))
+
+        # The dictionary always has to be ahead of the records which use it
+        if new_entries:
+            self.__dictionary_file.write(''.join(new_entries))
+            self.__dictionary_file.flush()
+            os.fsync(self.__dictionary_file.fileno())
+
+        self.__file.write(b''.join(records))
+        self.__size += len(records) * RECORD_STRUCT.size
+
+
+    def size(self) -> int:
+        '''Returns the size of the file (bytes), including anything that hasn't been flushed yet.'''
+        return self.__size
+
+
+    def sync(self):
+        '''Flushes the file and fsyncs it to the disk.'''
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+
+    def close(self):
+        '''Syncs & closes the file & its dictionary.'''
+        if self.__file.closed:
+            return
+        self.sync()
+        self.__file.close()
+        self.__dictionary_file.close()
+
+
+    def __get_channel_id(self, device_name: str, param_name: str, units: str, new_entries: List[str]) -> int:
+        '''Returns the ID of a channel, interning it if it hasn't been seen before.'''
+        key = (device_name, param_name, units)
+        channel = self.__channels.get(key)
+        if channel is not None:
+            return channel
+
+        channel = len(self.__channels)
+        if channel >= MAX_CHANNELS:
+            raise OverflowError(f"Binary telemetry supports at most {MAX_CHANNELS} channels.")
+        self.__channels[key] = channel
+        new_entries.append(json.dumps({"c": channel, "d": device_name, "p": param_name, "u": units}) + '\n')
+        return channel
+
+
+    def __get_string_id(self, value: str, new_entries: List[str]) -> int:
+        '''Returns the ID of a string value, interning it if it hasn't been seen before.'''
+        string_id = self.__strings.get(value)
+        if string_id is not None:
+            return string_id
+
+        string_id = len(self.__strings)
+        self.__strings[value] = string_id
+        new_entries.append(json.dumps({"s": string_id, "v": value}) + '\n')
+        return string_id
+
+
+    def __pack_value(self, value: Any, new_entries: List[str]) -> Tuple[ValueType, bytes]:
+        '''Returns the type & packed bytes of a value.'''
+        # bool has to be checked before int, since bool is a subclass of int.
+        if value is None:
+            return ValueType.NONE, bytes(8)
+        if isinstance(value, bool):
+            return ValueType.BOOL, VALUE_STRUCTS['int'].pack(int(value))
+        if isinstance(value, float):
+            return ValueType.FLOAT, VALUE_STRUCTS['float'].pack(value)
+        if isinstance(value, int) and INT64_MIN <= value <= INT64_MAX:
+            return ValueType.INT, VALUE_STRUCTS['int'].pack(value)
+
+        # Anything else (choices, strings, huge ints) is stored as its string
+        return ValueType.STRING, VALUE_STRUCTS['int'].pack(self.__get_string_id(str(value), new_entries))
+
+
+class SegmentedTelemetryWriter:
+    '''
+    Writes telemetry rows to a series of segment files in a session directory, and keeps the
+    session's manifest up to date (see the module docstring).
+    Has the same `writerows()`, `sync()` & `close()` methods as the single file writers.
+    '''
+
+    def __init__(self,
+                 directory: str,
+                 telemetry_format: TelemetryFormat = TelemetryFormat.CSV,
+                 max_segment_bytes: int = None,
+                 max_segment_seconds: float = None):
+        '''
+        Parameters:
+            directory (str): The session directory the segments & manifest are written to.
+            telemetry_format (TelemetryFormat): The format of the segment files.
+            max_segment_bytes (int): Roll over to a new segment once the current one is this big. None for no limit.
+            max_segment_seconds (float): Roll over to a new segment once the current one is this old. None for no limit.
+        '''
+        self.directory = directory
+        self.telemetry_format = TelemetryFormat(telemetry_format)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE_NAME)
+
+        self.__segments: List[dict] = []
+        self.__writer: Union[CSVTelemetryWriter, BinaryTelemetryWriter, None] = None
+        self.__segment_opened = 0.0
+        self.__open_segment()
+
+
+    @property
+    def path(self) -> str:
+        '''The path of the segment currently being written.'''
+        return os.path.join(self.directory, self.__segments[-1]["file"])
+
+
+    @property
+    def segment_count(self) -> int:
+        '''The number of segments in the session so far.'''
+        return len(self.__segments)
+
+
+    def writerows(self, rows: List[tuple]):
+        '''Writes telemetry rows to the current segment, rolling over to a new one first if it's full.'''
+        if not rows:
+            return
+        if self.__writer is None:
+            # Opening the last segment failed. Try again.
+            self.__open_segment()
+        elif self.__segment_is_full():
+            self.__close_segment()
+            self.__open_segment()
+
+        self.__writer.writerows(rows)
+
+        segment = self.__segments[-1]
+        if segment["start"] is None:
+            segment["start"] = rows[0][0]
+        segment["end"] = rows[-1][0]
+        segment["rows"] += len(rows)
+
+
+    def sync(self):
+        '''Flushes the current segment and fsyncs it to the disk.'''
+        if self.__writer is not None:
+            self.__writer.sync()
+
+
+    def close(self):
+        '''Closes the current segment and marks it complete in the manifest.'''
+        if self.__writer is not None:
+            self.__close_segment()
+
+
+    def __segment_is_full(self) -> bool:
+        '''Returns True if the current segment has rows, and is past its size or age limit.'''
+        if self.__segments[-1]["rows"] == 0:
+            return False
+        if self.max_segment_bytes is not None and self.__writer.size() >= self.max_segment_bytes:
+            return True
+        if self.max_segment_seconds is not None and currentTime() - self.__segment_opened >= self.max_segment_seconds:
+            return True
+        return False
+
+
+    def __open_segment(self):
+        '''Creates the next segment file & adds it to the manifest.'''
+        # Reuse the index of a segment that failed to open
+        if self.__segments and not self.__segments[-1]["complete"]:
+            segment = self.__segments.pop()
+            index = segment["index"]
+        else:
+            index = len(self.__segments)
+
+        extension = '.bin' if self.telemetry_format is TelemetryFormat.BINARY else '.csv'
+        segment = {
+            "index": index,
+            "file": f"{SEGMENT_BASE_NAME}_{index:04d}{extension}",
+            "start": None,
+            "end": None,
+            "rows": 0,
+            "bytes": 0,
+            "complete": False,
+        }
+        self.__segments.append(segment)
+
+        path = os.path.join(self.directory, segment["file"])
+        if self.telemetry_format is TelemetryFormat.BINARY:
+            self.__writer = BinaryTelemetryWriter(path)
+            segment["dictionary"] = os.path.basename(self.__writer.dictionary_path)
+        else:
+            self.__writer = CSVTelemetryWriter(path)
+        self.__segment_opened = currentTime()
+        self.__write_manifest()
+
+
+    def __close_segment(self):
+        '''Syncs & closes the current segment, and marks it complete in the manifest.'''
+        writer = self.__writer
+        self.__writer = None
+        segment = self.__segments[-1]
+        segment["bytes"] = writer.size()
+        try:
+            writer.close()
+        finally:
+            # Even if the close failed, the rows already in the segment must not be written over.
+            segment["complete"] = True
+            self.__write_manifest()
+
+
+    def __write_manifest(self):
+        '''Atomically replaces the manifest, so a power loss leaves either the old or the new one.'''
+        manifest = {"format": self.telemetry_format.value, "segments": self.__segments}
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, "w") as file:
+            json.dump(manifest, file, indent=1)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.manifest_path)
+
+
+def dictionary_path(binary_path: str) -> str:
+    '''Returns the path of the dictionary for a binary telemetry file (Ex. Telemetry.bin -> Telemetry.dict).'''
+    return os.path.splitext(binary_path)[0] + '.dict'
+
+
+def load_dictionary(binary_path: str) -> Tuple[Dict[int, Tuple[str, str, str]], Dict[int, str]]:
+    '''
+    Loads the dictionary of a binary telemetry file.
+
+    Returns:
+        Tuple[Dict[int, Tuple[str, str, str]], Dict[int, str]]: The `(device, parameter, units)` of each channel ID,
+                                                                and the value of each string ID.
+    '''
+    channels: Dict[int, Tuple[str, str, str]] = {}
+    strings: Dict[int, str] = {}
+
+    with open(dictionary_path(binary_path), "r") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the last line can be partial (power loss while writing). Ignore it.
+                continue
+            if "c" in entry:
+                channels[entry["c"]] = (entry["d"], entry["p"], entry["u"])
+            elif "s" in entry:
+                strings[entry["s"]] = entry["v"]
+
+    return channels, strings
+
+
+def load_manifest(directory: str) -> dict:
+    '''
+    Loads the manifest of a session directory.
+    Sessions without a manifest get one made up from the telemetry files in the directory.
+
+    Returns:
+        dict: The manifest (see the module docstring).
+    '''
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE_NAME), "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        pass
+
+    segments = []
+    for path in sorted(glob.glob(os.path.join(directory, f"{SEGMENT_BASE_NAME}*.csv")) +
+                       glob.glob(os.path.join(directory, f"{SEGMENT_BASE_NAME}*.bin"))):
+        segments.append({"index": len(segments), "file": os.path.basename(path),
+                         "start": None, "end": None, "complete": False})
+    return {"format": None, "segments": segments}
+
+
+def session_segments(directory: str, start: float = None, end: float = None, last: int = None) -> List[str]:
+    '''
+    Returns the paths of the segments in a session directory which can have rows in a time window.
+    Only the manifest is read, so old segments are skipped without being opened.
+
+    Parameters:
+        directory (str): The session directory.
+        start (float): Leave out segments which end before this time.
+        end (float): Leave out segments which start after this time.
+        last (int): Only return (up to) this many of the most recent matching segments.
+
+    Returns:
+        List[str]: The paths of the matching segments, oldest first.
+    '''
+    paths = []
+    for segment in load_manifest(directory)["segments"]:
+        # Segments without times (still being written, or from a session without a manifest) are always included
+        if start is not None and segment.get("end") is not None and segment["end"] < start:
+            continue
+        if end is not None and segment.get("start") is not None and segment["start"] > end:
+            continue
+        path = os.path.join(directory, segment["file"])
+        if os.path.exists(path):
+            paths.append(path)
+
+    if last is not None:
+        paths = paths[-last:] if last > 0 else []
+    return paths
+
+
+def is_binary_telemetry(path: str) -> bool:
+    '''Returns True if the file at the path is a binary telemetry file (rather than a CSV).'''
+    with open(path, "rb") as file:
+        return file.read(len(FILE_MAGIC)) == FILE_MAGIC
+
+
+def iter_telemetry(path: str,
+                   devices: Union[str, Iterable[str]] = None,
+                   params: Union[str, Iterable[str]] = None,
+                   start: float = None,
+                   end: float = None) -> Iterator[tuple]:
+    '''
+    Streams the rows of a telemetry file (CSV or binary), one at a time.
+
+    Parameters:
+        path (str): The path of the telemetry file, or of a session directory (every segment is read, in order).
+        devices (Union[str, Iterable[str]]): Only return rows from these devices. Defaults to all devices.
+        params (Union[str, Iterable[str]]): Only return rows for these parameters. Defaults to all parameters.
+        start (float): Only return rows at or after this time. Defaults to the start of the file.
+        end (float): Only return rows at or before this time. Defaults to the end of the file.
+
+    Returns:
+        Iterator[tuple]: `(time, device, parameter, value, units)` for each matching row. 
+                         Values from CSV files are strings, since the CSV doesn't store types.
+    '''
+    if os.path.isdir(path):
+        return chain.from_iterable(iter_telemetry(segment_path, devices, params, start, end)
+                                   for segment_path in session_segments(path, start, end))
+    if is_binary_telemetry(path):
+        return read_binary_telemetry(path, devices, params, start, end)
+    return read_csv_telemetry(path, devices, params, start, end)
+
+
+def read_csv_telemetry(csv_path: str,
+                       devices: Union[str, Iterable[str]] = None,
+                       params: Union[str, Iterable[str]] = None,
+                       start: float = None,
+                       end: float = None) -> Iterator[tuple]:
+    '''
+    Streams the rows of a CSV telemetry file. See `iter_telemetry()` for the parameters.
+    '''
+    devices = _as_filter(devices)
+    params = _as_filter(params)
+
+    with open(csv_path, "r", newline='') as file:
+        reader = csvReader(file)
+        next(reader, None)   # Skip the header row
+
+        for row in reader:
+            # Skip a partial row at the end of the file (power loss while writing)
+            if len(row) != len(CSV_HEADER):
+                continue
+            time_str, device_name, param_name, value, units = row
+
+            if devices is not None and device_name not in devices:
+                continue
+            if params is not None and param_name not in params:
+                continue
+
+            try:
+                time = float(time_str)
+            except ValueError:
+                continue
+            if (start is not None and time < start) or (end is not None and time > end):
+                continue
+
+            yield (time, device_name, param_name, value, units)
+
+
+def read_binary_telemetry(binary_path: str,
+                          devices: Union[str, Iterable[str]] = None,
+                          params: Union[str, Iterable[str]] = None,
+                          start: float = None,
+                          end: float = None) -> Iterator[tuple]:
+    '''
+    Streams the rows of a binary telemetry file. See `iter_telemetry()` for the parameters.
+
+    Raises:
+        ValueError: If the file is not a binary telemetry file.
+    '''
+    records = _map_binary_records(binary_path)
+    channels, strings = load_dictionary(binary_path)
+    indices = np.flatnonzero(_select_binary_records(records, channels, devices, params, start, end))
+
+    for chunk_start in range(0, len(indices), READ_CHUNK_SIZE):
+        # Copy a chunk of the matching records out of the map, and convert them to Python objects in bulk
+        chunk = records[indices[chunk_start:chunk_start + READ_CHUNK_SIZE]]
+        float_values = chunk['value'].view('<f8').tolist()
+        int_values = chunk['value'].view('<i8').tolist()
+
+        for i, (time, channel, value_type) in enumerate(zip(chunk['time'].tolist(),
+                                                            chunk['channel'].tolist(),
+                                                            chunk['value_type'].tolist())):
+            device_name, param_name, units = channels[channel]
+
+            if value_type == ValueType.FLOAT.value:
+                value = float_values[i]
+            elif value_type == ValueType.INT.value:
+                value = int_values[i]
+            elif value_type == ValueType.BOOL.value:
+                value = bool(int_values[i])
+            elif value_type == ValueType.STRING.value:
+                value = strings[int_values[i]]
+            else:
+                value = None
+
+            yield (time, device_name, param_name, value, units)
+
+
+def read_telemetry_columns(path: str,
+                           devices: Union[str, Iterable[str]] = None,
+                           params: Union[str, Iterable[str]] = None,
+                           start: float = None,
+                           end: float = None) -> Dict[Tuple[str, str], Dict[str, np.ndarray]]:
+    '''
+    Reads a telemetry file (CSV or binary) into NumPy column arrays, one pair per (device, parameter).
+    See `iter_telemetry()` for the parameters.
+
+    Returns:
+        Dict[Tuple[str, str], Dict[str, np.ndarray]]: A `time` & `value` array (both float64) for each (device, parameter).
+                                                      Values which aren't numeric are NaN.
+    '''
+    if os.path.isdir(path):
+        columns: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+        for segment_path in session_segments(path, start, end):
+            for key, column in read_telemetry_columns(segment_path, devices, params, start, end).items():
+                _add_columns(columns, key, column['time'], column['value'])
+        return columns
+
+    if not is_binary_telemetry(path):
+        return _csv_telemetry_columns(path, devices, params, start, end)
+
+    channels, strings = load_dictionary(path)
+    records = _map_binary_records(path)
+    selected = records[_select_binary_records(records, channels, devices, params, start, end)]
+    del records
+
+    # Turn the raw values into floats, based on their types
+    value_types = selected['value_type']
+    values = np.full(len(selected), np.nan)
+    is_float = value_types == ValueType.FLOAT.value
+    is_int = (value_types == ValueType.INT.value) | (value_types == ValueType.BOOL.value)
+    values[is_float] = selected['value'][is_float].view('<f8')
+    values[is_int] = selected['value'][is_int].view('<i8')
+
+    # Split the records up by channel
+    columns: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+    channel_ids = selected['channel']
+    for channel in np.unique(channel_ids).tolist():
+        device_name, param_name, units = channels[channel]
+        is_channel = channel_ids == channel
+        _add_columns(columns, (device_name, param_name), selected['time'][is_channel], values[is_channel])
+
+    return columns
+
+
+def _csv_telemetry_columns(csv_path: str, devices, params, start, end) -> Dict[Tuple[str, str], Dict[str, np.ndarray]]:
+    '''The CSV version of `read_telemetry_columns()`.'''
+    times: Dict[Tuple[str, str], List[float]] = {}
+    values: Dict[Tuple[str, str], List[float]] = {}
+
+    for time, device_name, param_name, value, units in read_csv_telemetry(csv_path, devices, params, start, end):
+        key = (device_name, param_name)
+        if key not in times:
+            times[key] = []
+            values[key] = []
+        times[key].append(time)
+        try:
+            values[key].append(float(value))
+        except ValueError:
+            values[key].append(np.nan)
+
+    return {key: {'time': np.array(times[key], dtype=np.float64), 'value': np.array(values[key], dtype=np.float64)}
+            for key in times}
+
+
+def _add_columns(columns: Dict[Tuple[str, str], Dict[str, np.ndarray]], key: Tuple[str, str], times: np.ndarray, values: np.ndarray):
+    '''
+    Adds time & value arrays to the columns for a (device, parameter).
+    A parameter can be logged under more than one channel (Ex. its units changed), so those are merged in time order.
+    '''
+    if key in columns:
+        times = np.concatenate((columns[key]['time'], times))
+        values = np.concatenate((columns[key]['value'], values))
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        values = values[order]
+    columns[key] = {'time': times, 'value': values}
+
+
+def _map_binary_records(binary_path: str) -> np.ndarray:
+    '''
+    Memory-maps the records of a binary telemetry file as a read-only NumPy array (nothing is copied).
+    A partial record at the end of the file (power loss while writing) is left out.
+
+    Raises:
+        ValueError: If the file is not a binary telemetry file.
+    '''
+    with open(binary_path, "rb") as file:
+        if file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"{binary_path} is not a binary telemetry file.")
+
+        count = (os.fstat(file.fileno()).st_size - len(FILE_MAGIC)) // RECORD_DTYPE.itemsize
+        if count <= 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        # The map stays open for as long as the returned array (or a view of it) is alive.
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return np.frombuffer(mapped, dtype=RECORD_DTYPE, count=count, offset=len(FILE_MAGIC))
+
+
+def _select_binary_records(records: np.ndarray,
+                           channels: Dict[int, Tuple[str, str, str]],
+                           devices, params, start, end) -> np.ndarray:
+    '''Returns a boolean mask of the records which match the filters (see `iter_telemetry()`).'''
+    devices = _as_filter(devices)
+    params = _as_filter(params)
+    mask = np.ones(len(records), dtype=bool)
+
+    if devices is not None or params is not None:
+        wanted_channels = [channel for channel, (device_name, param_name, units) in channels.items()
+                           if (devices is None or device_name in devices) and (params is None or param_name in params)]
+        mask &= np.isin(records['channel'], wanted_channels)
+    if start is not None:
+        mask &= records['time'] >= start
+    if end is not None:
+        mask &= records['time'] <= end
+
+    return mask
+
+
+def _as_filter(names: Union[str, Iterable[str], None]) -> Union[set, None]:
+    '''Turns a name (or names) to filter by into a set. None means no filter.'''
+    if names is None:
+        return None
+    if isinstance(names, str):
+        return {names}
+    return set(names)
+
+
+def to_csv_fields(row: tuple) -> List[str]:
+    '''Converts a telemetry row into the strings that would be read back from the CSV file.'''
+    fields = []
+    for field in row:
+        if field is None:
+            fields.append('')
+        elif isinstance(field, float):
+            fields.append(repr(field))
+        else:
+            fields.append(str(field))
+    return fields
+
+
+def convert_binary_to_csv(binary_path: str, csv_path: str = None) -> str:
+    '''
+    Converts a binary telemetry file into the CSV telemetry format.
+
+    Parameters:
+        binary_path (str): The path of the binary file.
+        csv_path (str): The path of the CSV file to write. Defaults to the binary path with a .csv extension.
+
+    Returns:
+        str: The path of the CSV file.
+    '''
+    if csv_path is None:
+        csv_path = os.path.splitext(binary_path)[0] + '.csv'
+
+    with open(csv_path, "w", newline='') as file:
+        writer = csvWriter(file)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(read_binary_telemetry(binary_path))
+
+    return csv_path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print('Usage: python -m Backend.telemetry_format <path to Telemetry.bin> [output .csv path]')
+        sys.exit(1)
+
+    print(f'Wrote {convert_binary_to_csv(*sys.argv[1:])}')
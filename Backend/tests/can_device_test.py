@@ -0,0 +1,108 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import can
+import cantools.database
+from Backend.data_logger import DataLogger
+from Backend.device import CANDevice
+
+
+# Signals with choices, and a multiplexed message, which the DBCs in Backend/candatabase don't have
+TEST_DBC = '''VERSION ""
+
+NS_ :
+
+BS_:
+
+BU_: DDS
+
+BO_ 256 Status: 4 DDS
+ SG_ Mode : 0|8@1+ (1,0) [0|255] "" DDS
+ SG_ Temperature : 8|16@1- (0.1,-40) [-40|100] "degC" DDS
+ SG_ Enabled : 24|1@1+ (1,0) [0|1] "" DDS
+
+BO_ 512 Cells: 8 DDS
+ SG_ Index M : 0|8@1+ (1,0) [0|255] "" DDS
+ SG_ Cell_0 m0 : 8|16@1+ (0.001,0) [0|65.535] "V" DDS
+ SG_ Cell_1 m1 : 8|16@1+ (0.001,0) [0|65.535] "V" DDS
+
+VAL_ 256 Mode 0 "Off" 1 "Drive" 2 "Charge" ;
+VAL_ 256 Enabled 0 "No" 1 "Yes" ;
+'''
+
+
+class TestCANDevice(CANDevice):
+    def __init__(self, dbc_filepath: str, logger):
+        super().__init__('TestDevice', dbc_filepath, logger)
+
+
+class CANDecodePlanTest(unittest.TestCase):
+    '''The decode plans must decode every frame exactly like cantools does.'''
+
+    DBC_FILES = ['Orion_BMS2_CANBUSv7.dbc', 'DTI_HV_500_CANBUSv3.dbc', 'evolve_elcon_uhf_charger.dbc']
+
+    def setUp(self):
+        self.logger = mock.Mock(spec=DataLogger)
+        self.dbc_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dbc_dir, True)
+        self.test_dbc = os.path.join(self.dbc_dir, 'test.dbc')
+        with open(self.test_dbc, 'w') as dbc_file:
+            dbc_file.write(TEST_DBC)
+
+    def assert_same_decoding(self, device: CANDevice, frames_per_message: int = 50):
+        generator = random.Random(0)
+        for frame_id, plan in device.decode_plans.items():
+            for _ in range(frames_per_message):
+                data = bytes(generator.getrandbits(8) for _ in range(plan.message.length))
+                if plan.message.is_multiplexed():
+                    data = bytes([generator.randrange(2)]) + data[1:]
+                expected = device.db.decode_message(frame_id, data)
+                decoded = plan.decode(data)
+
+                self.assertEqual(decoded.keys(), expected.keys(), f'{plan.message.name}: {data.hex()}')
+                for signal_name, value in expected.items():
+                    if isinstance(value, (int, float)):
+                        self.assertAlmostEqual(decoded[signal_name], value, msg=f'{signal_name}: {data.hex()}')
+                    else:
+                        self.assertEqual(decoded[signal_name], value, f'{signal_name}: {data.hex()}')
+
+
+    def test_shipped_dbcs_match_cantools(self):
+        for dbc_file in self.DBC_FILES:
+            with self.subTest(dbc_file=dbc_file):
+                self.assert_same_decoding(TestCANDevice(os.path.join('Backend/candatabase', dbc_file), self.logger))
+
+
+    def test_choices_and_multiplexing_match_cantools(self):
+        device = TestCANDevice(self.test_dbc, self.logger)
+        self.assert_same_decoding(device)
+
+        self.assertEqual(device.decode_plans[256].decode(bytes([2, 0x90, 0x01, 1]))['Mode'], 'Charge')
+        self.assertEqual(device.decode_plans[512].decode(bytes([1, 0xE8, 0x03, 0, 0, 0, 0, 0])), {'Index': 1, 'Cell_1': 1.0})
+        with self.assertRaises(cantools.database.DecodeError):
+            device.decode_plans[256].decode(bytes(2))
+
+
+    def test_update_batch_keeps_latest_values(self):
+        device = TestCANDevice(self.test_dbc, self.logger)
+        device.initialize(None)
+        device.update_batch([
+            can.Message(arbitration_id=256, data=bytes([1, 0x90, 0x01, 0]), is_extended_id=False),
+            can.Message(arbitration_id=0x7FF, data=bytes(8), is_extended_id=False),      # Not in the DBC
+            can.Message(arbitration_id=256, data=bytes([2, 0x90, 0x01, 1]), is_extended_id=False),
+            can.Message(arbitration_id=512, data=bytes([0, 0xE8, 0x03, 0, 0, 0, 0, 0]), is_extended_id=False),
+        ])
+
+        self.assertEqual(device.get_data('Mode'), 'Charge')
+        self.assertEqual(device.get_data('Enabled'), 'Yes')
+        self.assertAlmostEqual(device.get_data('Temperature'), 0)
+        self.assertAlmostEqual(device.get_data('Cell_0'), 1.0)
+        self.assertIsNone(device.get_data('Cell_1'))
+        self.assertEqual(device.pop_changed_values().keys(), {'Mode', 'Temperature', 'Enabled', 'Index', 'Cell_0'})
+
+
+if __name__ == '__main__':
+    unittest.main()
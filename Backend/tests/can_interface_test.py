@@ -0,0 +1,225 @@
+import itertools
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+import can
+from Backend.data_logger import DataLogger
+from Backend.device import CANDevice
+from Backend.interface import CANFrameRingBuffer, CANInterface
+from Backend.value_monitor import ParameterMonitor
+
+
+def make_frame(frame_id: int, data: bytes = bytes(8), extended: bool = False) -> can.Message:
+    return can.Message(arbitration_id=frame_id, data=data, is_extended_id=extended)
+
+
+class CANFrameRingBufferTest(unittest.TestCase):
+
+    def test_drains_in_order_across_wrap_around(self):
+        buffer = CANFrameRingBuffer(4)
+        frame_ids = itertools.count()
+
+        # Keep the buffer partly full, so the read & write positions wrap around the slots several times
+        expected = []
+        for _ in range(5):
+            for _ in range(3):
+                frame = make_frame(next(frame_ids))
+                self.assertTrue(buffer.push(frame))
+                expected.append(frame)
+            drained = buffer.drain(3)
+            self.assertEqual(drained, expected[:3])
+            del expected[:3]
+
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.drain(10), [])
+        self.assertEqual(buffer.overflows, 0)
+        self.assertEqual(buffer.peak, 3)
+
+
+    def test_drops_new_frames_when_full(self):
+        buffer = CANFrameRingBuffer(3)
+        frames = [make_frame(frame_id) for frame_id in range(5)]
+        results = [buffer.push(frame) for frame in frames]
+
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(buffer.overflows, 2)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.peak, 3)
+
+        # The oldest frames are kept, and there is room again once they are drained
+        self.assertEqual(buffer.drain(10), frames[:3])
+        self.assertTrue(buffer.push(frames[3]))
+        self.assertEqual(buffer.drain(10), [frames[3]])
+
+
+    def test_drain_is_limited(self):
+        buffer = CANFrameRingBuffer(8)
+        frames = [make_frame(frame_id) for frame_id in range(5)]
+        for frame in frames:
+            buffer.push(frame)
+
+        self.assertEqual(buffer.drain(2), frames[:2])
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.drain(0), [])
+        self.assertEqual(buffer.drain(5), frames[2:])
+
+
+    def test_invalid_capacity_raises(self):
+        with self.assertRaises(ValueError):
+            CANFrameRingBuffer(0)
+
+
+class TestCANDevice(CANDevice):
+    def __init__(self, name: str, dbc_filename: str, logger: DataLogger):
+        super().__init__(name, f'Backend/candatabase/{dbc_filename}', logger)
+
+
+class CANInterfaceTest(unittest.TestCase):
+    '''Runs a CANInterface on a virtual bus, in place of SocketCAN.'''
+
+    channel_ids = itertools.count()
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.logger = DataLogger('can_interface_test', baseDirectoryPath=self.log_dir,
+                                 logLevel=DataLogger.LogSeverity.CRITICAL)
+        self.channel = f'can_interface_test_{next(self.channel_ids)}'
+        patcher = mock.patch('Backend.interface.can.interface.Bus',
+                             side_effect=lambda channel, interface: can.Bus(channel, interface='virtual'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.sender = can.Bus(self.channel, interface='virtual')
+        self.bms = TestCANDevice('BMS', 'Orion_BMS2_CANBUSv7.dbc', self.logger)
+        self.inverter = TestCANDevice('Inverter', 'DTI_HV_500_CANBUSv3.dbc', self.logger)
+
+    def tearDown(self):
+        self.sender.shutdown()
+        self.logger.close()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def make_interface(self, devices, **kwargs) -> CANInterface:
+        interface = CANInterface('TestCAN', self.channel, devices, self.logger, ParameterMonitor({}, self.logger), **kwargs)
+        interface.initialize()
+        self.addCleanup(interface.close_connection)
+        return interface
+
+    def send(self, interface: CANInterface, frames):
+        '''Sends the frames on the bus and waits for the reader thread to buffer the ones that pass the filters.'''
+        before = len(interface.rx_buffer)
+        for frame in frames:
+            self.sender.send(frame)
+        deadline = time.monotonic() + 1
+        while time.monotonic() < deadline and len(interface.rx_buffer) == before:
+            time.sleep(0.01)
+        time.sleep(0.05)   # Let the rest of the frames arrive
+
+    def shared_frame_ids(self) -> set:
+        return set(self.bms.decode_plans) & set(self.inverter.decode_plans)
+
+    def frame_for(self, device: CANDevice, index: int = 0) -> can.Message:
+        message = device.db.messages[index]
+        return make_frame(message.frame_id, bytes(message.length), message.is_extended_frame)
+
+
+    def test_routing_table_covers_every_frame_id(self):
+        interface = self.make_interface([self.bms, self.inverter])
+
+        for device in (self.bms, self.inverter):
+            for message in device.db.messages:
+                if message.frame_id not in self.shared_frame_ids():
+                    self.assertIs(interface.routing_table[message.frame_id][0], device)
+        self.assertEqual(set(interface.routing_table), set(self.bms.decode_plans) | set(self.inverter.decode_plans))
+
+
+    def test_shared_frame_ids_go_to_the_first_device(self):
+        # The Orion BMS & the DTI inverter both define 0xA3A
+        self.assertEqual(self.shared_frame_ids(), {0xA3A})
+
+        interface = self.make_interface([self.bms, self.inverter])
+        self.assertIs(interface.routing_table[0xA3A][0], self.bms)
+        interface.close_connection()
+
+        interface = self.make_interface([self.inverter, self.bms])
+        self.assertIs(interface.routing_table[0xA3A][0], self.inverter)
+
+
+    def test_frames_are_routed_to_their_device(self):
+        interface = self.make_interface([self.bms, self.inverter])
+        bms_frame, inverter_frame = self.frame_for(self.bms), self.frame_for(self.inverter)
+
+        with mock.patch.object(self.bms, 'update_batch') as bms_update, \
+             mock.patch.object(self.inverter, 'update_batch') as inverter_update:
+            self.send(interface, [bms_frame, inverter_frame, bms_frame])
+            interface.update()
+
+        self.assertEqual([msg.arbitration_id for msg in bms_update.call_args.args[0]], [bms_frame.arbitration_id] * 2)
+        self.assertEqual([msg.arbitration_id for msg in inverter_update.call_args.args[0]], [inverter_frame.arbitration_id])
+        self.assertEqual(interface.rx_stats['frames_total'], 3)
+
+
+    def test_unknown_frames_are_counted_once_per_id(self):
+        interface = self.make_interface([self.bms], sniff_unknowns=True)
+        unknown_id = max(interface.routing_table) + 1
+        self.assertNotIn(unknown_id, interface.routing_table)
+
+        with mock.patch.object(interface, '_log') as log:
+            self.send(interface, [make_frame(unknown_id, extended=unknown_id > 0x7FF)] * 3)
+            interface.update()
+
+        self.assertEqual(interface.unknown_frame_ids, {unknown_id: 3})
+        self.assertEqual(interface.rx_stats['unknown_frames'], 3)
+        warnings = [call for call in log.call_args_list if call.args[0].startswith('No device found')]
+        self.assertEqual(len(warnings), 1)
+
+
+    def test_filters_drop_unused_frames(self):
+        interface = self.make_interface([self.bms])
+        unknown_id = max(interface.routing_table) + 1
+        extended = unknown_id > 0x7FF
+
+        self.assertEqual({f['can_id'] for f in interface.can_filters}, set(interface.routing_table))
+        self.send(interface, [make_frame(unknown_id, extended=extended), self.frame_for(self.bms)])
+        interface.update()
+        self.assertEqual(interface.rx_stats['frames_total'], 1)
+        self.assertEqual(interface.unknown_frame_ids, {})
+
+        interface.set_sniff_unknowns(True)
+        self.send(interface, [make_frame(unknown_id, extended=extended)])
+        interface.update()
+        self.assertEqual(interface.unknown_frame_ids, {unknown_id: 1})
+
+
+    def test_update_is_limited_to_max_frames(self):
+        interface = self.make_interface([self.bms], max_frames_per_update=2)
+        self.send(interface, [self.frame_for(self.bms)] * 5)
+
+        interface.update()
+        self.assertEqual(interface.rx_stats['frames_last_update'], 2)
+        self.assertEqual(interface.rx_stats['budget_exhausted'], 1)
+        interface.update()
+        interface.update()
+        self.assertEqual(interface.rx_stats['frames_total'], 5)
+        self.assertEqual(interface.rx_stats['frames_peak_update'], 2)
+
+
+    def test_only_changed_values_are_monitored(self):
+        interface = self.make_interface([self.bms])
+        frame = self.frame_for(self.bms)
+
+        with mock.patch.object(interface.parameter_monitor, 'check_values') as check_values:
+            self.send(interface, [frame])
+            interface.update()
+            self.assertEqual(set(check_values.call_args.args[0]),
+                             {signal.name for signal in self.bms.decode_plans[frame.arbitration_id].message.signals})
+
+            # The same frame again doesn't change any values
+            self.send(interface, [frame])
+            interface.update()
+            self.assertEqual(check_values.call_args.args[0], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from Backend.data_logger import DataLogger
+from Backend.telemetry_format import SegmentedTelemetryWriter, TelemetryFormat
+
+
+class DataLoggerTestCase(unittest.TestCase):
+    '''Makes DataLoggers in a temporary directory, and closes them after the test.'''
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_dir, True)
+
+    def make_logger(self, **kwargs) -> DataLogger:
+        kwargs.setdefault('logLevel', DataLogger.LogSeverity.DEBUG)
+        logger = DataLogger('data_logger_test', baseDirectoryPath=self.log_dir, **kwargs)
+        self.addCleanup(logger.close)
+        return logger
+
+
+class TelemetryWriterTest(DataLoggerTestCase):
+
+    def test_rows_are_written_in_order(self):
+        for telemetry_format in TelemetryFormat:
+            with self.subTest(telemetry_format=telemetry_format):
+                logger = self.make_logger(telemetryFormat=telemetry_format, telemetryFlushRows=7)
+                rows = [(1000.0 + i, 'OrionBMS2', 'Pack_SOC', float(i), '%') for i in range(20)]
+                for time, device_name, param_name, value, units in rows:
+                    logger.writeTelemetry(device_name, param_name, value, units, timestamp=time)
+
+                # Rows are only buffered until the writer thread is flushed
+                logger.flushTelemetry()
+                self.assertEqual([row[0] for row in logger.iterTelemetry()], [row[0] for row in rows])
+                stats = logger.getTelemetryStats()
+                self.assertEqual((stats['queued'], stats['written'], stats['dropped']), (20, 20, 0))
+
+
+    def test_close_writes_queued_rows(self):
+        logger = self.make_logger(telemetryFlushRows=1000, telemetryFlushInterval=60)
+        for i in range(5):
+            logger.writeTelemetry('OrionBMS2', 'Pack_SOC', i, '%')
+        logger.close()
+
+        with open(logger.telemetryPath) as file:
+            self.assertEqual(len(file.readlines()), 6)
+
+
+    def test_rows_are_dropped_when_the_queue_is_full(self):
+        writing = threading.Event()
+        release = threading.Event()
+        original_writerows = SegmentedTelemetryWriter.writerows
+
+        def slow_writerows(writer, rows):
+            writing.set()
+            release.wait()
+            original_writerows(writer, rows)
+
+        with mock.patch.object(SegmentedTelemetryWriter, 'writerows', slow_writerows):
+            logger = self.make_logger(telemetryQueueSize=1, telemetryFlushRows=1)
+            logger.writeTelemetry('OrionBMS2', 'Pack_SOC', 0, '%')
+            writing.wait(1)     # The writer thread is stuck on the first row
+
+            logger.writeTelemetry('OrionBMS2', 'Pack_SOC', 1, '%')     # Fills the queue
+            logger.writeTelemetry('OrionBMS2', 'Pack_SOC', 2, '%')     # Dropped, without waiting
+            release.set()
+            logger.flushTelemetry()
+
+        stats = logger.getTelemetryStats()
+        self.assertEqual((stats['queued'], stats['dropped'], stats['written']), (2, 1, 2))
+        self.assertEqual([row[3] for row in logger.iterTelemetry()], ['0', '1'])
+
+
+class WriteLogTest(DataLoggerTestCase):
+
+    class CountingArg:
+        '''A log argument which counts how many times it is formatted.'''
+
+        def __init__(self):
+            self.formatted = 0
+
+        def __str__(self):
+            self.formatted += 1
+            return 'value'
+
+    def setUp(self):
+        super().setUp()
+        self.now = 1000.0
+        patcher = mock.patch('Backend.data_logger.time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+    def test_repeats_are_suppressed_until_they_expire(self):
+        logger = self.make_logger()
+        before = logger.getLogStats()
+
+        logger.writeLog('Test', 'Repeated message')
+        self.now += DataLogger.TIMEOUT_THRESH / 2
+        logger.writeLog('Test', 'Repeated message')
+        self.now += DataLogger.TIMEOUT_THRESH
+        logger.writeLog('Test', 'Repeated message')
+
+        stats = logger.getLogStats()
+        self.assertEqual(stats['emitted'] - before['emitted'], 2)
+        self.assertEqual(stats['suppressed'] - before['suppressed'], 1)
+
+
+    def test_arguments_are_part_of_the_key(self):
+        logger = self.make_logger()
+        before = logger.getLogStats()
+
+        logger.writeLog('Test', 'Message %s', DataLogger.LogSeverity.INFO, 1)
+        logger.writeLog('Test', 'Message %s', DataLogger.LogSeverity.INFO, 2)
+        logger.writeLog('Other', 'Message %s', DataLogger.LogSeverity.INFO, 1)
+        logger.writeLog('Test', 'Message %s', DataLogger.LogSeverity.INFO, [1])   # Unhashable
+        logger.writeLog('Test', 'Message %s', DataLogger.LogSeverity.INFO, [1])
+
+        stats = logger.getLogStats()
+        self.assertEqual(stats['emitted'] - before['emitted'], 4)
+        self.assertEqual(stats['suppressed'] - before['suppressed'], 1)
+
+
+    def test_cache_is_bounded(self):
+        logger = self.make_logger(logDedupeCacheSize=4)
+
+        for i in range(10):
+            logger.writeLog('Test', 'Message %s', DataLogger.LogSeverity.INFO, i)
+        self.assertEqual(logger.getLogStats()['cache_size'], 4)
+        self.assertGreaterEqual(logger.getLogStats()['evicted'], 6)
+
+        # Expired messages are dropped from the cache as new ones come in
+        self.now += DataLogger.TIMEOUT_THRESH + 1
+        logger.writeLog('Test', 'New message')
+        self.assertEqual(logger.getLogStats()['cache_size'], 1)
+
+
+    def test_messages_below_the_level_are_not_formatted(self):
+        logger = self.make_logger(logLevel=DataLogger.LogSeverity.INFO)
+        arg = self.CountingArg()
+        before = logger.getLogStats()
+
+        logger.writeLog('Test', 'Debug %s', DataLogger.LogSeverity.DEBUG, arg)
+        self.assertFalse(logger.isLogEnabled(DataLogger.LogSeverity.DEBUG))
+        self.assertEqual(logger.getLogStats(), before)
+
+        # Suppressed repeats aren't formatted either
+        logger.writeLog('Test', 'Info %s', DataLogger.LogSeverity.INFO, arg)
+        logger.writeLog('Test', 'Info %s', DataLogger.LogSeverity.INFO, arg)
+        logger.close()
+        self.assertEqual(arg.formatted, 1)
+
+        with open(logger.debugLogPath) as file:
+            log = file.read()
+        self.assertIn('Info value', log)
+        self.assertNotIn('Debug', log)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from Backend.DDS_IO import DDS_IO
+from Backend.data_logger import DataLogger
+from Backend.device import CANDevice, Device
+from Backend.value_monitor import ParameterMonitor
+
+
+class FakeDevice(Device):
+
+    def initialize(self, bus):
+        self.status = self.DeviceStatus.ACTIVE
+
+    def update(self):
+        pass
+
+    def _data_collection_worker(self):
+        pass
+
+
+class TestCANDevice(CANDevice):
+    def __init__(self, name: str, logger: DataLogger):
+        super().__init__(name, 'Backend/candatabase/Orion_BMS2_CANBUSv7.dbc', logger)
+
+
+class DDS_IOTestCase(unittest.TestCase):
+    '''Makes a DDS_IO with fake devices, without starting any interfaces (or the PCC client).'''
+
+    def setUp(self):
+        self.logger = mock.Mock(spec=DataLogger)
+        self.bms = TestCANDevice('BMS', self.logger)
+        self.bms.initialize(None)
+        self.adc = FakeDevice('ADC', self.logger)
+        self.adc.initialize(None)
+        self.imu = FakeDevice('IMU', self.logger)
+
+        self.io = DDS_IO.__new__(DDS_IO)
+        self.io.log = self.logger
+        self.io.parameter_monitor = ParameterMonitor({}, self.logger)
+        self.io.engine = None
+        self.io.interfaces = {}
+        self.io.devices = {}
+        self.io.device_params = {}
+        self.add_interface('CANInterface', [self.bms])
+        self.add_interface('I2CInterface', [self.adc, self.imu])
+
+    def add_interface(self, name: str, devices: list):
+        interface = SimpleNamespace(name=name, devices={device.name: device for device in devices})
+        self.io.interfaces[name] = interface
+        self.io._DDS_IO__index_devices(interface)
+
+
+class DeviceLookupTest(DDS_IOTestCase):
+
+    def test_get_device_data(self):
+        self.bms._update_cache({'Pack_SOC': 80, 'Pack_Current': None})
+
+        self.assertEqual(self.io.get_device_data('BMS', 'Pack_SOC'), 80)
+        self.assertEqual(self.io.get_device_data('BMS', 'Pack_Current'), 'NO_DATA')
+        self.assertEqual(self.io.get_device_data('BMS', 'Not_A_Parameter'), 'NO_DATA')
+        self.assertEqual(self.io.get_device_data('IMU', 'MPU1'), 'NO_INIT')
+        self.assertEqual(self.io.get_device_data('Charger', 'Output_Voltage'), 'UKNDEV')
+
+        self.adc.status = Device.DeviceStatus.ERROR
+        self.assertEqual(self.io.get_device_data('ADC', 'Pressure'), 'ERROR')
+
+
+    def test_duplicate_device_names_keep_the_first_device(self):
+        self.add_interface('OtherInterface', [FakeDevice('ADC', self.logger)])
+        self.assertIs(self.io.devices['ADC'], self.adc)
+
+
+    def test_device_parameters(self):
+        # CAN devices know their parameters from their database, before they have any data
+        self.assertEqual(self.io.get_device_parameters('BMS'), self.bms.get_all_param_names())
+        self.assertIn('Pack_SOC', self.io.get_device_parameters('BMS'))
+
+        # Other devices only know the parameters they have data for, so they're asked every time
+        self.assertEqual(self.io.get_device_parameters('ADC'), [])
+        self.adc._update_cache({'Pressure': 1.5})
+        self.assertEqual(self.io.get_device_parameters('ADC'), ['Pressure'])
+        self.assertNotIn('ADC', self.io.device_params)
+
+        self.assertEqual(self.io.get_device_parameters('Charger'), [])
+
+
+class SnapshotTest(DDS_IOTestCase):
+
+    KEYS = [('BMS', 'Pack_SOC'), ('BMS', 'Pack_Current'), ('ADC', 'Pressure'), ('IMU', 'MPU1'), ('Charger', 'Output_Voltage')]
+
+
+    def test_snapshot_matches_get_device_data(self):
+        self.bms._update_cache({'Pack_SOC': 80, 'Pack_Current': None})
+        self.adc._update_cache({'Pressure': 1.5})
+        snapshot = self.io.snapshot(self.KEYS)
+
+        for device_key, param_key in self.KEYS:
+            self.assertEqual(snapshot[device_key, param_key], self.io.get_device_data(device_key, param_key))
+        self.assertEqual(len(snapshot), len(self.KEYS))
+        self.assertEqual(snapshot.device('BMS'), {'Pack_SOC': 80, 'Pack_Current': 'NO_DATA'})
+        self.assertEqual(snapshot.get('ADC', 'Temperature'), 'NO_DATA')
+        with self.assertRaises(TypeError):
+            snapshot.values['BMS', 'Pack_SOC'] = 0
+
+
+    def test_snapshot_is_not_changed_by_updates(self):
+        self.bms._update_cache({'Pack_SOC': 80, 'Pack_Current': 10})
+        snapshot = self.io.snapshot(self.KEYS[:2])
+
+        self.bms._update_cache({'Pack_SOC': 79, 'Pack_Current': 12})
+        self.assertEqual(dict(snapshot.values), {('BMS', 'Pack_SOC'): 80, ('BMS', 'Pack_Current'): 10})
+
+
+    def test_snapshot_all(self):
+        self.bms._update_cache({'Pack_SOC': 80})
+        self.adc._update_cache({'Pressure': 1.5})
+        self.imu._update_cache({'MPU1': (0, 0, 1)})
+        snapshot = self.io.snapshot_all()
+
+        self.assertEqual(snapshot.device('BMS'), {'Pack_SOC': 80})
+        self.assertEqual(snapshot.device('ADC'), {'Pressure': 1.5})
+        # Inactive devices report their status for every parameter they have
+        self.assertEqual(snapshot.device('IMU'), {'MPU1': 'NO_INIT'})
+
+
+class SubscribeTest(DDS_IOTestCase):
+
+    def test_subscriber_gets_current_values_then_changes(self):
+        self.bms._update_cache({'Pack_SOC': 80})
+        callback = mock.Mock()
+        self.io.subscribe([('BMS', 'Pack_SOC'), ('ADC', 'Pressure')], callback)
+        callback.assert_called_once_with({('BMS', 'Pack_SOC'): 80, ('ADC', 'Pressure'): 'NO_DATA'})
+
+        self.bms._update_cache({'Pack_SOC': 79, 'Pack_Current': 10})
+        self.adc._update_cache({'Pressure': 1.5})
+        self.bms.publish_changes()
+        self.adc.publish_changes()
+        callback.assert_any_call({('BMS', 'Pack_SOC'): 79})
+        callback.assert_any_call({('ADC', 'Pressure'): 1.5})
+        self.assertEqual(callback.call_count, 3)
+
+
+    def test_changes_of_inactive_devices_are_sentinels(self):
+        callback = mock.Mock()
+        self.io.subscribe([('ADC', 'Pressure')], callback)
+
+        self.adc._update_cache({'Pressure': 1.5})
+        self.adc.status = Device.DeviceStatus.ERROR
+        self.adc.publish_changes()
+        callback.assert_called_with({('ADC', 'Pressure'): 'ERROR'})
+
+
+    def test_unsubscribe(self):
+        callback = mock.Mock()
+        subscriptions = self.io.subscribe([('BMS', 'Pack_SOC')], callback)
+        self.io.unsubscribe(subscriptions)
+
+        self.bms._update_cache({'Pack_SOC': 79})
+        self.bms.publish_changes()
+        self.assertEqual(callback.call_count, 1)
+
+
+    def test_unknown_keys_are_warned_about(self):
+        # The ADC has no database, so its parameters can't be checked until it has data
+        with mock.patch.object(self.io, '_DDS_IO__log') as log:
+            self.io.subscribe([('Charger', 'Output_Voltage'), ('BMS', 'Not_A_Parameter'), ('ADC', 'Pressure')], mock.Mock(),
+                              caller='Test')
+
+        warnings = [call for call in log.call_args_list if call.args[1] is DataLogger.LogSeverity.WARNING]
+        self.assertEqual(len(warnings), 2)
+        self.assertIn('Charger', warnings[0].args)
+        self.assertIn(['Not_A_Parameter'], warnings[1].args)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import threading
+import unittest
+from unittest import mock
+from Backend.data_logger import DataLogger
+from Backend.device import Device
+
+
+class FakeDevice(Device):
+
+    def initialize(self, bus):
+        self.status = self.DeviceStatus.ACTIVE
+
+    def update(self):
+        pass
+
+    def _data_collection_worker(self):
+        pass
+
+
+class DeviceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = mock.Mock(spec=DataLogger)
+        self.device = FakeDevice('Fake', self.logger)
+        self.device.initialize(None)
+
+
+class ChangedValuesTest(DeviceTestCase):
+
+    def test_only_changed_values_are_returned(self):
+        self.device._update_cache({'Pack_SOC': 80, 'Pack_Current': 10})
+        self.assertEqual(self.device.pop_changed_values(), {'Pack_SOC': 80, 'Pack_Current': 10})
+        self.assertEqual(self.device.pop_changed_values(), {})
+
+        self.device._update_cache({'Pack_SOC': 80, 'Pack_Current': 12})
+        self.device._update_cache({'Pack_Current': 14})
+        self.assertEqual(self.device.pop_changed_values(), {'Pack_Current': 14})
+
+
+    def test_mark_all_changed(self):
+        self.device._update_cache({'Pack_SOC': 80, 'Pack_Current': 10})
+        self.device.pop_changed_values()
+
+        self.device.mark_all_changed()
+        self.assertEqual(self.device.pop_changed_values(), {'Pack_SOC': 80, 'Pack_Current': 10})
+
+
+    def test_cache_timeout_changes_values_to_none(self):
+        self.device._update_cache({'Pack_SOC': 80})
+        self.device.pop_changed_values()
+
+        self.device.last_cache_update -= self.device.CACHE_TIMEOUT_THRESHOLD + 1
+        self.device._check_cache_timeout()
+        self.assertEqual(self.device.pop_changed_values(), {'Pack_SOC': None})
+        self.assertIsNone(self.device.get_data('Pack_SOC'))
+
+
+class SubscriptionTest(DeviceTestCase):
+
+    def test_changes_are_coalesced_until_published(self):
+        callback = mock.Mock()
+        self.device.subscribe(callback)
+
+        self.device._update_cache({'Pack_SOC': 80, 'Pack_Current': 10})
+        self.device._update_cache({'Pack_SOC': 79, 'Pack_Current': 10})
+        callback.assert_not_called()
+
+        self.device.publish_changes()
+        callback.assert_called_once_with('Fake', {'Pack_SOC': 79, 'Pack_Current': 10})
+        self.device.publish_changes()
+        self.assertEqual(callback.call_count, 1)
+
+
+    def test_subscriptions_only_get_their_parameters(self):
+        soc_callback, current_callback = mock.Mock(), mock.Mock()
+        self.device.subscribe(soc_callback, ['Pack_SOC'])
+        self.device.subscribe(current_callback, ['Pack_Current'])
+
+        self.device._update_cache({'Pack_SOC': 80, 'Pack_Voltage': 400})
+        self.device.publish_changes()
+        soc_callback.assert_called_once_with('Fake', {'Pack_SOC': 80})
+        current_callback.assert_not_called()
+
+
+    def test_unsubscribe(self):
+        callback = mock.Mock()
+        subscription = self.device.subscribe(callback)
+        self.device.unsubscribe(subscription)
+        self.device.unsubscribe(subscription)
+
+        self.device._update_cache({'Pack_SOC': 80})
+        self.device.publish_changes()
+        callback.assert_not_called()
+
+
+    def test_failing_subscriber_does_not_stop_the_others(self):
+        callback = mock.Mock()
+        self.device.subscribe(mock.Mock(side_effect=RuntimeError('UI went away')))
+        self.device.subscribe(callback)
+
+        self.device._update_cache({'Pack_SOC': 80})
+        self.device.publish_changes()
+        callback.assert_called_once_with('Fake', {'Pack_SOC': 80})
+        self.assertTrue(self.logger.writeLog.called)
+
+
+class CacheTest(DeviceTestCase):
+
+    def test_updates_replace_the_cache(self):
+        self.device._update_cache({'Pack_SOC': 80, 'Pack_Current': 10})
+        old_cache = self.device.cached_values
+        old_snapshot = self.device.snapshot()
+
+        self.device._update_cache({'Pack_SOC': 79})
+        # Anything read before the update is left alone
+        self.assertEqual(old_cache, {'Pack_SOC': 80, 'Pack_Current': 10})
+        self.assertEqual(old_snapshot, {'Pack_SOC': 80, 'Pack_Current': 10})
+        self.assertEqual(self.device.snapshot(['Pack_SOC', 'Pack_Voltage']), {'Pack_SOC': 79, 'Pack_Voltage': None})
+
+
+    def test_unchanged_values_keep_the_cache(self):
+        self.device._update_cache({'Pack_SOC': 80})
+        cache = self.device.cached_values
+        self.device._update_cache({'Pack_SOC': 80})
+        self.assertIs(self.device.cached_values, cache)
+
+
+    def test_snapshots_are_consistent_while_writing(self):
+        # Every update writes the same value to both parameters, so a snapshot must never see them differ
+        stop = threading.Event()
+        torn = []
+
+        def read():
+            while not stop.is_set():
+                snapshot = self.device.snapshot(['A', 'B'])
+                if snapshot['A'] != snapshot['B']:
+                    torn.append(snapshot)
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+        self.device._update_cache({'A': 0, 'B': 0})
+        for i in range(1, 20000):
+            self.device._update_cache({'A': i, 'B': i})
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(torn, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
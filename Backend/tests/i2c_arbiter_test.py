@@ -0,0 +1,188 @@
+import threading
+import time
+import unittest
+from typing import Dict, List
+from Backend.i2c_arbiter import I2CBusArbiter
+
+
+class FakeSMBus:
+    '''
+    Records every call. Block reads return the bytes of `registers` from the requested register onwards,
+    or the device's own contents for a register in `word_registers` (Ex. the ADS1015's 16-bit pointer registers).
+    '''
+
+    def __init__(self):
+        self.calls: List[tuple] = []
+        self.registers = list(range(256))
+        self.word_registers: Dict[int, List[int]] = {}
+        self.gate = threading.Event()   # Calls wait for this, so transactions can be queued up behind them
+        self.gate.set()
+        self.active = 0
+        self.overlaps = 0
+        self.closed = False
+
+    def read_i2c_block_data(self, i2c_addr: int, register: int, length: int, force=None) -> List[int]:
+        self.active += 1
+        if self.active > 1:
+            self.overlaps += 1
+        self.calls.append(('read_i2c_block_data', i2c_addr, register, length))
+        self.gate.wait()
+        self.active -= 1
+        if register in self.word_registers:
+            return self.word_registers[register][:length]
+        return self.registers[register:register + length]
+
+    def write_byte_data(self, i2c_addr: int, register: int, value: int, force=None):
+        self.calls.append(('write_byte_data', i2c_addr, register, value))
+        if value == 0xFF:
+            raise OSError('Remote I/O error')
+
+    def close(self):
+        self.closed = True
+
+
+class I2CBusArbiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = FakeSMBus()
+        self.arbiter = I2CBusArbiter(self.bus, 'TestBus')
+        self.addCleanup(self.arbiter.close)
+
+    def hold_bus(self):
+        '''Starts a read that blocks the bus thread until `self.bus.gate` is set.'''
+        self.bus.gate.clear()
+        thread = threading.Thread(target=self.arbiter.read_i2c_block_data, args=(0x10, 0, 1))
+        thread.start()
+        while not self.bus.calls:
+            time.sleep(0.001)
+        self.arbiter.queue_peak = 0
+        return thread
+
+    def wait_for_queue(self, length: int):
+        '''Waits until `length` transactions are queued behind the held read.'''
+        while self.arbiter.queue_peak < length:
+            time.sleep(0.001)
+
+    def call_in_thread(self, results: dict, key, func, *args, priority: int = None) -> threading.Thread:
+        def run():
+            if priority is not None:
+                self.arbiter.set_thread_priority(priority)
+            results[key] = func(*args)
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+
+    def test_plain_block_reads_are_never_merged(self):
+        # ADS1015: the conversion (0x00) & config (0x01) registers are 16 bits each, not consecutive bytes
+        self.bus.word_registers = {0x00: [0x12, 0x34], 0x01: [0x85, 0x83]}
+        holder = self.hold_bus()
+        results = {}
+        threads = [self.call_in_thread(results, register, self.arbiter.read_i2c_block_data, 0x48, register, 2)
+                   for register in (0x00, 0x01)]
+        self.wait_for_queue(2)
+        self.bus.gate.set()
+        for thread in threads + [holder]:
+            thread.join()
+
+        self.assertEqual(results, {0x00: [0x12, 0x34], 0x01: [0x85, 0x83]})
+        self.assertIn(('read_i2c_block_data', 0x48, 0x00, 2), self.bus.calls)
+        self.assertIn(('read_i2c_block_data', 0x48, 0x01, 2), self.bus.calls)
+        self.assertEqual(self.arbiter.get_stats()['0x48']['merged'], 0)
+
+
+    def test_read_blocks_merges_adjacent_blocks(self):
+        # MPU6050: accel (0x3B-0x40) & gyro (0x43-0x48), with the temperature registers between them
+        accel, gyro = self.arbiter.read_blocks(0x69, [(0x3B, 6), (0x43, 6)])
+
+        self.assertEqual(accel, list(range(0x3B, 0x41)))
+        self.assertEqual(gyro, list(range(0x43, 0x49)))
+        self.assertEqual(self.bus.calls, [('read_i2c_block_data', 0x69, 0x3B, 14)])
+        stats = self.arbiter.get_stats()['0x69']
+        self.assertEqual((stats['transactions'], stats['merged']), (2, 1))
+
+
+    def test_read_blocks_splits_distant_and_long_blocks(self):
+        blocks = [(0x43, 6), (0x10, 2), (0x3B, 6), (0x60, 30), (0x7E, 4)]
+        results = self.arbiter.read_blocks(0x69, blocks)
+
+        for (register, length), result in zip(blocks, results):
+            self.assertEqual(result, list(range(register, register + length)))
+        # 0x10 is too far from 0x3B, and 0x60-0x81 would be longer than a block read can be
+        self.assertEqual(self.bus.calls, [
+            ('read_i2c_block_data', 0x69, 0x10, 2),
+            ('read_i2c_block_data', 0x69, 0x3B, 14),
+            ('read_i2c_block_data', 0x69, 0x60, 30),
+            ('read_i2c_block_data', 0x69, 0x7E, 4),
+        ])
+
+
+    def test_transactions_are_made_in_priority_order(self):
+        holder = self.hold_bus()
+        results = {}
+        threads = []
+        for priority, address in ((I2CBusArbiter.LOW_PRIORITY, 0x30), (I2CBusArbiter.NORMAL_PRIORITY, 0x20),
+                                  (I2CBusArbiter.HIGH_PRIORITY, 0x10)):
+            threads.append(self.call_in_thread(results, address, self.arbiter.read_i2c_block_data, address, 0, 1,
+                                               priority=priority))
+            self.wait_for_queue(len(threads))
+        self.bus.gate.set()
+        for thread in threads + [holder]:
+            thread.join()
+
+        self.assertEqual([call[1] for call in self.bus.calls[1:]], [0x10, 0x20, 0x30])
+        self.assertEqual(self.bus.overlaps, 0)
+
+
+    def test_errors_are_raised_to_the_caller(self):
+        self.arbiter.write_byte_data(0x48, 0x01, 0x00)
+        with self.assertRaises(OSError):
+            self.arbiter.write_byte_data(0x48, 0x01, 0xFF)
+        self.assertEqual(self.arbiter.get_stats()['0x48']['errors'], 1)
+
+
+    def test_timed_out_transactions_are_never_made(self):
+        holder = self.hold_bus()
+        self.arbiter.TRANSACTION_TIMEOUT = 0.05     # The held read is already waiting (with the normal timeout)
+
+        with self.assertRaises(TimeoutError):
+            self.arbiter.write_byte_data(0x48, 0x01, 0x00)
+        with self.assertRaises(TimeoutError):
+            self.arbiter.read_blocks(0x69, [(0x10, 2), (0x3B, 6)])
+        self.bus.gate.set()
+        holder.join()
+
+        # Once the bus is free, only the newer transactions are made
+        self.arbiter.write_byte_data(0x48, 0x01, 0x03)
+        self.assertEqual(self.bus.calls, [('read_i2c_block_data', 0x10, 0, 1), ('write_byte_data', 0x48, 0x01, 0x03)])
+
+
+    def test_close_fails_queued_transactions(self):
+        holder = self.hold_bus()
+        errors = []
+
+        def read():
+            try:
+                self.arbiter.read_i2c_block_data(0x48, 0, 2)
+            except OSError as e:
+                errors.append(e)
+        thread = threading.Thread(target=read)
+        thread.start()
+        self.wait_for_queue(1)
+
+        closer = threading.Thread(target=self.arbiter.close)
+        closer.start()
+        while not self.arbiter._I2CBusArbiter__closed:
+            time.sleep(0.001)
+        self.bus.gate.set()
+        for waiting in (thread, holder, closer):
+            waiting.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(self.bus.closed)
+        with self.assertRaises(OSError):
+            self.arbiter.read_i2c_block_data(0x48, 0, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import threading
+import unittest
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+from unittest import mock
+from Backend.data_logger import DataLogger
+from Backend.device import AcquisitionChannel, Device, I2CDevice
+from Backend.i2c_scheduler import I2CScheduler
+from Backend.resources.mpu6050 import MPU_6050_x3
+
+
+class FakeClock:
+    '''Stands in for the time module, so the scheduler runs on simulated time.'''
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeStopEvent:
+    '''Waiting advances the clock instead of sleeping. Set once the clock reaches `end`.'''
+
+    def __init__(self, clock: FakeClock, end: float):
+        self.clock = clock
+        self.end = end
+
+    def is_set(self) -> bool:
+        return self.clock.now >= self.end
+
+    def wait(self, timeout: float):
+        self.clock.now += timeout
+
+    def set(self):
+        self.end = self.clock.now
+
+    def clear(self):
+        pass
+
+
+class SyncThread:
+    '''Runs the scheduler loop on the test's thread as soon as it is started.'''
+
+    def __init__(self, target: Callable, name: str = None, daemon: bool = None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+    def join(self, timeout: float = None):
+        pass
+
+
+class FakeDevice(I2CDevice):
+
+    def __init__(self, name: str, logger, channels: Dict[str, float], read_time: float = 0.0):
+        super().__init__(name, logger)
+        self.channels = channels
+        self.read_time = read_time
+        self.reads: List[tuple] = []    # (channel name, time the read started)
+        self.clock: FakeClock = None
+        self.on_read: Callable[[str], None] = None
+
+    def initialize(self, bus):
+        self.status = self.DeviceStatus.ACTIVE
+
+    def get_acquisition_channels(self) -> List[AcquisitionChannel]:
+        return [AcquisitionChannel(name, rate, lambda name=name: self.read(name), self)
+                for name, rate in self.channels.items()]
+
+    def read(self, channel_name: str) -> dict:
+        self.reads.append((channel_name, self.clock.now))
+        if self.on_read is not None:
+            self.on_read(channel_name)
+        self.clock.now += self.read_time
+        return {channel_name: len(self.reads)}
+
+
+class I2CSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = mock.Mock(spec=DataLogger)
+        self.clock = FakeClock()
+        for target, new in (('Backend.i2c_scheduler.time', self.clock),
+                            ('Backend.i2c_scheduler.threading',
+                             SimpleNamespace(Thread=SyncThread, Event=threading.Event, Lock=threading.Lock,
+                                             current_thread=threading.current_thread))):
+            patcher = mock.patch(target, new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_device(self, name: str, channels: Dict[str, float], read_time: float = 0.0) -> FakeDevice:
+        device = FakeDevice(name, self.logger, channels, read_time)
+        device.clock = self.clock
+        device.initialize(None)
+        return device
+
+    def run_scheduler(self, devices: List[Device], duration: float, scheduler: I2CScheduler = None) -> I2CScheduler:
+        '''
+        Runs the scheduler until the simulated clock reaches `duration`.
+        Tests stop just short of a due time, so float rounding can't add or drop a read.
+        '''
+        scheduler = scheduler or I2CScheduler('TestScheduler', self.logger)
+        scheduler._I2CScheduler__stop = FakeStopEvent(self.clock, duration)
+        scheduler.start(devices)
+        return scheduler
+
+    def read_times(self, device: FakeDevice, channel_name: str) -> List[float]:
+        return [read_time for name, read_time in device.reads if name == channel_name]
+
+
+    def test_earliest_deadline_first(self):
+        device = self.make_device('ADC', {'Slow': 20, 'Fast': 100})
+        self.run_scheduler([device], 0.095)
+
+        # Every read is made when it is due, in order of due time
+        times = [read_time for name, read_time in device.reads]
+        self.assertEqual(times, sorted(times))
+        for expected, actual in zip([i * 0.01 for i in range(10)], self.read_times(device, 'Fast')):
+            self.assertAlmostEqual(expected, actual)
+        for expected, actual in zip([i * 0.05 for i in range(2)], self.read_times(device, 'Slow')):
+            self.assertAlmostEqual(expected, actual)
+        self.assertEqual(len(self.read_times(device, 'Fast')), 10)
+        self.assertEqual(len(self.read_times(device, 'Slow')), 2)
+
+
+    def test_rescheduling_does_not_drift(self):
+        # Each read takes 40% of the period, which would slow a "sleep one period after reading" loop to ~71 Hz
+        device = self.make_device('IMU', {'MPU1': 100}, read_time=0.004)
+        scheduler = self.run_scheduler([device], 1.0)
+
+        for i, read_time in enumerate(self.read_times(device, 'MPU1')):
+            self.assertAlmostEqual(read_time, i * 0.01)
+        stats = scheduler.get_stats()['IMU.MPU1']
+        self.assertAlmostEqual(stats['achieved_rate'], 100, delta=0.5)
+        self.assertEqual(stats['missed'], 0)
+
+
+    def test_missed_reads_are_skipped(self):
+        device = self.make_device('IMU', {'MPU1': 100})
+        # The third read stalls for 3.5 periods
+        device.on_read = lambda name: setattr(self.clock, 'now', self.clock.now + 0.035) if len(device.reads) == 3 else None
+        scheduler = self.run_scheduler([device], 0.095)
+
+        times = self.read_times(device, 'MPU1')
+        for expected, actual in zip([0, 0.01, 0.02, 0.06, 0.07, 0.08, 0.09], times):
+            self.assertAlmostEqual(expected, actual)
+        self.assertEqual(len(times), 7)
+        self.assertEqual(scheduler.get_stats()['IMU.MPU1']['missed'], 3)
+
+
+    def test_stats_are_cumulative_across_log_windows(self):
+        device = self.make_device('ADC', {'Pressure': 100})
+        scheduler = I2CScheduler('TestScheduler', self.logger)
+        scheduler.STATS_LOG_INTERVAL = 0.05
+        self.run_scheduler([device], 0.195, scheduler)
+
+        self.assertTrue(self.logger.writeLog.called)
+        stats = scheduler.get_stats()['ADC.Pressure']
+        self.assertAlmostEqual(stats['achieved_rate'], 100, delta=0.5)
+        self.assertEqual(scheduler.stats[('ADC', 'Pressure')].samples, 20)
+
+
+    def test_failed_read_sets_device_error(self):
+        device = self.make_device('ADC', {'Pressure': 100})
+
+        def fail(name):
+            raise OSError('Remote I/O error')
+        device.on_read = fail
+        scheduler = self.run_scheduler([device], 0.1)
+
+        # The device is skipped once it is in ERROR, until it is re-initialized
+        self.assertEqual(device.status, Device.DeviceStatus.ERROR)
+        self.assertEqual(len(device.reads), 1)
+        self.assertEqual(scheduler.get_stats()['ADC.Pressure']['errors'], 1)
+
+
+    def test_device_is_read_once_active(self):
+        late_device = self.make_device('IMU', {'MPU1': 100})
+        late_device.status = Device.DeviceStatus.ERROR
+        device = self.make_device('ADC', {'Pressure': 100})
+        device.on_read = lambda name: late_device.initialize(None) if self.clock.now >= 0.05 else None
+        self.run_scheduler([late_device, device], 0.1)
+
+        times = self.read_times(late_device, 'MPU1')
+        self.assertGreater(len(times), 0)
+        self.assertGreaterEqual(times[0], 0.05)
+        self.assertEqual(late_device.get_data('MPU1'), len(late_device.reads))
+
+
+    def test_mpu_channels_exist_before_initialization(self):
+        mpu = MPU_6050_x3('Accelerometers', self.logger)
+        channels = mpu.get_acquisition_channels()
+        self.assertEqual([channel.name for channel in channels], ['MPU1', 'MPU2', 'MPU3'])
+        self.assertTrue(all(channel.rate == MPU_6050_x3.SAMPLE_RATE for channel in channels))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import json
+import socket
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import can
+from Backend.PCCclient import AsyncPCCClient, PCCClient, HANDSHAKE_REQUEST, HANDSHAKE_RESPONSE
+from Backend.data_logger import DataLogger
+from Backend.device import CANDevice
+from Backend.interface import CANInterface, Interface
+from Backend.io_engine import AsyncIOEngine
+from Backend.value_monitor import ParameterMonitor
+
+
+def wait_for(condition, timeout: float = 2) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class FakeInterface:
+    '''Counts its updates, and which thread they were made on.'''
+
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.status = Interface.InterfaceStatus.ACTIVE
+        self.fail = fail
+        self.updates = 0
+        self.threads = set()
+
+    def update(self):
+        self.updates += 1
+        self.threads.add(threading.current_thread())
+        if self.fail:
+            raise OSError('Remote I/O error')
+
+
+class TestCANDevice(CANDevice):
+    def __init__(self, logger: DataLogger):
+        super().__init__('BMS', 'Backend/candatabase/Orion_BMS2_CANBUSv7.dbc', logger)
+
+
+class AsyncIOEngineTest(unittest.TestCase):
+
+    channel_ids = itertools.count()
+
+    def setUp(self):
+        self.logger = mock.Mock(spec=DataLogger)
+        self.io = SimpleNamespace(log=self.logger, interfaces={}, pcc=SimpleNamespace())
+
+    def start_engine(self) -> AsyncIOEngine:
+        engine = AsyncIOEngine(self.io)
+        engine.start()
+        self.addCleanup(engine.stop)
+        return engine
+
+
+    def test_interfaces_are_updated_on_the_loop_thread(self):
+        interface = FakeInterface('I2CInterface')
+        self.io.interfaces = {interface.name: interface}
+        engine = self.start_engine()
+
+        self.assertTrue(wait_for(lambda: interface.updates >= 3))
+        self.assertEqual(interface.threads, {engine.thread})
+        self.assertIs(engine.call(threading.current_thread), engine.thread)
+
+        engine.stop()
+        self.assertFalse(engine.is_running())
+        updates = interface.updates
+        time.sleep(AsyncIOEngine.INTERFACE_UPDATE_INTERVAL * 3)
+        self.assertEqual(interface.updates, updates)
+
+
+    def test_failed_update_sets_interface_error(self):
+        interface = FakeInterface('I2CInterface', fail=True)
+        self.io.interfaces = {interface.name: interface}
+        self.start_engine()
+
+        self.assertTrue(wait_for(lambda: interface.status is Interface.InterfaceStatus.ERROR))
+        time.sleep(AsyncIOEngine.INTERFACE_UPDATE_INTERVAL * 3)
+        self.assertEqual(interface.updates, 1)
+        self.assertTrue(any(call.args[2] is DataLogger.LogSeverity.ERROR for call in self.logger.writeLog.call_args_list))
+
+
+    def test_can_frames_wake_the_interface(self):
+        channel = f'io_engine_test_{next(self.channel_ids)}'
+        with mock.patch('Backend.interface.can.interface.Bus',
+                        side_effect=lambda channel, interface: can.Bus(channel, interface='virtual')):
+            device = TestCANDevice(self.logger)
+            interface = CANInterface('CANInterface', channel, [device], self.logger, ParameterMonitor({}, self.logger))
+            interface.initialize()
+        self.addCleanup(interface.close_connection)
+        self.io.interfaces = {interface.name: interface}
+        self.start_engine()
+
+        message = device.db.get_message_by_name(device.db.messages[0].name)
+        data = bytes(range(1, message.length + 1))
+        with can.Bus(channel, interface='virtual') as sender:
+            sender.send(can.Message(arbitration_id=message.frame_id, data=data, is_extended_id=message.is_extended_frame))
+
+            signal_name = message.signals[0].name
+            expected = device.decode_plans[message.frame_id].decode(data)[signal_name]
+            self.assertTrue(wait_for(lambda: device.get_data(signal_name) == expected))
+        self.assertEqual(interface.rx_stats['frames_total'], 1)
+
+
+class PCCClientTest(unittest.TestCase):
+    '''Runs both clients against a local server which does the handshake, then sends one request.'''
+
+    REQUEST = {'action': 'get', 'params': {}}
+
+    def start_server(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.addCleanup(self.server.close)
+        self.responses = []
+        self.server_thread = threading.Thread(target=self.serve, daemon=True)
+        self.server_thread.start()
+
+    def serve(self):
+        connection, address = self.server.accept()
+        with connection:
+            connection.settimeout(2)
+            self.handshake = connection.recv(1024).decode()
+            connection.sendall(HANDSHAKE_RESPONSE.encode())
+            time.sleep(0.1)     # The protocol has no framing, so the request can't arrive with the handshake
+            connection.sendall(json.dumps(self.REQUEST).encode())
+            self.responses.append(json.loads(connection.recv(1024).decode()))
+
+    def make_client(self, client_class):
+        self.start_server()
+        client = client_class(get_data_callable=lambda device, param: {'value': 42})
+        client.server_ip, client.server_port = self.server.getsockname()
+        return client
+
+
+    def test_threaded_client(self):
+        client = self.make_client(PCCClient)
+        client.start()
+        self.server_thread.join(5)
+        client.stop()
+
+        self.assertEqual(self.handshake, HANDSHAKE_REQUEST)
+        self.assertEqual(self.responses, [{'value': 42}])
+
+
+    def test_async_client(self):
+        client = self.make_client(AsyncPCCClient)
+
+        async def run():
+            task = asyncio.create_task(client.run())
+            await asyncio.get_running_loop().run_in_executor(None, self.server_thread.join, 5)
+            client.stop()
+            await asyncio.wait_for(task, 5)
+        asyncio.run(run())
+
+        self.assertEqual(self.handshake, HANDSHAKE_REQUEST)
+        self.assertEqual(self.responses, [{'value': 42}])
+
+
+    def test_bad_requests_drop_the_connection(self):
+        client = PCCClient(get_data_callable=mock.Mock())
+        client.connected_to_server = True
+
+        self.assertIsNone(client._handle_request('not json'))
+        self.assertFalse(client.connected_to_server)
+        self.assertIsNone(client._parse_request('["action"]'))
+        self.assertIsNone(client._parse_request('{"params": {}}'))
+        client.get_data_callable.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from Backend.telemetry_format import BinaryTelemetryWriter, CSVTelemetryWriter, SegmentedTelemetryWriter, TelemetryFormat
+from Backend.telemetry_format import convert_binary_to_csv, iter_telemetry, load_manifest, read_binary_telemetry, \
+    read_csv_telemetry, read_telemetry_columns, session_segments, to_csv_fields, RECORD_STRUCT
+
+
+ROWS = [
+    (1000.0, 'OrionBMS2', 'Pack_SOC', 87.5, '%'),
+    (1000.25, 'OrionBMS2', 'Pack_Current', -12, 'A'),
+    (1000.5, 'DTI_HV_500', 'Drive_Enable', True, ''),
+    (1000.75, 'DTI_HV_500', 'Control_Mode', 'Speed', ''),
+    (1001.0, 'OrionBMS2', 'Pack_SOC', None, '%'),
+    (1001.25, 'DTI_HV_500', 'Control_Mode', 'Speed', ''),
+    (1001.5, 'OrionBMS2', 'Pack_Current', 2**70, 'A'),      # Too big for an int64
+]
+
+
+class TelemetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def path(self, file_name: str) -> str:
+        return os.path.join(self.directory, file_name)
+
+    def write_binary(self, rows, file_name: str = 'Telemetry.bin') -> str:
+        writer = BinaryTelemetryWriter(self.path(file_name))
+        writer.writerows(rows)
+        writer.close()
+        return writer.path
+
+    def write_csv(self, rows, file_name: str = 'Telemetry.csv') -> str:
+        writer = CSVTelemetryWriter(self.path(file_name))
+        writer.writerows(rows)
+        writer.close()
+        return self.path(file_name)
+
+
+class BinaryTelemetryTest(TelemetryTestCase):
+
+    def test_round_trip(self):
+        path = self.write_binary(ROWS)
+
+        # Types are kept, except for values which don't fit a record (stored as their string)
+        expected = ROWS[:-1] + [ROWS[-1][:3] + (str(2**70), 'A')]
+        self.assertEqual(list(iter_telemetry(path)), expected)
+
+
+    def test_rows_match_the_csv(self):
+        binary_path = self.write_binary(ROWS)
+        csv_path = self.write_csv(ROWS)
+
+        # The CSV stores every value as a string
+        self.assertEqual([to_csv_fields(row) for row in iter_telemetry(binary_path)],
+                         [to_csv_fields(row) for row in iter_telemetry(csv_path)])
+        converted = convert_binary_to_csv(binary_path, self.path('Converted.csv'))
+        self.assertEqual(list(read_csv_telemetry(converted)), list(read_csv_telemetry(csv_path)))
+
+
+    def test_names_are_only_stored_once(self):
+        rows = [(1000.0 + i, 'OrionBMS2', 'Pack_SOC', float(i), '%') for i in range(100)]
+        binary_path = self.write_binary(rows)
+        csv_path = self.write_csv(rows)
+
+        self.assertLess(os.path.getsize(binary_path), os.path.getsize(csv_path))
+        with open(self.path('Telemetry.dict')) as dictionary:
+            self.assertEqual(len(dictionary.readlines()), 1)
+
+
+    def test_partial_record_is_ignored(self):
+        path = self.write_binary(ROWS[:2])
+        with open(path, 'ab') as file:
+            file.write(bytes(RECORD_STRUCT.size // 2))
+
+        self.assertEqual(list(iter_telemetry(path)), ROWS[:2])
+
+
+    def test_not_binary_telemetry_raises(self):
+        path = self.write_csv(ROWS)
+        with self.assertRaises(ValueError):
+            list(read_binary_telemetry(path))
+
+
+class TelemetryReaderTest(TelemetryTestCase):
+
+    def test_filters_match_for_csv_and_binary(self):
+        binary_path = self.write_binary(ROWS)
+        csv_path = self.write_csv(ROWS)
+
+        for filters, expected in (({'devices': 'DTI_HV_500'}, [ROWS[2], ROWS[3], ROWS[5]]),
+                                  ({'params': ['Pack_SOC', 'Drive_Enable']}, [ROWS[0], ROWS[2], ROWS[4]]),
+                                  ({'start': 1000.5, 'end': 1001.0}, ROWS[2:5]),
+                                  ({'devices': 'OrionBMS2', 'start': 1000.1}, [ROWS[1], ROWS[4], ROWS[6]])):
+            with self.subTest(**filters):
+                expected = [to_csv_fields(row) for row in expected]
+                self.assertEqual([to_csv_fields(row) for row in iter_telemetry(binary_path, **filters)], expected)
+                self.assertEqual([to_csv_fields(row) for row in iter_telemetry(csv_path, **filters)], expected)
+
+
+    def test_columns_are_numeric(self):
+        for path in (self.write_binary(ROWS), self.write_csv(ROWS)):
+            with self.subTest(path=os.path.basename(path)):
+                columns = read_telemetry_columns(path)
+
+                soc = columns[('OrionBMS2', 'Pack_SOC')]
+                self.assertEqual(soc['time'].tolist(), [1000.0, 1001.0])
+                self.assertEqual(soc['value'][0], 87.5)
+                self.assertTrue(math.isnan(soc['value'][1]))
+                self.assertTrue(all(math.isnan(value) for value in columns[('DTI_HV_500', 'Control_Mode')]['value']))
+
+        # Only the binary format knows a value was a bool
+        columns = read_telemetry_columns(self.write_binary(ROWS))
+        self.assertEqual(columns[('DTI_HV_500', 'Drive_Enable')]['value'].tolist(), [1.0])
+
+
+    def test_rows_are_streamed(self):
+        rows = [(1000.0 + i, 'OrionBMS2', 'Pack_SOC', float(i), '%') for i in range(10)]
+        path = self.write_binary(rows)
+
+        # Rows are converted a chunk at a time, as they are asked for
+        with mock.patch('Backend.telemetry_format.READ_CHUNK_SIZE', 3):
+            reader = iter_telemetry(path)
+            self.assertEqual(next(reader), rows[0])
+            self.assertEqual(list(reader), rows[1:])
+
+
+class SegmentedTelemetryTest(TelemetryTestCase):
+
+    def make_rows(self, count: int, start: float = 1000.0) -> list:
+        return [(start + i, 'OrionBMS2', 'Pack_SOC', float(i), '%') for i in range(count)]
+
+    def segment_names(self, **kwargs) -> list:
+        return [os.path.basename(path) for path in session_segments(self.directory, **kwargs)]
+
+
+    def test_rolls_over_by_size(self):
+        writer = SegmentedTelemetryWriter(self.directory, TelemetryFormat.BINARY, max_segment_bytes=RECORD_STRUCT.size * 4)
+        rows = self.make_rows(12)
+        for batch_start in range(0, len(rows), 2):
+            writer.writerows(rows[batch_start:batch_start + 2])
+        writer.close()
+
+        # A segment only rolls over between batches, once it is full
+        segments = load_manifest(self.directory)['segments']
+        self.assertEqual([segment['file'] for segment in segments],
+                         ['Telemetry_0000.bin', 'Telemetry_0001.bin', 'Telemetry_0002.bin'])
+        self.assertEqual([segment['rows'] for segment in segments], [4, 4, 4])
+        self.assertEqual([(segment['start'], segment['end']) for segment in segments],
+                         [(1000.0, 1003.0), (1004.0, 1007.0), (1008.0, 1011.0)])
+        self.assertTrue(all(segment['complete'] for segment in segments))
+        self.assertEqual(list(iter_telemetry(self.directory)), rows)
+
+
+    def test_rolls_over_by_age(self):
+        now = [0.0]
+        with mock.patch('Backend.telemetry_format.currentTime', side_effect=lambda: now[0]):
+            writer = SegmentedTelemetryWriter(self.directory, TelemetryFormat.CSV, max_segment_seconds=60)
+            writer.writerows(self.make_rows(2))
+            now[0] = 59
+            writer.writerows(self.make_rows(2, 1002))
+            now[0] = 60
+            writer.writerows(self.make_rows(2, 1004))
+            writer.close()
+
+        self.assertEqual(writer.segment_count, 2)
+        self.assertEqual(os.path.basename(writer.path), 'Telemetry_0001.csv')
+        self.assertEqual(len(list(iter_telemetry(self.directory))), 6)
+
+
+    def test_segments_are_selected_by_time(self):
+        writer = SegmentedTelemetryWriter(self.directory, TelemetryFormat.CSV, max_segment_bytes=1)
+        for start in (1000, 2000, 3000):
+            writer.writerows(self.make_rows(10, start))
+        writer.close()
+
+        self.assertEqual(self.segment_names(start=1500, end=2500), ['Telemetry_0001.csv'])
+        self.assertEqual(self.segment_names(start=2009), ['Telemetry_0001.csv', 'Telemetry_0002.csv'])
+        self.assertEqual(self.segment_names(last=1), ['Telemetry_0002.csv'])
+        self.assertEqual(self.segment_names(last=0), [])
+        self.assertEqual([row[0] for row in iter_telemetry(self.directory, start=2005, end=3002)],
+                         [2005.0 + i for i in range(5)] + [3000.0, 3001.0, 3002.0])
+
+
+    def test_sessions_without_a_manifest_are_read(self):
+        self.write_csv(self.make_rows(2), 'Telemetry.csv')
+
+        manifest = load_manifest(self.directory)
+        self.assertEqual([segment['file'] for segment in manifest['segments']], ['Telemetry.csv'])
+        self.assertEqual(len(list(iter_telemetry(self.directory))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,422 @@
+import datetime
+import random
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from Backend.data_logger import DataLogger
+from Backend.value_monitor import ParameterMonitor, ParameterWarning
+
+
+class MonitorTestCase(unittest.TestCase):
+    '''Makes a ParameterMonitor from a limits dict, logging into a temporary directory.'''
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.logger = DataLogger('value_monitor_test', baseDirectoryPath=self.log_dir,
+                                 logLevel=DataLogger.LogSeverity.CRITICAL)
+
+    def tearDown(self):
+        self.logger.close()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def make_monitor(self, value_limits: dict) -> ParameterMonitor:
+        return ParameterMonitor(value_limits, self.logger)
+
+
+def reference_numeric(prefix: str, param_name: str, param_value, rules: dict) -> str:
+    min_val = rules.get('min', float('-inf'))
+    max_val = rules.get('max', float('inf'))
+    if not (isinstance(param_value, (int, float)) and not isinstance(param_value, bool)):
+        return f"{prefix}{param_name} has value '{param_value}' which is not numeric."
+    if param_value < min_val or param_value > max_val:
+        return f"{prefix}{param_name} ({param_value}) is out of range: [{min_val}, {max_val}]"
+    return ""
+
+
+def reference_boolean(prefix: str, param_name: str, param_value, rules: dict) -> str:
+    if not isinstance(param_value, bool):
+        return f"{prefix}{param_name} has value '{param_value}' which is not a boolean."
+    if rules.get('expected') is not None and param_value != rules['expected']:
+        return f"{prefix}{param_name} = {param_value}, but expected {rules['expected']}."
+    return ""
+
+
+def reference_categorical(prefix: str, param_name: str, param_value, rules: dict) -> str:
+    if param_value not in rules.get('valid', []):
+        return f"{prefix}{param_name} has value '{param_value}', which is not in valid options: {rules.get('valid', [])}."
+    return ""
+
+
+def reference_array(prefix: str, param_name: str, param_value, rules: dict) -> str:
+    min_val = rules.get('min', float('-inf'))
+    max_val = rules.get('max', float('inf'))
+    if not isinstance(param_value, list):
+        return f"{prefix}{param_name} has value '{param_value}' which is not a list."
+    for i, val in enumerate(param_value):
+        if not isinstance(val, (int, float)):
+            return f"{prefix}{param_name}[{i}] = '{val}', which is not numeric."
+        if val < min_val or val > max_val:
+            return f"{prefix}{param_name}[{i}] = {val} is out of range: [{min_val}, {max_val}]."
+    return ""
+
+
+def reference_timestamp(prefix: str, param_name: str, param_value, rules: dict) -> str:
+    try:
+        dt_value = datetime.datetime.fromisoformat(param_value)
+    except ValueError:
+        return f"{prefix}{param_name} has value '{param_value}' which is not a valid ISO timestamp."
+    if rules.get('before') and dt_value >= datetime.datetime.fromisoformat(rules['before']):
+        return f"{prefix}{param_name} = {param_value}, which is not before {rules['before']}."
+    if rules.get('after') and dt_value <= datetime.datetime.fromisoformat(rules['after']):
+        return f"{prefix}{param_name} = {param_value}, which is not after {rules['after']}."
+    return ""
+
+
+def reference_mapped_error(prefix: str, param_name: str, param_value, rules: dict) -> str:
+    if str(param_value) == str(rules.get('typical', '')):
+        return ""
+    if str(param_value) in rules.get('codes', {}):
+        return f"{prefix}{param_name} {rules['codes'][str(param_value)]}"
+    return f"{prefix}{param_name} has unknown code '{param_value}'."
+
+
+REFERENCE_VALIDATORS = {
+    'numeric': reference_numeric,
+    'boolean': reference_boolean,
+    'categorical': reference_categorical,
+    'array': reference_array,
+    'timestamp': reference_timestamp,
+    'mappedError': reference_mapped_error,
+}
+
+
+def reference_warning(param_name: str, param_value, rules: dict) -> str:
+    '''The warning message check_value() made before the rules were compiled (the old _validate_* methods).'''
+    prefix = rules['prefix'] + " " if rules.get('prefix') is not None else ""
+    validator = REFERENCE_VALIDATORS.get(rules.get('type', 'numeric'))
+    return validator(prefix, param_name, param_value, rules) if validator else ""
+
+
+class CompiledValidatorTest(MonitorTestCase):
+
+    LIMITS = {
+        'Pack_Current': {'prefix': 'AMS', 'type': 'numeric', 'min': -50, 'max': 200},
+        'Pack_SOC': {'min': 10},
+        'Drive_Enable': {'type': 'boolean', 'expected': True},
+        'Fault_Light': {'type': 'boolean'},
+        'Control_Mode': {'type': 'categorical', 'valid': ['Speed', 'Torque']},
+        'Cell_Voltages': {'prefix': 'AMS', 'type': 'array', 'min': 2.5, 'max': 4.2},
+        'Service_Date': {'type': 'timestamp', 'after': '2024-01-01T00:00:00', 'before': '2030-01-01T00:00:00'},
+        'Fault_Code': {'prefix': 'Inverter', 'type': 'mappedError', 'typical': 0, 'codes': {'1': 'overvoltage', '2': 'overcurrent'}},
+    }
+
+    VALUES = {
+        'Pack_Current': [0, 200, 200.5, -50, -51, 12.25, True, 'high', None, np.float64(250.0)],
+        'Pack_SOC': [10, 9.99, 1e9, float('-inf')],
+        'Drive_Enable': [True, False, 1, 'True'],
+        'Fault_Light': [True, False, 0],
+        'Control_Mode': ['Speed', 'Torque', 'Neutral', None],
+        'Cell_Voltages': [[3.7, 4.0], [3.7, 4.3], [2.4], ['3.7'], [], 3.7],
+        'Service_Date': ['2025-06-01T12:00:00', '2023-06-01T12:00:00', '2031-01-01T00:00:00', 'yesterday'],
+        'Fault_Code': [0, '0', 1, '2', 3],
+    }
+
+
+    def test_messages_match_the_old_validators(self):
+        monitor = self.make_monitor(self.LIMITS)
+
+        for param_name, values in self.VALUES.items():
+            for value in values:
+                with self.subTest(param_name=param_name, value=value):
+                    expected = reference_warning(param_name, value, self.LIMITS[param_name])
+                    self.assertEqual(monitor.profile.validators[param_name](value), expected)
+
+                    monitor.check_value(param_name, value)
+                    warning = monitor.active_warnings.get(param_name)
+                    self.assertEqual(warning.msg if warning else "", expected)
+                    monitor.clear_warning(param_name)
+
+
+    def test_unknown_parameters_are_ignored(self):
+        monitor = self.make_monitor(self.LIMITS)
+        monitor.check_value('Not_A_Parameter', 1e9)
+        self.assertEqual(monitor.active_warnings, {})
+
+
+    def test_invalid_rules_warn_on_every_value(self):
+        monitor = self.make_monitor({'Mystery': {'type': 'complex'},
+                                     'Service_Date': {'type': 'timestamp', 'before': 'someday'}})
+
+        monitor.check_value('Mystery', 1)
+        monitor.check_value('Service_Date', '2025-06-01T12:00:00')
+        self.assertEqual(monitor.active_warnings['Mystery'].msg, "Parameter 'Mystery' has unknown validation type 'complex'.")
+        self.assertEqual(monitor.active_warnings['Service_Date'].msg, "Service_Date has invalid 'before' constraint 'someday'.")
+
+
+class BatchCheckTest(MonitorTestCase):
+
+    def make_limits(self) -> dict:
+        limits = {f'Cell_Temp_{i}': {'prefix': 'AMS', 'min': 0, 'max': 60} for i in range(16)}
+        limits['Pack_SOC'] = {'min': 10}
+        limits['Motor_Temp'] = {'min': 0, 'max': 120, 'hysteresis': 5}    # Stateful, so checked one value at a time
+        limits['Control_Mode'] = {'type': 'categorical', 'valid': ['Speed', 'Torque']}
+        return limits
+
+    def random_batch(self, generator: random.Random, limits: dict) -> dict:
+        batch = {}
+        for param_name in generator.sample(sorted(limits) + ['Not_A_Parameter'], generator.randrange(1, len(limits))):
+            if param_name == 'Control_Mode':
+                batch[param_name] = generator.choice(['Speed', 'Torque', 'Neutral'])
+            elif generator.random() < 0.05:
+                batch[param_name] = generator.choice([True, 'hot', None, np.float32(70)])
+            elif generator.random() < 0.5:
+                batch[param_name] = generator.randint(-10, 130)
+            else:
+                batch[param_name] = generator.uniform(-10, 130)
+        return batch
+
+
+    def test_batches_match_scalar_checks(self):
+        limits = self.make_limits()
+        batch_monitor = self.make_monitor(limits)
+        scalar_monitor = self.make_monitor(limits)
+        generator = random.Random(0)
+
+        for _ in range(300):
+            batch = self.random_batch(generator, limits)
+            batch_monitor.check_values(batch)
+            for param_name, value in batch.items():
+                scalar_monitor.check_value(param_name, value)
+
+            # Only the order the warnings were created in can differ (see check_values())
+            self.assertEqual({name: warning.msg for name, warning in batch_monitor.active_warnings.items()},
+                             {name: warning.msg for name, warning in scalar_monitor.active_warnings.items()}, batch)
+
+
+    def test_values_back_in_range_are_cleared(self):
+        monitor = self.make_monitor(self.make_limits())
+        batch = {f'Cell_Temp_{i}': 25.0 for i in range(16)}
+
+        monitor.check_values({**batch, 'Cell_Temp_3': 61.5, 'Pack_SOC': 5})
+        self.assertEqual(list(monitor.active_warnings), ['Cell_Temp_3', 'Pack_SOC'])
+        self.assertEqual(monitor.active_warnings['Cell_Temp_3'].msg, 'AMS Cell_Temp_3 (61.5) is out of range: [0, 60]')
+
+        monitor.check_values(batch)
+        self.assertEqual(list(monitor.active_warnings), ['Pack_SOC'])
+
+
+class WarningStoreTest(MonitorTestCase):
+
+    def test_warnings_are_kept_in_priority_order(self):
+        monitor = self.make_monitor({})
+        for param_name, priority in (('A', 100), ('B', 100), ('C', 200), ('D', 50), ('E', 200)):
+            monitor.create_warning(ParameterWarning(param_name, 0, f'{param_name} warning', priority))
+
+        # Highest priority first, then in the order they were created
+        self.assertEqual(monitor.get_warnings_as_str(), ['C warning', 'E warning', 'A warning', 'B warning', 'D warning'])
+        self.assertEqual([warning.param_name for warning in monitor.get_warnings()], ['C', 'E', 'A', 'B', 'D'])
+
+
+    def test_existing_warnings_are_kept(self):
+        monitor = self.make_monitor({})
+        monitor.create_warning(ParameterWarning('A', 1, 'First'))
+        version = monitor.warnings_version
+
+        monitor.create_warning(ParameterWarning('A', 2, 'Second'))
+        self.assertEqual(monitor.get_warnings_as_str(), ['First'])
+        self.assertEqual(monitor.warnings_version, version)
+
+
+    def test_clearing_updates_the_strings(self):
+        monitor = self.make_monitor({})
+        monitor.create_warning(ParameterWarning('A', 0, 'A warning'))
+        monitor.create_warning(ParameterWarning('B', 0, 'B warning'))
+        warning_strs = monitor.get_warnings_as_str()
+        version = monitor.warnings_version
+
+        monitor.clear_warning('A')
+        monitor.clear_warning('Not_A_Warning')
+        self.assertEqual(monitor.get_warnings_as_str(), ['B warning'])
+        self.assertEqual(monitor.warnings_version, version + 1)
+        # Lists that were already handed out aren't changed
+        self.assertEqual(warning_strs, ['A warning', 'B warning'])
+
+
+class StatefulNumericTest(MonitorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.time = 0.0
+        patcher = mock.patch('Backend.value_monitor.monotonic', side_effect=lambda: self.time)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def check(self, monitor: ParameterMonitor, value, at: float):
+        self.time = at
+        monitor.check_value('Temp', value)
+        warning = monitor.active_warnings.get('Temp')
+        return warning.msg if warning else None
+
+
+    def test_hysteresis_clears_inside_band(self):
+        monitor = self.make_monitor({'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'hysteresis': 2}})
+
+        self.assertIsNone(self.check(monitor, 100, 0))
+        self.assertIn('out of range', self.check(monitor, 111, 1))
+        # Back in range, but not inside the band yet
+        self.assertIn('out of range', self.check(monitor, 109, 2))
+        self.assertIsNone(self.check(monitor, 107, 3))
+        # Without a warning the plain range applies
+        self.assertIsNone(self.check(monitor, 109, 4))
+
+
+    def test_hysteresis_not_applied_after_rate_warning(self):
+        monitor = self.make_monitor({'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'hysteresis': 2, 'max_rate': 5}})
+
+        self.assertIsNone(self.check(monitor, 50, 0))
+        self.assertIn('changing too fast', self.check(monitor, 100, 1))
+        # In range & changing slowly: the rate warning clears, even though 109 is outside the hysteresis band
+        self.assertIsNone(self.check(monitor, 104, 2))
+        self.assertIsNone(self.check(monitor, 109, 3))
+
+
+    def test_rate_warning_clears_after_value_holds_steady(self):
+        monitor = self.make_monitor({'Temp': {'type': 'numeric', 'min': 0, 'max': 110, 'max_rate': 10}})
+
+        self.check(monitor, 10, 0)
+        self.assertIn('changing too fast', self.check(monitor, 50, 1))
+
+        # Only changed values are checked, so check_pending() has to clear it
+        self.time = 1
+        monitor.check_pending()
+        self.assertIn('Temp', monitor.active_warnings)
+        self.time = 2
+        monitor.check_pending()
+        self.assertNotIn('Temp', monitor.active_warnings)
+        self.assertEqual(monitor.pending_values, {})
+
+
+    def test_debounce_raises_and_clears_after_delay(self):
+        monitor = self.make_monitor({'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'debounce': 1}})
+
+        self.assertIsNone(self.check(monitor, 120, 0))
+        self.assertIn('Temp', monitor.pending_values)
+        self.assertIsNone(self.check(monitor, 120, 0.5))
+        self.assertIn('out of range', self.check(monitor, 120, 1.0))
+        self.assertNotIn('Temp', monitor.pending_values)
+
+        # Clearing waits out the debounce too
+        self.assertIsNotNone(self.check(monitor, 100, 2))
+        self.assertIsNone(self.check(monitor, 100, 3))
+
+
+    def test_debounce_restarts_when_value_recovers(self):
+        monitor = self.make_monitor({'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'debounce': 1}})
+
+        self.assertIsNone(self.check(monitor, 120, 0))
+        self.assertIsNone(self.check(monitor, 100, 0.8))
+        self.assertIsNone(self.check(monitor, 120, 1.2))
+        self.assertIsNone(self.check(monitor, 120, 2.1))
+        self.assertIsNotNone(self.check(monitor, 120, 2.2))
+
+
+    def test_check_pending_finishes_debounce(self):
+        monitor = self.make_monitor({'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'debounce': 1}})
+
+        self.check(monitor, 120, 0)
+        self.time = 1.5
+        monitor.check_pending()
+        self.assertIn('Temp', monitor.active_warnings)
+
+
+    def test_invalid_rules_raise(self):
+        with self.assertRaises(ValueError):
+            self.make_monitor({'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'hysteresis': -1}})
+        with self.assertRaises(ValueError):
+            self.make_monitor({'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'max_rate': 0}})
+
+
+class LimitProfileTest(MonitorTestCase):
+
+    LIMITS = {
+        'Pack_Current': {'prefix': 'AMS', 'type': 'numeric', 'min': 0, 'max': 200},
+        'AC_Current': {'type': 'numeric', 'min': 0, 'max': 200},
+        'Temp': {'type': 'numeric', 'min': 30, 'max': 110, 'debounce': 1},
+        'profiles': {
+            'endurance': {
+                'Pack_Current': {'max': 120},
+                'AC_Current': None,
+                'Coolant_Flow': {'type': 'numeric', 'min': 1},
+            },
+        },
+    }
+
+
+    def test_profile_merges_over_top_level_rules(self):
+        monitor = self.make_monitor(self.LIMITS)
+        endurance = monitor.profiles['endurance'].parameter_limits
+
+        self.assertEqual(endurance['Pack_Current'], {'prefix': 'AMS', 'type': 'numeric', 'min': 0, 'max': 120})
+        self.assertEqual(endurance['Coolant_Flow'], {'type': 'numeric', 'min': 1})
+        # The top level rules are left alone
+        self.assertEqual(monitor.profiles['default'].parameter_limits['Pack_Current']['max'], 200)
+        self.assertNotIn('profiles', monitor.parameter_limits)
+
+
+    def test_profile_limits_are_checked(self):
+        monitor = self.make_monitor(self.LIMITS)
+
+        monitor.check_value('Pack_Current', 150)
+        self.assertNotIn('Pack_Current', monitor.active_warnings)
+
+        monitor.set_profile('endurance')
+        monitor.check_value('Pack_Current', 150)
+        self.assertEqual(monitor.active_warnings['Pack_Current'].msg, 'AMS Pack_Current (150) is out of range: [0, 120]')
+
+
+    def test_null_stops_monitoring(self):
+        monitor = self.make_monitor(self.LIMITS)
+        monitor.set_profile('endurance')
+
+        monitor.check_value('AC_Current', 500)
+        self.assertNotIn('AC_Current', monitor.active_warnings)
+        self.assertNotIn('AC_Current', monitor.profile.validators)
+
+
+    def test_set_profile_clears_warnings_and_resets_stateful_rules(self):
+        monitor = self.make_monitor(self.LIMITS)
+        monitor.set_profile('endurance')
+        with mock.patch('Backend.value_monitor.monotonic', return_value=0):
+            monitor.check_value('Temp', 120)
+        with mock.patch('Backend.value_monitor.monotonic', return_value=2):
+            monitor.check_value('Temp', 120)
+        monitor.check_value('Pack_Current', 150)
+        self.assertIn('Temp', monitor.active_warnings)
+
+        monitor.set_profile('default')
+        self.assertEqual(monitor.active_warnings, {})
+
+        # Switching back starts the debounce over, rather than reusing the old warning state
+        monitor.set_profile('endurance')
+        with mock.patch('Backend.value_monitor.monotonic', return_value=3):
+            monitor.check_value('Temp', 120)
+        self.assertNotIn('Temp', monitor.active_warnings)
+        self.assertIn('Temp', monitor.pending_values)
+
+
+    def test_unknown_profile_raises(self):
+        monitor = self.make_monitor(self.LIMITS)
+        with self.assertRaises(ValueError):
+            monitor.set_profile('qualifying')
+        self.assertEqual(monitor.get_profile_names(), ['default', 'endurance'])
+
+
+    def test_shipped_limits_load(self):
+        monitor = ParameterMonitor('Backend/config/valuelimits.json5', self.logger)
+        self.assertIn('Pack_Current', monitor.profile.validators)
+
+
+if __name__ == '__main__':
+    unittest.main()
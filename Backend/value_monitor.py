@@ -9,12 +9,12 @@ This module defines classes to monitor values from the DDS_IO system. Signals ca
 range in the valuelimits.json file. The ParameterMonitor class observes these signals and logs a 
 warning if any value falls outside the given constraint.
 
-TODO:
-    - Add support for different limits based on different driving modes.
+Different driving modes can use different limits (see Limit Profiles below).
 
 Classes:
     ParameterWarning: Represents a warning for a parameter that is out of range.
     ParameterMonitor: Monitors parameters and raises warnings if values are out of range.
+    LimitProfile: The compiled limits of one driving mode.
 
     
 Supported Parameter Limits and Validation Types
@@ -29,6 +29,15 @@ parameter being monitored. The supported types and their rules are detailed belo
     - Rules:
         - "min": The minimum acceptable value (default: -infinity).
         - "max": The maximum acceptable value (default: +infinity).
+        - "hysteresis": (Optional) Once an out of range warning is raised, the value has to come back inside the range
+          by this much (i.e. inside [min + hysteresis, max - hysteresis]) before it is cleared. Stops values hovering
+          at a limit from raising & clearing the warning on every sample.
+        - "debounce": (Optional) How long (seconds) a value has to stay out of range before the warning is raised,
+          and back in range before it is cleared.
+        - "max_rate": (Optional) The fastest the value can change (units per second, either direction).
+          Changing faster than this raises a warning too.
+    - Rules with any of the optional keys keep a little state for the parameter (its last value & time, and
+      whether it's warning), which is updated on every sample.
 
 2. **Boolean** (type: "boolean")
     - Validates parameters with boolean values (True/False).
@@ -64,6 +73,25 @@ parameter being monitored. The supported types and their rules are detailed belo
 7. **Unknown/Unsupported Types**
     - If a parameter's "type" is not recognized, it will be ignored and a warning may be logged.
 
+
+Limit Profiles
+--------------
+The "profiles" key of the configuration file holds named profiles for different driving modes
+(Ex. "endurance", "accel", "charging"). A profile only lists what it changes: each of its parameters
+is merged over that parameter's top level rules (or added, if it has none), and `null` stops the
+parameter from being monitored in that profile. The top level rules are the "default" profile.
+
+    "profiles": {
+        "endurance": {
+            "Pack_Current": {"max": 120},   // Same prefix/type/min as the top level Pack_Current, new max
+            "AC_Current": null              // Not monitored during endurance
+        }
+    }
+
+Every profile is compiled when the ParameterMonitor is created, so `set_profile()` only swaps which
+compiled profile is used. Switching clears the warnings of monitored parameters, since they were
+raised against the old limits. DDS_IO.set_drive_mode() also has every device re-check its values.
+
     
 Configuration Structure
 -----------------------
@@ -114,7 +142,9 @@ Example Configuration
 
 import json5
 import datetime
-from typing import List, Union
+import numpy as np
+from time import monotonic
+from typing import Any, Callable, Dict, List, Union
 from Backend.data_logger import DataLogger
 
 
@@ -126,7 +156,7 @@ class ParameterWarning:
         param_name (str): The name of the parameter.
         param_value (Union[float, bool, str, list]): The current value of the parameter.
         msg (str): A message describing the warning.
-        priority (int): The priority level of the warning (default is 100).
+        priority (int): The priority level of the warning (default is 100). Higher priority warnings are listed first.
     """
 
     def __init__(
@@ -178,15 +208,123 @@ class ParameterWarning:
             )
 
 
+class ChannelState:
+    """
+    The state kept between samples for a numeric parameter with hysteresis, debounce or max_rate rules.
+
+    Attributes:
+        warning_msg (str): The message of the parameter's warning, or VALID_RETURN_STR if it isn't warning.
+        range_warning (bool): Whether `warning_msg` is an out of range warning (only those clear with hysteresis).
+        pending_since (float): When the value started disagreeing with `warning_msg` (None if it agrees).
+        last_value (float): The last value checked.
+        last_time (float): When the last value was checked (time.monotonic()).
+        last_rate (float): The rate of change measured at the last value.
+        last_interval (float): The time between the last value and the one before it.
+    """
+    __slots__ = ('warning_msg', 'range_warning', 'pending_since', 'last_value', 'last_time', 'last_rate', 'last_interval')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forgets everything about the previous samples."""
+        self.warning_msg = ""
+        self.range_warning = False
+        self.pending_since = None
+        self.last_value = None
+        self.last_time = None
+        self.last_rate = 0
+        self.last_interval = 0
+
+    def rate(self, value: float, current_time: float) -> float:
+        """
+        Returns how fast the value changed since the last sample (0 for the first), and remembers this sample.
+        A value checked again before it has held for a sample interval (at most MAX_RATE_HOLD_TIME) keeps the last rate,
+        since it isn't known to have stopped changing yet.
+        """
+        if self.last_time is None:
+            self.last_value = value
+            self.last_time = current_time
+            return 0
+
+        elapsed = current_time - self.last_time
+        if value == self.last_value and elapsed < min(self.last_interval, MAX_RATE_HOLD_TIME):
+            return self.last_rate
+
+        self.last_rate = abs(value - self.last_value) / elapsed if elapsed > 0 else 0
+        self.last_interval = elapsed
+        self.last_value = value
+        self.last_time = current_time
+        return self.last_rate
+
+    def settle(self, warning_msg: str, out_of_range: bool, current_time: float, debounce: float) -> bool:
+        """
+        Changes the warning to `warning_msg` once the value has disagreed with the current warning for `debounce` seconds.
+        Returns whether the change is still waiting out the debounce.
+        """
+        if bool(warning_msg) == bool(self.warning_msg):
+            self.pending_since = None
+            if warning_msg:
+                self.warning_msg = warning_msg
+                self.range_warning = out_of_range
+            return False
+
+        if debounce > 0:
+            if self.pending_since is None:
+                self.pending_since = current_time
+            if current_time - self.pending_since < debounce:
+                return True
+
+        self.warning_msg = warning_msg
+        self.range_warning = out_of_range
+        self.pending_since = None
+        return False
+
+
+class LimitProfile:
+    """
+    The limits of one driving mode, compiled & ready to be checked against.
+
+    Attributes:
+        name (str): The name of the profile.
+        parameter_limits (dict): The rules for each parameter (with the profile's changes merged in).
+        validators (dict): The rules of each parameter, compiled into a function that validates its value.
+        numeric_channels (dict): The channel ID of each numeric parameter, which indexes `numeric_min` & `numeric_max`.
+        numeric_min (np.ndarray): The min of each numeric channel.
+        numeric_max (np.ndarray): The max of each numeric channel.
+        channel_states (List[ChannelState]): The state of each parameter with hysteresis, debounce or max_rate rules.
+    """
+
+    def __init__(self, name: str, parameter_limits: Dict[str, dict], validators: Dict[str, Callable[[Any], str]],
+                 numeric_channels: Dict[str, int], numeric_min: np.ndarray, numeric_max: np.ndarray,
+                 channel_states: List[ChannelState]):
+        self.name = name
+        self.parameter_limits = parameter_limits
+        self.validators = validators
+        self.numeric_channels = numeric_channels
+        self.numeric_min = numeric_min
+        self.numeric_max = numeric_max
+        self.channel_states = channel_states
+
+
 VALID_RETURN_STR = ""
+PROFILES_KEY = "profiles"
+DEFAULT_PROFILE = "default"
+STATEFUL_NUMERIC_RULES = ('hysteresis', 'debounce', 'max_rate')
+VECTORIZE_MIN_BATCH = 8     # Smaller batches are checked one value at a time (NumPy's overhead costs more than it saves)
+MAX_RATE_HOLD_TIME = 1.0    # Longest a value that stopped changing keeps the rate of its last change (seconds)
 
 class ParameterMonitor:
     """
     Monitors parameters and raises warnings if values are out of range.
 
     Attributes:
-        active_warnings (list[ParameterWarning]): A list to store active warnings.
-        parameter_limits (dict): A dictionary containing the limits and validation rules for each parameter.
+        active_warnings (dict[str, ParameterWarning]): The active warnings, keyed by parameter name, in priority order.
+        warnings_version (int): Incremented every time a warning is created or cleared.
+        parameter_limits (dict): A dictionary containing the limits and validation rules for each parameter (default profile).
+        profiles (dict[str, LimitProfile]): Every compiled limit profile, by name.
+        profile (LimitProfile): The limit profile values are currently checked against.
+        pending_values (dict): The last value of each parameter that is waiting out a debounce or has a rate warning (see `check_pending()`).
 
     Supported Parameter Types:
         - Numeric ("numeric"): Parameters with numerical values and optional min/max bounds.
@@ -198,7 +336,10 @@ class ParameterMonitor:
         support for a "typical" value that represents the normal/expected state.
     """
 
-    active_warnings: list[ParameterWarning]
+    active_warnings: dict[str, ParameterWarning]
+    warnings_version: int
+    profiles: dict[str, LimitProfile]
+    profile: LimitProfile
 
     def __init__(self, value_limits: Union[str, dict], logger: DataLogger):
         """
@@ -209,16 +350,27 @@ class ParameterMonitor:
             logger (DataLogger): The logger instance for logging messages.
         """
         self.logger = logger
-        self.active_warnings = []
+        self.active_warnings = {}
+        self.warnings_version = 0
+        self.__warning_strs: List[str] = []     # Replaced (never modified) when the warnings change, see get_warnings_as_str()
+        self.pending_values: Dict[str, Any] = {}    # Last value of each parameter waiting out its debounce (or a rate warning)
 
         # Load the configuration based on the type of value_limits
         if isinstance(value_limits, str):
-            self.parameter_limits = self.__load_config(value_limits)
-        elif isinstance(value_limits, dict):
-            self.parameter_limits = value_limits
-        else:
+            value_limits = self.__load_config(value_limits)
+        elif not isinstance(value_limits, dict):
             raise TypeError("value_limits must be a file path (str) or a configuration dictionary (dict)")
 
+        # The top level rules are the default profile. The rest of the profiles are changes to it.
+        self.parameter_limits = dict(value_limits)
+        profile_changes = self.parameter_limits.pop(PROFILES_KEY, None) or {}
+
+        # Compile every profile, so checking a value is one lookup & one call, and switching profiles is free
+        self.profiles = {DEFAULT_PROFILE: self._compile_profile(DEFAULT_PROFILE, self.parameter_limits)}
+        for profile_name, changes in profile_changes.items():
+            self.profiles[profile_name] = self._compile_profile(profile_name, self.__merge_profile(profile_name, changes))
+        self.profile = self.profiles[DEFAULT_PROFILE]
+
         # Log the initialization
         self.__log('Value Monitor Initialized!', DataLogger.LogSeverity.INFO)
 
@@ -232,179 +384,402 @@ class ParameterMonitor:
             param_name (str): The name of the parameter to check.
             param_value (Union[float, bool, str, list]): The value of the parameter to check.
         """
-        if param_name not in self.parameter_limits:
+        validator = self.profile.validators.get(param_name)
+        if validator is None:
             # If there's no config for this parameter, log & return
-            return self.__log(f'No Value Limits found for param: {param_name} ({param_value})')
-        
-        rules = self.parameter_limits[param_name]
-        param_type = rules.get('type', 'numeric')  # fallback to numeric if unspecified
+            return self.__log('No Value Limits found for param: %s (%s)', DataLogger.LogSeverity.DEBUG, param_name, param_value)
 
-        # Make warning text
-        warning_text = self._validate_value(param_name, param_value, param_type, rules)
-        prefix = self.__get_prefix(rules)
+        # Make warning text (with the prefix already added)
+        warning_msg = validator(param_value)
 
         # Check to see if there was a warning returned
-        if warning_text == VALID_RETURN_STR:
+        if warning_msg == VALID_RETURN_STR:
             # If it's valid, clear any existing warning
             self.clear_warning(param_name)
             return
 
-        # Add the prefix to warning_msg
-        warning_msg = prefix + warning_text
-
         # A warning message indicates the value is invalid or out of range
         parameter_warning = ParameterWarning(param_name, param_value, warning_msg)
         self.create_warning(parameter_warning)
 
 
+    def check_values(self, values: Dict[str, Any]):
+        """
+        Checks a batch of parameter values (Ex. every signal of a decoded CAN frame) in one call.
 
-    def _validate_value(
-        self, 
-        param_name: str, 
-        param_value: Union[float, bool, str, list], 
-        param_type: str, 
-        rules: dict
-    ) -> str:
+        Numeric values are checked against their bounds with one vectorized comparison.
+        Anything else (non-numeric values or rules), and batches smaller than `VECTORIZE_MIN_BATCH`,
+        go through `check_value()`. The warnings are the same as checking each value with `check_value()`,
+        but the warnings of values which go through `check_value()` are created first.
+
+        Args:
+            values (Dict[str, Any]): The value of each parameter to check.
+        """
+        if len(values) < VECTORIZE_MIN_BATCH:
+            for param_name, param_value in values.items():
+                self.check_value(param_name, param_value)
+            return
+
+        profile = self.profile
+        numeric_channels = profile.numeric_channels
+        channel_ids = []
+        numeric_values = []
+        numeric_names = []
+        for param_name, param_value in values.items():
+            channel = numeric_channels.get(param_name)
+            value_type = type(param_value)
+            if channel is None or (value_type is not float and value_type is not int):
+                self.check_value(param_name, param_value)
+                continue
+            channel_ids.append(channel)
+            numeric_values.append(param_value)
+            numeric_names.append(param_name)
+
+        if channel_ids:
+            self.__check_numeric_batch(values, channel_ids, numeric_values, numeric_names)
+
+
+    def __check_numeric_batch(self, values: Dict[str, Any], channel_ids: List[int], numeric_values: List[float],
+                              numeric_names: List[str]):
         """
-        Dispatch function to validate a parameter value based on its type.
-        Returns an error string if validation fails, or an empty string if valid.
+        Checks numeric values against their bounds with one vectorized comparison (see `check_values()`).
+
+        Args:
+            values (Dict[str, Any]): The whole batch being checked.
+            channel_ids (List[int]): The numeric channel of each value.
+            numeric_values (List[float]): The values to compare.
+            numeric_names (List[str]): The parameter name of each value.
+        """
+        profile = self.profile
+        channel_ids = np.array(channel_ids, dtype=np.intp)
+        numeric_values = np.array(numeric_values, dtype=np.float64)
+        out_of_range = (numeric_values < profile.numeric_min[channel_ids]) | (numeric_values > profile.numeric_max[channel_ids])
+
+        # Only parameters which are out of range need a message made
+        if out_of_range.any():
+            for i in np.flatnonzero(out_of_range).tolist():
+                param_name = numeric_names[i]
+                param_value = values[param_name]
+                self.create_warning(ParameterWarning(param_name, param_value, profile.validators[param_name](param_value)))
+
+        # Clear the warnings of the parameters which are back in range
+        active_warnings = self.active_warnings
+        if active_warnings:
+            for i, param_name in enumerate(numeric_names):
+                if param_name in active_warnings and not out_of_range[i]:
+                    self.clear_warning(param_name)
+
+
+    def check_pending(self):
+        """
+        Checks the parameters which are waiting out a debounce or have a rate warning again, with their last value.
+        Monitoring only checks values that changed, so a value that goes out of range and stays
+        there would otherwise never finish its debounce, and a value that stops changing would never
+        clear its rate warning. Should be called every update.
+        """
+        if not self.pending_values:
+            return
+        for param_name, param_value in list(self.pending_values.items()):
+            self.check_value(param_name, param_value)
+
+
+    def set_profile(self, profile_name: str):
+        """
+        Switches the limits values are checked against to another profile (Ex. a different driving mode).
+        The warnings of monitored parameters are cleared, since they were raised against the old limits.
+
+        Args:
+            profile_name (str): The name of the profile (DEFAULT_PROFILE for the top level rules).
+
+        Raises:
+            ValueError: If there is no profile with that name.
+        """
+        profile = self.profiles.get(profile_name)
+        if profile is None:
+            msg = f"There is no limit profile named '{profile_name}'. Profiles: {list(self.profiles)}"
+            self.__log(msg, DataLogger.LogSeverity.ERROR)
+            raise ValueError(msg)
+        if profile is self.profile:
+            return
+
+        # Start the new profile's hysteresis/debounce/max_rate rules from scratch
+        for state in profile.channel_states:
+            state.reset()
+        self.pending_values.clear()
+
+        old_profile = self.profile
+        self.profile = profile
+
+        for param_name in list(self.active_warnings):
+            if param_name in old_profile.validators or param_name in profile.validators:
+                self.clear_warning(param_name)
+
+        self.__log("Switched to the '%s' limit profile.", DataLogger.LogSeverity.INFO, profile_name)
+
+
+    def get_profile_names(self) -> List[str]:
+        """
+        Returns the names of every limit profile.
+
+        Returns:
+            `List[str]`: The name of each profile, starting with DEFAULT_PROFILE.
+        """
+        return list(self.profiles)
+
+
+    def _compile_profile(self, profile_name: str, parameter_limits: Dict[str, dict]) -> LimitProfile:
+        """
+        Compiles the rules of a profile into validators & numeric bound arrays.
+
+        Parameters:
+            profile_name (str): The name of the profile.
+            parameter_limits (Dict[str, dict]): The rules for each parameter.
+
+        Returns:
+            `LimitProfile`: The compiled profile.
+        """
+        validators = self._compile_validators(parameter_limits)
+        numeric_channels, numeric_min, numeric_max = self._compile_numeric_bounds(parameter_limits)
+        channel_states = [validator.state for validator in validators.values() if hasattr(validator, 'state')]
+        return LimitProfile(profile_name, parameter_limits, validators, numeric_channels, numeric_min, numeric_max, channel_states)
+
+
+    def _compile_numeric_bounds(self, parameter_limits: Dict[str, dict]) -> tuple:
+        """
+        Gives every numeric parameter a channel ID, and puts their bounds into arrays indexed by it.
+
+        Returns:
+            `tuple`: The channel ID of each numeric parameter (Dict[str, int]), and the min & max arrays (np.ndarray).
+        """
+        numeric_channels: Dict[str, int] = {}
+        min_values: List[float] = []
+        max_values: List[float] = []
+        for param_name, rules in parameter_limits.items():
+            # Rules with state are checked one sample at a time
+            if rules.get('type', 'numeric') != 'numeric' or any(key in rules for key in STATEFUL_NUMERIC_RULES):
+                continue
+            numeric_channels[param_name] = len(min_values)
+            min_values.append(rules.get('min', float('-inf')))
+            max_values.append(rules.get('max', float('inf')))
+
+        return numeric_channels, np.array(min_values, dtype=np.float64), np.array(max_values, dtype=np.float64)
+
+
+    def _compile_validators(self, parameter_limits: Dict[str, dict]) -> Dict[str, Callable[[Any], str]]:
+        """
+        Compiles the rules of every parameter into a validator, so nothing about the rules
+        has to be looked up or parsed when a value is checked.
 
         Parameters:
-            See `check_value()`
+            parameter_limits (Dict[str, dict]): The rules for each parameter (see the module docstring).
 
         Returns:
-            `str`: A string containing a warning message. If the value is valid, `None` is returned
+            `Dict[str, Callable[[Any], str]]`: A validator for each parameter. A validator takes the value of the
+                                               parameter, and returns a warning message (with its prefix), or
+                                               VALID_RETURN_STR if the value is valid.
         """
+        return {param_name: self._compile_rule(param_name, rules) for param_name, rules in parameter_limits.items()}
+
+
+    def _compile_rule(self, param_name: str, rules: dict) -> Callable[[Any], str]:
+        """
+        Dispatch function to compile the validator of a parameter based on its type.
+        See `_compile_validators()`.
+        """
+        param_type = rules.get('type', 'numeric')  # fallback to numeric if unspecified
+        prefix = self.__get_prefix(rules)
+
         if param_type == 'numeric':
-            return self._validate_numeric(param_name, param_value, rules)
+            return self._compile_numeric(param_name, rules, prefix)
         elif param_type == 'boolean':
-            return self._validate_boolean(param_name, param_value, rules)
+            return self._compile_boolean(param_name, rules, prefix)
         elif param_type == 'categorical':
-            return self._validate_categorical(param_name, param_value, rules)
+            return self._compile_categorical(param_name, rules, prefix)
         elif param_type == 'array':
-            return self._validate_array(param_name, param_value, rules)
+            return self._compile_array(param_name, rules, prefix)
         elif param_type == 'timestamp':
-            return self._validate_timestamp(param_name, param_value, rules)
+            return self._compile_timestamp(param_name, rules, prefix)
         elif param_type == 'mappedError':
-            return self._validate_mapped_error(param_name, param_value, rules)
+            return self._compile_mapped_error(param_name, rules, prefix)
         else:
-            # Unknown type => treat it as an Error
-            return self.__log_and_return_err(f"Parameter '{param_name}' has unknown validation type '{param_type}'.")
+            # Unknown type => treat every value as an Error
+            err_msg = prefix + self.__log_and_return_err(f"Parameter '{param_name}' has unknown validation type '{param_type}'.")
+            return lambda param_value: err_msg
 
 
-    def _validate_numeric(self, param_name: str, param_value: Union[float, int], rules: dict) -> str:
+    def _compile_numeric(self, param_name: str, rules: dict, prefix: str) -> Callable[[Any], str]:
         """
         Validates a numeric parameter against min/max bounds.
-        
-        Returns:
-            `str`: An error message if invalid, else empty string.
         """
-        # Check correct type (must be a int/float & not a bool)
-        if not (isinstance(param_value, (int, float)) and not isinstance(param_value, bool)):
-            return (f"{param_name} has value '{param_value}' which is not numeric.")
-
         min_val = rules.get('min', float('-inf'))
         max_val = rules.get('max', float('inf'))
 
-        if param_value < min_val or param_value > max_val:
-            return (f"{param_name} ({param_value}) is out of range: [{min_val}, {max_val}]")
-        return VALID_RETURN_STR
-    
+        if any(key in rules for key in STATEFUL_NUMERIC_RULES):
+            return self._compile_stateful_numeric(param_name, rules, prefix, min_val, max_val)
+
+        def validate_numeric(param_value) -> str:
+            # Check correct type (must be a int/float & not a bool)
+            value_type = type(param_value)
+            if value_type is not float and value_type is not int:
+                if not (isinstance(param_value, (int, float)) and not isinstance(param_value, bool)):
+                    return f"{prefix}{param_name} has value '{param_value}' which is not numeric."
 
-    def _validate_boolean(self, param_name: str, param_value: bool, rules: dict) -> str:
+            if param_value < min_val or param_value > max_val:
+                return f"{prefix}{param_name} ({param_value}) is out of range: [{min_val}, {max_val}]"
+            return VALID_RETURN_STR
+
+        return validate_numeric
+
+
+    def _compile_stateful_numeric(self, param_name: str, rules: dict, prefix: str, min_val: float, max_val: float) -> Callable[[Any], str]:
+        """
+        Validates a numeric parameter against min/max bounds, with hysteresis, debounce & max_rate rules.
+        Each sample updates the parameter's ChannelState in O(1).
+        """
+        hysteresis = rules.get('hysteresis', 0)
+        debounce = rules.get('debounce', 0)
+        max_rate = rules.get('max_rate')
+        if hysteresis < 0 or debounce < 0 or (max_rate is not None and max_rate <= 0):
+            msg = (f"Parameter '{param_name}' has an invalid rule. "
+                   f"'hysteresis' & 'debounce' can't be negative, and 'max_rate' must be positive.")
+            self.__log(msg, DataLogger.LogSeverity.ERROR)
+            raise ValueError(msg)
+
+        # The range a value has to be back inside of to clear a warning
+        clear_min = min_val + hysteresis
+        clear_max = max_val - hysteresis
+
+        state = ChannelState()
+        pending_values = self.pending_values
+
+        def validate_stateful_numeric(param_value) -> str:
+            # Check correct type (must be a int/float & not a bool)
+            if not (isinstance(param_value, (int, float)) and not isinstance(param_value, bool)):
+                return f"{prefix}{param_name} has value '{param_value}' which is not numeric."
+
+            current_time = monotonic()
+            warning_msg = VALID_RETURN_STR
+
+            # Check the limits (a range warning needs to get back inside the hysteresis band to clear)
+            if state.range_warning:
+                out_of_range = param_value < clear_min or param_value > clear_max
+            else:
+                out_of_range = param_value < min_val or param_value > max_val
+            if out_of_range:
+                warning_msg = f"{prefix}{param_name} ({param_value}) is out of range: [{min_val}, {max_val}]"
+
+            # Check the rate of change since the last sample
+            if max_rate is not None:
+                rate = state.rate(param_value, current_time)
+                if rate > max_rate and not warning_msg:
+                    warning_msg = f"{prefix}{param_name} is changing too fast: {rate:.3g}/s (max: {max_rate}/s)"
+
+            # Only change the warning state once the value has disagreed with it for the debounce time.
+            # A rate warning is checked again too, since a value that stops changing isn't checked by monitoring.
+            pending = state.settle(warning_msg, out_of_range, current_time, debounce)
+            if pending or (state.warning_msg and not state.range_warning):
+                pending_values[param_name] = param_value
+            else:
+                pending_values.pop(param_name, None)
+
+            return state.warning_msg
+
+        # So the profile can reset the state when it is switched to
+        validate_stateful_numeric.state = state
+        return validate_stateful_numeric
+
+
+    def _compile_boolean(self, param_name: str, rules: dict, prefix: str) -> Callable[[Any], str]:
         """
         Validates a boolean parameter. If 'expected' is given, checks that the value matches it.
-
-        Returns:
-            `str`: An error message if invalid, else empty string.
         """
-        if not isinstance(param_value, bool):
-            return self.__log_and_return_err(f"{param_name} has value '{param_value}' which is not a boolean.")
-
         expected_val = rules.get('expected')
-        if expected_val is not None and param_value != expected_val:
-            return (f"{param_name} = {param_value}, but expected {expected_val}.")
-        return VALID_RETURN_STR
-    
 
-    def _validate_categorical(self, param_name: str, param_value: str, rules: dict) -> str:
+        def validate_boolean(param_value) -> str:
+            if not isinstance(param_value, bool):
+                return prefix + self.__log_and_return_err(f"{param_name} has value '{param_value}' which is not a boolean.")
+
+            if expected_val is not None and param_value != expected_val:
+                return f"{prefix}{param_name} = {param_value}, but expected {expected_val}."
+            return VALID_RETURN_STR
+
+        return validate_boolean
+
+
+    def _compile_categorical(self, param_name: str, rules: dict, prefix: str) -> Callable[[Any], str]:
         """
         Validates a string parameter against a list of valid categorical options.
-
-        Returns:
-            `str`: An error message if invalid, else empty string.
         """
         valid_options = rules.get('valid', [])
-        if param_value not in valid_options:
-            return (f"{param_name} has value '{param_value}', "
-                    f"which is not in valid options: {valid_options}.")
-        return VALID_RETURN_STR
-    
 
-    def _validate_array(self, param_name: str, param_value: list, rules: dict) -> str:
+        def validate_categorical(param_value) -> str:
+            if param_value not in valid_options:
+                return (f"{prefix}{param_name} has value '{param_value}', "
+                        f"which is not in valid options: {valid_options}.")
+            return VALID_RETURN_STR
+
+        return validate_categorical
+
+
+    def _compile_array(self, param_name: str, rules: dict, prefix: str) -> Callable[[Any], str]:
         """
         Validates an array of numeric values against min/max.
-
-        Returns:
-            `str`: An error message if invalid, else empty string.
         """
-        if not isinstance(param_value, list):
-            return self.__log_and_return_err(f"{param_name} has value '{param_value}' which is not a list.")
-
         min_val = rules.get('min', float('-inf'))
         max_val = rules.get('max', float('inf'))
 
-        for i, val in enumerate(param_value):
-            if not isinstance(val, (int, float)):
-                return (f"{param_name}[{i}] = '{val}', which is not numeric.")
-            if val < min_val or val > max_val:
-                return (f"{param_name}[{i}] = {val} is out of range: [{min_val}, {max_val}].")
-        return VALID_RETURN_STR
+        def validate_array(param_value) -> str:
+            if not isinstance(param_value, list):
+                return prefix + self.__log_and_return_err(f"{param_name} has value '{param_value}' which is not a list.")
 
+            for i, val in enumerate(param_value):
+                if not isinstance(val, (int, float)):
+                    return f"{prefix}{param_name}[{i}] = '{val}', which is not numeric."
+                if val < min_val or val > max_val:
+                    return f"{prefix}{param_name}[{i}] = {val} is out of range: [{min_val}, {max_val}]."
+            return VALID_RETURN_STR
 
-    def _validate_timestamp(self, param_name: str, param_value: str, rules: dict) -> str:
-        """
-        Validates the current time against a predetermined timestamp.
+        return validate_array
 
-        Returns:
-            `str`: An error message if invalid, else empty string.
-        """
-        try:
-            dt_value = datetime.datetime.fromisoformat(param_value)
-        except ValueError:
-            return self.__log_and_return_err(f"{param_name} has value '{param_value}' which is not a valid ISO timestamp.")
 
+    def _compile_timestamp(self, param_name: str, rules: dict, prefix: str) -> Callable[[Any], str]:
+        """
+        Validates a timestamp against the 'before' & 'after' constraints, which are parsed once here.
+        """
         before_str = rules.get('before')
         after_str = rules.get('after')
 
-        # Check 'before'
-        if before_str:
+        # Parse the constraints
+        constraints = []
+        for constraint_name, constraint_str in (('before', before_str), ('after', after_str)):
+            if not constraint_str:
+                constraints.append(None)
+                continue
             try:
-                before_dt = datetime.datetime.fromisoformat(before_str)
-                if dt_value >= before_dt:
-                    return (f"{param_name} = {param_value}, which is not before {before_str}.")
+                constraints.append(datetime.datetime.fromisoformat(constraint_str))
             except ValueError:
-                return self.__log_and_return_err(
-                    f"{param_name} has invalid 'before' constraint '{before_str}'.", DataLogger.LogSeverity.ERROR)
+                # Every value is invalid if the rule is
+                err_msg = prefix + self.__log_and_return_err(
+                    f"{param_name} has invalid '{constraint_name}' constraint '{constraint_str}'.")
+                return lambda param_value: err_msg
+        before_dt, after_dt = constraints
 
-        # Check 'after'
-        if after_str:
+        def validate_timestamp(param_value) -> str:
             try:
-                after_dt = datetime.datetime.fromisoformat(after_str)
-                if dt_value <= after_dt:
-                    return (f"{param_name} = {param_value}, which is not after {after_str}.")
-            except ValueError:
-                return self.__log_and_return_err(
-                    f"{param_name} has invalid 'after' constraint '{after_str}'.", DataLogger.LogSeverity.ERROR)
+                dt_value = datetime.datetime.fromisoformat(param_value)
+            except (TypeError, ValueError):
+                return prefix + self.__log_and_return_err(f"{param_name} has value '{param_value}' which is not a valid ISO timestamp.")
+
+            if before_dt is not None and dt_value >= before_dt:
+                return f"{prefix}{param_name} = {param_value}, which is not before {before_str}."
+            if after_dt is not None and dt_value <= after_dt:
+                return f"{prefix}{param_name} = {param_value}, which is not after {after_str}."
+            return VALID_RETURN_STR
 
-        return VALID_RETURN_STR
-    
-    def _validate_mapped_error(
-        self, 
-        param_name: str, 
-        param_value: Union[str, int], 
-        rules: dict
-    ) -> str:
+        return validate_timestamp
+
+
+    def _compile_mapped_error(self, param_name: str, rules: dict, prefix: str) -> Callable[[Any], str]:
         """
         Validates an error-code parameter where each code maps to a message.
 
@@ -413,37 +788,53 @@ class ParameterMonitor:
             - If the current value deviates from the "typical" value, the corresponding message from the "codes" field
             is returned.
             - If the current value is not in the "codes" field, a warning for an unknown code is generated.
-
-        Returns:
-            str: An error message if invalid, or VALID_RETURN_STR if valid.
         """
-        codes_map = rules.get("codes", {})
-        param_str = str(param_value)  # Convert param_value to string for comparison
         typical_value = str(rules.get("typical", ""))  # Ensure typical value is a string
 
-        # If the current value matches the typical value, return VALID_RETURN_STR
-        if param_str == typical_value:
-            return VALID_RETURN_STR
+        # The whole warning for each code is made up front
+        code_warnings = {code: f"{prefix}{param_name} {msg}" for code, msg in rules.get("codes", {}).items()}
+
+        def validate_mapped_error(param_value) -> str:
+            param_str = str(param_value)  # Convert param_value to string for comparison
+
+            # If the current value matches the typical value, return VALID_RETURN_STR
+            if param_str == typical_value:
+                return VALID_RETURN_STR
+
+            # If the current value is in the codes map, return the associated message
+            warning_msg = code_warnings.get(param_str)
+            if warning_msg is not None:
+                return warning_msg
+
+            # If the value is not recognized, return a error
+            return prefix + self.__log_and_return_err(f"{param_name} has unknown code '{param_value}'.")
 
-        # If the current value is in the codes map, return the associated message
-        if param_str in codes_map:
-            return f"{param_name} {codes_map[param_str]}"
+        return validate_mapped_error
 
-        # If the value is not recognized, return a error
-        return self.__log_and_return_err(f"{param_name} has unknown code '{param_value}'.")
 
     def create_warning(self, warning: ParameterWarning):
         """
-        Adds a warning to the warning list if it does not already exist.
+        Adds a warning to the active warnings if there isn't already one for its parameter.
+        Warnings are kept in priority order (highest first), and in the order they were created within a priority.
 
         Args:
             warning (ParameterWarning): The warning to add.
         """
-        for existing_warning in self.active_warnings:
-            if existing_warning.param_name == warning.param_name:
-                # If the warning already exists, return early
-                return
-        self.active_warnings.append(warning)
+        active_warnings = self.active_warnings
+        if warning.param_name in active_warnings:
+            # If the warning already exists, return early
+            return
+
+        # Warnings usually come in at the same priority, so they can just go at the end
+        last_warning = next(reversed(active_warnings.values()), None)
+        active_warnings[warning.param_name] = warning
+        if last_warning is not None and warning.priority > last_warning.priority:
+            # sorted() is stable, so the creation order is kept within each priority
+            self.active_warnings = {
+                existing_warning.param_name: existing_warning
+                for existing_warning in sorted(active_warnings.values(), key=lambda w: -w.priority)
+            }
+        self.__publish_warning_strs()
 
         # Log creation of warning
         self.__log(f'{warning.getMsg()}', DataLogger.LogSeverity.WARNING)
@@ -451,44 +842,46 @@ class ParameterMonitor:
     def clear_warning(self, param_name: str):
         """
         Clears the warning for a specific parameter and logs the action.
+        Clearing a parameter without a warning does nothing.
 
         Args:
             param_name (str): The name of the parameter to clear the warning for.
         """
-        initial_warning_count = len(self.active_warnings)
+        if param_name not in self.active_warnings:
+            return
 
         # Remove the warning for the specified parameter
-        self.active_warnings = [
-            warning for warning in self.active_warnings
-            if warning.param_name != param_name
-        ]
-
-        # Check if a warning was cleared and log the action
-        if len(self.active_warnings) < initial_warning_count:
-            self.__log(f"Warning cleared for parameter '{param_name}'.", DataLogger.LogSeverity.INFO)
+        del self.active_warnings[param_name]
+        self.__publish_warning_strs()
+        self.__log("Warning cleared for parameter '%s'.", DataLogger.LogSeverity.INFO, param_name)
 
 
     def get_warnings_as_str(self) -> List[str]:
         """
-        Returns a list of active warnings as strings.
+        Returns a list of active warnings as strings, in priority order.
+        Safe to call from any thread (Ex. the UI, while the asyncio engine checks values), as the strings
+        are rebuilt by whichever thread changes the warnings, and never modified afterwards.
 
         Returns:
             `List[str]`: A list of active warnings.
         """
-        warnings = []
-        for warning in self.active_warnings:
-            warnings.append(str(warning))
-        return warnings
+        return list(self.__warning_strs)
+
+
+    def __publish_warning_strs(self):
+        """Rebuilds the warning strings after the warnings change, then bumps `warnings_version`."""
+        self.__warning_strs = [str(warning) for warning in self.active_warnings.values()]
+        self.warnings_version += 1
 
     
     def get_warnings(self) -> List[ParameterWarning]:
         """
-        Returns a list of active warnings as ParameterWarning objects.
+        Returns a list of active warnings as ParameterWarning objects, in priority order.
 
         Returns:
             `List[ParameterWarning]`: A list of active warnings.
         """
-        return self.active_warnings
+        return list(self.active_warnings.values())
     
     def __log_and_return_err(self, err_msg: str) -> str:
         '''
@@ -519,22 +912,48 @@ class ParameterMonitor:
             config = json5.load(file)
 
         # Validate mappedError configurations
+        self.__validate_config({name: rules for name, rules in config.items() if name != PROFILES_KEY})
+                
+        # Log File Read
+        self.__log('Successfully loaded valuelimits.json.')
+        return config
+
+
+    def __merge_profile(self, profile_name: str, changes: Dict[str, Union[dict, None]]) -> Dict[str, dict]:
+        """
+        Merges the changes of a profile over the top level rules (see the module docstring).
+
+        Returns:
+            dict: The rules for each parameter in the profile.
+        """
+        parameter_limits = dict(self.parameter_limits)
+        for param_name, rule_changes in changes.items():
+            if rule_changes is None:
+                # Not monitored in this profile
+                parameter_limits.pop(param_name, None)
+            else:
+                parameter_limits[param_name] = {**parameter_limits.get(param_name, {}), **rule_changes}
+
+        self.__validate_config(parameter_limits, profile_name)
+        return parameter_limits
+
+
+    def __validate_config(self, config: Dict[str, dict], profile_name: str = DEFAULT_PROFILE):
+        """
+        Validates the rules of a profile, raising a ValueError if they aren't allowed.
+        """
         for param_name, param_rules in config.items():
             if param_rules.get("type") == "mappedError":
                 typical = param_rules.get("typical")
                 if typical is not None and str(typical) in param_rules.get("codes", {}):
-                    msg = (f"Parameter '{param_name}' has a 'typical' value '{typical}' "
+                    msg = (f"Parameter '{param_name}' ({profile_name} profile) has a 'typical' value '{typical}' "
                         f"that exists in its 'codes' dictionary. This is not allowed.")
                     self.__log(msg, DataLogger.LogSeverity.ERROR)
                     raise ValueError(msg)
                 if typical is None:
-                    msg = (f"Parameter '{param_name}' has no 'typical' value")
+                    msg = (f"Parameter '{param_name}' ({profile_name} profile) has no 'typical' value")
                     self.__log(msg, DataLogger.LogSeverity.ERROR)
                     raise ValueError(msg)
-                
-        # Log File Read
-        self.__log('Successfully loaded valuelimits.json.')
-        return config
         
     def __get_prefix(self, rules: dict) -> str:
         """"Returns the prefix for a given parameter limit (if it exists)"""
@@ -546,9 +965,9 @@ class ParameterMonitor:
             return ""
 
 
-    def __log(self, msg: str, severity=DataLogger.LogSeverity.DEBUG):
-        """Shorthand logging method."""
-        self.logger.writeLog(loggerName='ValueMonitor', msg=msg, severity=severity)
+    def __log(self, msg: str, severity=DataLogger.LogSeverity.DEBUG, *args):
+        """Shorthand logging method. Any args are formatted into msg lazily (see DataLogger.writeLog)."""
+        self.logger.writeLog('ValueMonitor', msg, severity, *args)
         
 
 
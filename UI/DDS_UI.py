@@ -23,7 +23,7 @@ import logging
 from kivy.app import App
 from kivy.core.window import Window
 from kivy.uix.label import Label
-from kivy.clock import Clock
+from kivy.clock import Clock, mainthread
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.graphics import RoundedRectangle
@@ -297,11 +297,19 @@ class Battery_Logo(Image):
 # Displays data relevant to battery within a box, 
 # including preentage, temperature, and discharge rate
 class Battery (FloatLayout):
+
+    # The (device, parameter) of every value this widget reads
+    DATA_KEYS = [('OrionBMS2', 'Pack_SOC'), ('OrionBMS2', 'High_Temperature'), ('OrionBMS2', 'Pack_Current')]
+
     def __init__(self, io: DDS_IO, **kwargs):
         super().__init__(**kwargs)
 
         self.io = io
 
+        # Every value is read at once, so they all come from the same moment
+        self.data = self.io.snapshot(self.DATA_KEYS, "BatteryWidget")
+        Clock.schedule_interval(self.update_data, 0.01)
+
         # rectangle dimensions
         rect_height = 450
         rect_width = 285  
@@ -314,7 +322,7 @@ class Battery (FloatLayout):
 
         # Example value source function for demonstration
         def get_pack_state_of_charge() -> str:
-            soc = self.io.get_device_data('canInterface', 'Pack_SOC', "BatteryWidget")
+            soc = self.data.get('OrionBMS2', 'Pack_SOC')
             # print(soc)
             if soc is str:
                 # This will happen if there is an error.
@@ -329,7 +337,7 @@ class Battery (FloatLayout):
         
         # Example value source function for demonstration
         def get_cell_high_temperature():
-            highTemp = self.io.get_device_data('canInterface', 'High_Temperature', "BatteryWidget")
+            highTemp = self.data.get('OrionBMS2', 'High_Temperature')
             # print(highTemp)  # Debugging print
             if isinstance(highTemp, str):
                 # If an error string is returned, use it directly
@@ -344,7 +352,7 @@ class Battery (FloatLayout):
 
         # Example value source function for demonstration
         def get_pack_current():
-            current = self.io.get_device_data('canInterface', 'Pack_Current', "BatteryWidget")
+            current = self.data.get('OrionBMS2', 'Pack_Current')
             # print(current)  # Debugging print
             if isinstance(current, str):
                 # If an error string is returned, use it directly
@@ -409,6 +417,9 @@ class Battery (FloatLayout):
         self.left_rect.add_widget(battery_discharge)
         self.left_rect.add_widget(temp_logo)
         self.left_rect.add_widget(discharge_logo)
+
+    def update_data(self, *args):
+        self.data = self.io.snapshot(self.DATA_KEYS, "BatteryWidget")
         
      
         
@@ -433,6 +444,7 @@ class Warnings(FloatLayout):
         super().__init__(**kwargs)
 
         self.io = io
+        self.warnings_version = None    # Version of the warnings currently shown
 
         # Rectangle dimensions
         rect_height = 450
@@ -476,7 +488,14 @@ class Warnings(FloatLayout):
         """
         Updates the list of warnings dynamically by fetching new warnings
         from the DDS_IO instance and repopulating the UI.
+        Does nothing if the warnings haven't changed since the last update.
         """
+        # Skip rebuilding the labels if nothing changed
+        warnings_version = self.io.get_warnings_version()
+        if warnings_version == self.warnings_version:
+            return
+        self.warnings_version = warnings_version
+
         # Clear existing widgets
         self.layout.clear_widgets()
 
@@ -515,6 +534,10 @@ class Warnings(FloatLayout):
 
 # Creates widget in center of display with speed and RPM 
 class Center(FloatLayout):
+
+    # The (device, parameter) of every value this widget reads
+    DATA_KEYS = [('DTI_HV_500', 'ERPM')]
+
     def __init__(self, io: DDS_IO, **kwargs):
         super().__init__(**kwargs)
 
@@ -531,7 +554,7 @@ class Center(FloatLayout):
 
                 # Create a label to display the speed value
         self.speed_label = Label(
-            text=f"{self.get_speed()}",
+            text=f"{self.get_speed(None)}",
             font_size='100sp',
             pos=(106, 80)
         )
@@ -547,18 +570,17 @@ class Center(FloatLayout):
     
         # Create a label to display the rpm value
         self.rpm_label = Label(
-            text=f"{self.get_rpm()} RPM",
+            text=f"{self.get_rpm(None)} RPM",
             font_size='50sp',
             pos=(106, -90)
         )
         self.center_block.add_widget(self.rpm_label)
     
-        # Schedule updates every second
-        Clock.schedule_interval(self.update_value, 0.01)
+        # Update the labels whenever the values change, instead of polling them
+        self.subscriptions = self.io.subscribe(self.DATA_KEYS, self.on_values_changed, "CenterWidget")
 
     # Define getter functions
-    def get_speed(self):
-        erpm = self.io.get_device_data('canInterface', 'ERPM', "CenterWidget")
+    def get_speed(self, erpm):
         if isinstance(erpm, str):
         # If it's a string (e.g., error message), return it directly
             return erpm
@@ -573,8 +595,7 @@ class Center(FloatLayout):
             # Handle invalid data gracefully
                 return -1
     
-    def get_rpm(self):
-        erpm = self.io.get_device_data('canInterface', 'ERPM', "CenterWidget")
+    def get_rpm(self, erpm):
         if isinstance(erpm, str):
         # If it's a string (e.g., error message), return it directly
             return erpm
@@ -589,9 +610,15 @@ class Center(FloatLayout):
             # Handle invalid data gracefully
                 return -1
 
-    def update_value(self, dt=None):
-        self.speed = self.get_speed()
-        self.rpm = self.get_rpm()
+    @mainthread
+    def on_values_changed(self, values):
+        # Only the values that changed are passed in (from the IO engine's thread with the asyncio engine)
+        if ('DTI_HV_500', 'ERPM') in values:
+            self.update_value(values[('DTI_HV_500', 'ERPM')])
+
+    def update_value(self, erpm):
+        self.speed = self.get_speed(erpm)
+        self.rpm = self.get_rpm(erpm)
 
         if isinstance(self.speed, str):
             self.speed_label.text = self.speed
@@ -694,12 +721,18 @@ class MyApp(App):
         # Set update intervals
         IO_UPDATE_INTERVAL = 0.0001
 
-        Clock.schedule_interval(self.update_io, IO_UPDATE_INTERVAL)
+        # The asyncio IO engine updates the interfaces by itself, so there is no need to poll
+        if self.io.needs_polling():
+            Clock.schedule_interval(self.update_io, IO_UPDATE_INTERVAL)
 
 
         self.layout = MainLayout(self.io)
         
         return self.layout
+
+    def on_stop(self):
+        # Stop the IO engine & close the buses before the app exits
+        self.io.close()
     
     def update_io(self, dt):
         # Update io